@@ -9,6 +9,7 @@ import re
 import uuid
 import time
 import concurrent.futures
+import contextvars
 import hmac
 import hashlib
 import threading
@@ -17,7 +18,7 @@ import gc
 from datetime import datetime
 from collections import defaultdict
 from math import asin, cos, radians, sin, sqrt
-from flask import Flask, request, jsonify, url_for, g, send_file
+from flask import Flask, Response, request, jsonify, url_for, g, send_file, stream_with_context
 from flask_cors import CORS, cross_origin
 import firebase_admin
 from firebase_admin import auth as firebase_auth, credentials
@@ -32,7 +33,8 @@ OpenAI = None  # default if library unavailable
 import smtplib
 from email.mime.text import MIMEText
 import requests
-from sklearn.feature_extraction.text import TfidfVectorizer
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
 # PDF Generation
@@ -70,20 +72,114 @@ except ImportError:
 
 # RAG Engine — LangChain + FAISS + HuggingFace (graceful degradation if not installed)
 try:
-    from backend.rag_engine import get_rag_engine
+    from backend.rag_engine import get_rag_engine, get_rag_registry
 except ImportError:
     try:
-        from rag_engine import get_rag_engine
+        from rag_engine import get_rag_engine, get_rag_registry
     except ImportError:
         def get_rag_engine():
             class _FallbackRAG:
                 def ingest_text(self, *a, **kw): return {"success": False, "error": "RAG not available. Install LangChain."}
                 def query(self, *a, **kw): return {"success": False, "error": "RAG not available. Install LangChain."}
+                def query_many(self, *a, **kw): return {"success": False, "error": "RAG not available. Install LangChain."}
                 def build_grounded_prompt(self, *a, **kw): return {"success": False, "error": "RAG not available."}
                 def clear(self): return {"success": False, "error": "RAG not available."}
                 def status(self): return {"ready": False, "indexed": False, "chunks_indexed": 0, "error": "LangChain not installed."}
             return _FallbackRAG()
 
+        def get_rag_registry(**kwargs):
+            class _FallbackRAGRegistry:
+                def get(self, key): return get_rag_engine()
+                def ingest(self, key, text, source_label="resume", document_id=None): return get_rag_engine().ingest_text(text, source_label=source_label)
+                def delete_document(self, key, document_id): return {"success": False, "error": "RAG not available."}
+                def clear(self, key): return get_rag_engine().clear()
+                def stats(self): return {}
+            return _FallbackRAGRegistry()
+
+# float16 chunk-embedding cache used by the RAG engine
+try:
+    from backend.embedding_cache import get_embedding_cache
+except ImportError:
+    from embedding_cache import get_embedding_cache
+
+# Shared LLM execution pool (bounded threads + per-call deadlines)
+try:
+    from backend.llm_executor import get_llm_executor, LLMDeadlineExceeded, LLMRejectedError, LLMSlotTimeout
+except ImportError:
+    from llm_executor import get_llm_executor, LLMDeadlineExceeded, LLMRejectedError, LLMSlotTimeout
+
+# asyncio provider clients on one loop thread: many calls in flight without a thread each
+try:
+    from backend.async_llm import get_async_llm_client
+except ImportError:
+    from async_llm import get_async_llm_client
+
+# Per provider/model circuit breakers with p95-derived call timeouts (state shared via Redis)
+try:
+    from backend.circuit_breaker import get_circuit_breakers, CircuitOpenError
+except ImportError:
+    from circuit_breaker import get_circuit_breakers, CircuitOpenError
+
+# Hedged LLM calls: a duplicate to the second provider once the primary is slower than usual
+try:
+    from backend.llm_hedging import get_hedger, estimate_tokens
+except ImportError:
+    from llm_hedging import get_hedger, estimate_tokens
+
+# Outbound rate governor: requests/min and tokens/min buckets per provider and per tenant (shared via Redis)
+try:
+    from backend.rate_governor import get_rate_governor, parse_limits, RateLimitShed, INTERACTIVE, BATCH
+except ImportError:
+    from rate_governor import get_rate_governor, parse_limits, RateLimitShed, INTERACTIVE, BATCH
+
+# Duplicate in-flight LLM call suppression (in-process + Redis)
+try:
+    from backend.single_flight import SingleFlight
+except ImportError:
+    from single_flight import SingleFlight
+
+# Deferred LLM narratives for fast-path analysis when Celery is disabled
+try:
+    from backend.background_jobs import BackgroundJobs
+except ImportError:
+    from background_jobs import BackgroundJobs
+
+# Dependency-graph runner for the /ai-orchestrator steps
+try:
+    from backend.step_graph import Step, StepFailed, run_step_graph
+except ImportError:
+    from step_graph import Step, StepFailed, run_step_graph
+
+# Two-tier (in-process LRU + compressed Redis) response cache
+try:
+    from backend.cache_store import TwoTierCache
+except ImportError:
+    from cache_store import TwoTierCache
+
+# Process-pool PDF extraction with page/byte/wall-clock limits
+try:
+    from backend.pdf_extraction import get_pdf_extractor, PDFTooLargeError
+except ImportError:
+    from pdf_extraction import get_pdf_extractor, PDFTooLargeError
+
+# Aho-Corasick skill taxonomy matcher (word-bounded, alias-aware)
+try:
+    from backend.skill_matcher import get_skill_matcher
+except ImportError:
+    from skill_matcher import get_skill_matcher
+
+# Single-pass tokens/bullets/sections/skills shared by the deterministic scorers
+try:
+    from backend.resume_features import get_resume_feature_extractor, SectionVocabulary
+except ImportError:
+    from resume_features import get_resume_feature_extractor, SectionVocabulary
+
+# Corpus-fitted TF-IDF model for semantic match scoring
+try:
+    from backend.semantic_model import get_semantic_scorer, DEFAULT_MODEL_PATH as SEMANTIC_DEFAULT_MODEL_PATH
+except ImportError:
+    from semantic_model import get_semantic_scorer, DEFAULT_MODEL_PATH as SEMANTIC_DEFAULT_MODEL_PATH
+
 # Import config with fallback specifically for different deployment contexts
 try:
     from backend.config import Config, init_directories, configure_logging
@@ -180,9 +276,9 @@ CORS(
     resources={
         r"/*": {
             "origins": "*",
-            "allow_headers": ["Content-Type", "Authorization", "X-Requested-With"],
+            "allow_headers": ["Content-Type", "Authorization", "X-Requested-With", "X-Session-ID"],
             "methods": ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-            "expose_headers": ["Content-Disposition"],
+            "expose_headers": ["Content-Disposition", "X-Session-ID"],
             "max_age": 600,
         }
     },
@@ -235,8 +331,100 @@ LLM_TIMEOUT_SECONDS = max(5, int(getattr(config, "LLM_TIMEOUT_SECONDS", 12) or 1
 # Force sync execution on constrained deployments to prevent stuck queued jobs.
 ASYNC_TASKS_ENABLED = False
 
-cohere_client = cohere.Client(COHERE_API_KEY) if COHERE_API_KEY else None
-openai_client = OpenAI(api_key=OPENAI_API_KEY) if (OPENAI_API_KEY and OpenAI) else None
+LLM_RETRY_TIMEOUT_SECONDS = 10
+LLM_STREAM_TIMEOUT_SECONDS = max(LLM_TIMEOUT_SECONDS, int(config.LLM_STREAM_TIMEOUT_SECONDS or 90))
+
+cohere_client = cohere.Client(COHERE_API_KEY, timeout=LLM_TIMEOUT_SECONDS) if COHERE_API_KEY else None
+openai_client = OpenAI(api_key=OPENAI_API_KEY, timeout=LLM_TIMEOUT_SECONDS) if (OPENAI_API_KEY and OpenAI) else None
+
+# One long-lived pool for every provider call; replaces the per-call executors that leaked threads.
+llm_executor = get_llm_executor(
+    max_workers=config.LLM_MAX_WORKERS,
+    max_queue=config.LLM_MAX_QUEUE,
+    provider_concurrency=config.LLM_PROVIDER_CONCURRENCY,
+)
+# With LLM_ASYNC_ENABLED, call_llm's provider I/O runs here instead of on llm_executor threads
+async_llm = get_async_llm_client(
+    cohere_api_key=COHERE_API_KEY if config.LLM_ASYNC_ENABLED else None,
+    openai_api_key=OPENAI_API_KEY if config.LLM_ASYNC_ENABLED else None,
+    max_concurrency=config.LLM_ASYNC_MAX_CONCURRENCY,
+    provider_concurrency=config.LLM_PROVIDER_CONCURRENCY,
+    sdk_timeout=LLM_TIMEOUT_SECONDS,
+)
+# LLM_TIMEOUT_SECONDS is now the ceiling; each call waits p95 x multiplier of recent calls to that model
+llm_breakers = get_circuit_breakers(
+    redis_client=redis_client,
+    window=config.LLM_BREAKER_WINDOW,
+    failure_threshold=config.LLM_BREAKER_FAILURE_THRESHOLD,
+    error_rate_threshold=config.LLM_BREAKER_ERROR_RATE,
+    open_seconds=config.LLM_BREAKER_OPEN_SECONDS,
+    timeout_multiplier=config.LLM_TIMEOUT_P95_MULTIPLIER,
+    min_timeout=config.LLM_MIN_TIMEOUT_SECONDS,
+    max_timeout=LLM_TIMEOUT_SECONDS,
+)
+# Hedging is opt-in per endpoint; the flag is a context variable so orchestrator steps inherit it
+LLM_HEDGE_ENDPOINTS = {name.strip() for name in (config.LLM_HEDGE_ENDPOINTS or "").split(",") if name.strip()}
+LLM_HEDGE_DEFAULT_MODELS = {"cohere": "command-r", "openai": "gpt-4o-mini"}
+llm_hedger = get_hedger(max_workers=config.LLM_MAX_WORKERS * 2)
+_llm_hedge_enabled = contextvars.ContextVar("llm_hedge_enabled", default=False)
+# Every provider call pays into its rate buckets first; tenant/priority ride on context variables
+llm_governor = get_rate_governor(
+    redis_client=redis_client,
+    requests_per_minute=parse_limits(config.LLM_REQUESTS_PER_MINUTE, 0),
+    tokens_per_minute=parse_limits(config.LLM_TOKENS_PER_MINUTE, 0),
+    tenant_share=config.LLM_TENANT_SHARE,
+    batch_reserve=config.LLM_BATCH_RESERVE,
+    max_wait={INTERACTIVE: config.LLM_GOVERNOR_MAX_WAIT_SECONDS, BATCH: config.LLM_BATCH_MAX_WAIT_SECONDS},
+)
+_llm_tenant = contextvars.ContextVar("llm_tenant", default=None)
+_llm_priority = contextvars.ContextVar("llm_priority", default=INTERACTIVE)
+semantic_scorer = get_semantic_scorer(
+    model_path=config.SEMANTIC_MODEL_PATH or SEMANTIC_DEFAULT_MODEL_PATH,
+    mode=config.SEMANTIC_MODE,
+)
+pdf_extractor = get_pdf_extractor(
+    max_workers=config.PDF_EXTRACT_WORKERS,
+    max_bytes=config.PDF_MAX_BYTES,
+    max_pages=config.PDF_MAX_PAGES,
+    timeout=config.PDF_EXTRACT_TIMEOUT_SECONDS,
+)
+
+# Shared cache for LLM completions and endpoint analysis results.
+# Memory tier keeps local dev (no Redis) cached; Redis tier is shared across workers.
+LLM_CACHE_NAMESPACE = "llm_cache"
+ANALYSIS_CACHE_NAMESPACE = "analysis_v2"
+PDF_TEXT_CACHE_NAMESPACE = "pdf_text"
+RESUME_SESSION_NAMESPACE = "resume_session"
+NARRATIVE_JOB_NAMESPACE = "narrative_job"
+# Bump the suffix whenever extraction logic changes so stale text is never served.
+PDF_PARSER_VERSION = f"pdfplumber-{getattr(pdfplumber, '__version__', 'unknown')}.v2"
+response_cache = TwoTierCache(
+    redis_client=redis_client,
+    max_memory_bytes=config.CACHE_MEMORY_MAX_BYTES,
+    namespace_ttls={
+        LLM_CACHE_NAMESPACE: 86400,  # 24h
+        ANALYSIS_CACHE_NAMESPACE: 604800,  # 7 days
+        PDF_TEXT_CACHE_NAMESPACE: 604800,  # 7 days
+        RESUME_SESSION_NAMESPACE: config.RESUME_SESSION_TTL_SECONDS,
+        NARRATIVE_JOB_NAMESPACE: 3600,  # 1h
+    },
+    compression=config.CACHE_COMPRESSION,
+)
+
+narrative_jobs = BackgroundJobs(response_cache, namespace=NARRATIVE_JOB_NAMESPACE, max_workers=config.NARRATIVE_WORKERS)
+
+# Orchestrator steps mostly wait on llm_executor; this pool only bounds how many wait at once
+orchestrator_pool = concurrent.futures.ThreadPoolExecutor(
+    max_workers=max(1, config.ORCHESTRATOR_WORKERS), thread_name_prefix="orchestrator"
+)
+
+# Long enough to cover the primary call plus the Cohere retry.
+llm_single_flight = SingleFlight(
+    redis_client=redis_client,
+    namespace="llm",
+    lock_ttl=LLM_TIMEOUT_SECONDS + LLM_RETRY_TIMEOUT_SECONDS + 5,
+    wait_timeout=LLM_TIMEOUT_SECONDS + LLM_RETRY_TIMEOUT_SECONDS + 5,
+)
 
 # Log which LLM provider is configured
 if cohere_client:
@@ -1425,6 +1613,219 @@ def _compute_cache_key(prompt, model, temperature):
     raw = f"{model}:{temperature}:{prompt}"
     return hashlib.sha256(raw.encode('utf-8')).hexdigest()
 
+def _cohere_chat(model, prompt, temperature, timeout):
+    resp = cohere_client.chat(
+        model=model,
+        message=prompt,
+        temperature=temperature,
+        request_options={"timeout_in_seconds": timeout},
+    )
+    return resp.text.strip()
+
+def _openai_chat(model, prompt, temperature, timeout):
+    resp = openai_client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=temperature,
+        timeout=timeout,
+    )
+    return resp.choices[0].message.content.strip()
+
+def _cohere_chat_stream(model, prompt, temperature, timeout):
+    for event in cohere_client.chat_stream(
+        model=model,
+        message=prompt,
+        temperature=temperature,
+        request_options={"timeout_in_seconds": timeout},
+    ):
+        if getattr(event, "event_type", None) == "text-generation" and event.text:
+            yield event.text
+
+def _openai_chat_stream(model, prompt, temperature, timeout):
+    stream = openai_client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=temperature,
+        timeout=timeout,
+        stream=True,
+    )
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+def _read_llm_cache(digest):
+    cached = response_cache.get(LLM_CACHE_NAMESPACE, digest)
+    if cached:
+        logger.info(f"llm.cache_hit key={LLM_CACHE_NAMESPACE}:{digest}")
+    return cached
+
+def _write_llm_cache(digest, prompt, result):
+    # Important: Do not cache mock responses
+    is_mock = result and (
+        "mock response" in result.lower() or 
+        ("Mock" in result and "Headline" in result) or
+        result == _get_mock_response(prompt)
+    )
+    
+    if result and not is_mock:
+        response_cache.set(LLM_CACHE_NAMESPACE, digest, result)
+
+def _with_llm_scope(fn, tenant=None, priority=INTERACTIVE):
+    """Wrap fn so the LLM calls it makes are governed as ``priority`` work for ``tenant``.
+    Needed for work handed to pools and Celery, which do not inherit the request's context."""
+    def scoped(*args, **kwargs):
+        tenant_token = _llm_tenant.set(tenant)
+        priority_token = _llm_priority.set(priority)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _llm_priority.reset(priority_token)
+            _llm_tenant.reset(tenant_token)
+    scoped.__name__ = fn.__name__
+    return scoped
+
+def _govern_llm_call(provider, prompt):
+    """Take rate budget for one provider call; raises RateLimitShed (a LLMRejectedError) when shed."""
+    return llm_governor.acquire(
+        provider,
+        estimate_tokens(prompt) + config.LLM_COMPLETION_TOKEN_ESTIMATE,
+        tenant=_llm_tenant.get(),
+        priority=_llm_priority.get(),
+    )
+
+def _provider_throttled(provider, error):
+    """True (and the governor pauses the provider) if ``error`` is a provider 429."""
+    if getattr(error, "status_code", None) != 429:
+        return False
+    retry_after = None
+    headers = getattr(getattr(error, "response", None), "headers", None) or getattr(error, "headers", None) or {}
+    try:
+        retry_after = float(headers.get("retry-after"))
+    except (TypeError, ValueError, AttributeError):
+        pass
+    llm_governor.penalize(provider, retry_after or 5.0)
+    return True
+
+def _call_through_breaker(provider, model, chat_fn, prompt, temperature, max_timeout):
+    """
+    One provider call guarded by its circuit breaker: raises CircuitOpenError without calling the
+    provider while the breaker is open, otherwise waits for rate budget, runs with the breaker's
+    p95-derived deadline and reports the outcome (a deadline miss backs that deadline off). Pool saturation, queueing for a provider slot and
+    rate limiting (LLMRejectedError, LLMSlotTimeout, provider 429s) are not held against the provider;
+    a half-open probe spent on such a call is handed back so the next call can probe instead.
+    """
+    breaker = llm_breakers.get(provider, model, max_timeout=max_timeout)
+    if not breaker.allow():
+        raise CircuitOpenError(f"{provider}:{model} circuit open")
+    try:
+        _govern_llm_call(provider, prompt)
+    except LLMRejectedError:
+        breaker.release_probe()
+        raise
+    timeout = breaker.timeout()
+    started = time.time()
+    try:
+        if async_llm.available(provider):
+            result = async_llm.run(provider, model, prompt, temperature, timeout=timeout)
+        else:
+            result = llm_executor.run(provider, chat_fn, model, prompt, temperature, timeout, timeout=timeout)
+    except (LLMRejectedError, LLMSlotTimeout):
+        breaker.release_probe()
+        raise
+    except LLMDeadlineExceeded:
+        breaker.record_timeout(timeout)
+        raise
+    except Exception as e:
+        if _provider_throttled(provider, e):
+            breaker.release_probe()
+        else:
+            breaker.record(time.time() - started, ok=False)
+        raise
+    breaker.record(time.time() - started, ok=True)
+    return result
+
+def _hedge_target(provider):
+    """(provider, model, chat_fn) for the hedge request, or None if that provider has no client."""
+    spec = config.LLM_HEDGE_MODEL or next(
+        (f"{name}:{model}" for name, model in LLM_HEDGE_DEFAULT_MODELS.items() if name != provider), ""
+    )
+    hedge_provider, hedge_model = (spec.split(":", 1) + [""])[:2]
+    hedge_provider = hedge_provider.lower()
+    if hedge_provider == "cohere" and cohere_client:
+        return hedge_provider, hedge_model, _cohere_chat
+    if hedge_provider == "openai" and openai_client:
+        return hedge_provider, hedge_model, _openai_chat
+    return None
+
+def _invoke_hedged(provider, model, prompt, temperature):
+    """
+    _invoke_llm_provider with a hedge: if the primary has not answered after its
+    LLM_HEDGE_PERCENTILE latency (or falls back to the mock sooner), the same prompt also goes to
+    the hedge provider and the first real answer wins.
+    """
+    target = _hedge_target(provider)
+    if target is None:
+        return _invoke_llm_provider(provider, model, prompt, temperature)
+    hedge_provider, hedge_model, chat_fn = target
+
+    delay = llm_breakers.get(provider, model, max_timeout=LLM_TIMEOUT_SECONDS).latency_percentile(config.LLM_HEDGE_PERCENTILE)
+    if delay is None:
+        delay = config.LLM_HEDGE_DEFAULT_DELAY_SECONDS
+    mock = _get_mock_response(prompt)
+    result, winner = llm_hedger.run(
+        lambda: _invoke_llm_provider(provider, model, prompt, temperature),
+        lambda: _call_through_breaker(hedge_provider, hedge_model, chat_fn, prompt, temperature, LLM_TIMEOUT_SECONDS),
+        delay,
+        is_valid=lambda response: bool(response) and response != mock,
+        prompt_tokens=estimate_tokens(prompt),
+    )
+    if winner == "secondary":
+        logger.info(f"llm.hedge_won provider={hedge_provider} model={hedge_model} delay_s={round(delay, 2)}")
+    return result or mock
+
+def _invoke_llm_provider(provider, model, prompt, temperature):
+    """Call the configured provider (with Cohere retry) and fall back to a mock response."""
+    if provider == "cohere":
+        if not cohere_client:
+            logger.warning("llm.cohere_not_configured")
+            return _get_mock_response(prompt)
+        # Try Cohere with model, and auto-retry with fast model (command-r) if it times out
+        try:
+            result = _call_through_breaker("cohere", model, _cohere_chat, prompt, temperature, LLM_TIMEOUT_SECONDS)
+            logger.info(f"llm.cohere_success model={model}")
+            return result
+        except LLMRejectedError as rejected:
+            logger.warning(f"llm.cohere_rejected error={rejected}")
+            return _get_mock_response(prompt)
+        except CircuitOpenError as open_err:
+            logger.warning(f"llm.circuit_open error={open_err} falling_back=retry_model")
+        except Exception as first_err:
+            logger.warning(f"CoHere primary model failed/timed out ({first_err}), retrying with model command-r...")
+        # Retry with Cohere's standard active model command-r
+        try:
+            retry_model = "command-r" if model != "command-r" else "command"
+            result = _call_through_breaker(
+                "cohere", retry_model, _cohere_chat, prompt, temperature, LLM_RETRY_TIMEOUT_SECONDS
+            )
+            logger.info(f"llm.cohere_retry_success model={retry_model}")
+            return result
+        except Exception as second_err:
+            logger.error(f"CoHere retry also failed: {second_err}. Returning structured response.")
+            return _get_mock_response(prompt)
+
+    if provider == "openai":
+        if not openai_client:
+            logger.warning("llm.openai_not_configured")
+            return _get_mock_response(prompt)
+        try:
+            return _call_through_breaker("openai", model, _openai_chat, prompt, temperature, LLM_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.error(f"OpenAI API call failed: {e}")
+            return _get_mock_response(prompt)
+
+    logger.warning(f"llm.unsupported_provider provider={provider}")
+    return _get_mock_response(prompt)
+
 def call_llm(prompt, temperature=0.6):
     """Unified LLM call supporting Cohere and OpenAI.
     LLM_MODEL format examples:
@@ -1432,99 +1833,185 @@ def call_llm(prompt, temperature=0.6):
       openai:gpt-4o
       openai:gpt-5-codex-preview  (placeholder / preview)
     Returns plaintext string or None on failure.
-    Note: Cohere SDK doesn't support timeout in chat() method.
-          Use cache + fallback strategy for slow responses.
+    Note: Provider calls run on the shared llm_executor pool. Each call carries a
+          hard deadline (LLM_TIMEOUT_SECONDS) both in the SDK request and on the
+          future, so a slow provider can no longer pin request threads.
+          Identical concurrent prompts are coalesced by llm_single_flight, so a
+          double-click or retry waits on the in-flight call instead of paying twice.
+          Calls made while serving an endpoint in LLM_HEDGE_ENDPOINTS are hedged to
+          the second provider (see _invoke_hedged).
     """
     provider, model = (LLM_MODEL.split(":", 1) + [""])[:2]
     provider = provider.lower()
     
-    # 1. Check Cache (Redis)
-    cache_key = None
-    if redis_client:
-        try:
-            cache_key = f"llm_cache:{_compute_cache_key(prompt, LLM_MODEL, temperature)}"
-            cached = redis_client.get(cache_key)
-            if cached:
-                logger.info(f"llm.cache_hit key={cache_key}")
-                return cached.decode('utf-8')
-        except Exception as e:
-            logger.warning(f"llm.cache_read_error error={e}")
+    # 1. Check Cache (in-process LRU, then Redis)
+    digest = _compute_cache_key(prompt, LLM_MODEL, temperature)
+    cached = _read_llm_cache(digest)
+    if cached:
+        return cached
+
+    # 2. Call provider once per key; write to cache (TTL 24h) before followers are released
+    invoke = _invoke_hedged if _llm_hedge_enabled.get() else _invoke_llm_provider
+
+    def _call_and_cache():
+        result = invoke(provider, model, prompt, temperature)
+        _write_llm_cache(digest, prompt, result)
+        return result
 
-    result = None
     try:
-        if provider == "cohere":
-            if not cohere_client:
-                logger.warning("llm.cohere_not_configured")
-                result = _get_mock_response(prompt)
-            else:
-                # Try Cohere with model, and auto-retry with fast model (command-light) if it times out
-                def _cohere_chat_once(target_model):
-                    return cohere_client.chat(
-                        model=target_model,
-                        message=prompt,
-                        temperature=temperature
-                    )
-
-                executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
-                # First attempt with configured model (capped at LLM_TIMEOUT_SECONDS)
-                fut = executor.submit(_cohere_chat_once, model)
-
-                try:
-                    resp = fut.result(timeout=LLM_TIMEOUT_SECONDS)
-                    result = resp.text.strip()
-                    logger.info(f"llm.cohere_success model={model}")
-                except (concurrent.futures.TimeoutError, Exception) as first_err:
-                    logger.warning(f"CoHere primary model failed/timed out ({first_err}), retrying with model command-r...")
-                    # Retry with Cohere's standard active model command-r
-                    try:
-                        retry_model = "command-r" if model != "command-r" else "command"
-                        fut_fast = executor.submit(_cohere_chat_once, retry_model)
-                        resp_fast = fut_fast.result(timeout=10)
-                        result = resp_fast.text.strip()
-                        logger.info(f"llm.cohere_retry_success model={retry_model}")
-                    except Exception as second_err:
-                        logger.error(f"CoHere retry also failed: {second_err}. Returning structured response.")
-                        result = _get_mock_response(prompt)
-                finally:
-                    executor.shutdown(wait=False)
-                        
-        elif provider == "openai":
-            if not openai_client:
-                logger.warning("llm.openai_not_configured")
-                result = _get_mock_response(prompt)
-            else:
-                try:
-                    # OpenAI timeout is set at client initialization level
-                    resp = openai_client.chat.completions.create(
-                        model=model,
-                        messages=[{"role": "user", "content": prompt}],
-                        temperature=temperature
-                    )
-                    result = resp.choices[0].message.content.strip()
-                except Exception as e:
-                    logger.error(f"OpenAI API call failed: {e}")
-                    result = _get_mock_response(prompt)
-        else:
-            logger.warning(f"llm.unsupported_provider provider={provider}")
-            result = _get_mock_response(prompt)
+        result, shared = llm_single_flight.do(digest, _call_and_cache, fetch=lambda: _read_llm_cache(digest))
+        if shared:
+            logger.info(f"llm.single_flight_shared key={LLM_CACHE_NAMESPACE}:{digest}")
     except Exception as e:
         logger.error(f"llm.call_failed error={e}")
         return None
 
-    # 2. Write to Cache (TTL 24h)
-    # Important: Do not cache mock responses
-    is_mock = result and (
-        "mock response" in result.lower() or 
-        ("Mock" in result and "Headline" in result)
-    )
-    
-    if result and not is_mock and redis_client and cache_key:
+    return result
+
+def iter_llm_many(prompts, temperature=0.6):
+    """
+    call_llm for a batch of prompts, yielding (index, response) as each one finishes.
+    Cache hits come first; misses go out together on async_llm from this one thread, bounded by
+    LLM_ASYNC_MAX_CONCURRENCY and LLM_PROVIDER_CONCURRENCY. Each fan-out call leads its prompt's
+    llm_single_flight key, so concurrent call_llm callers wait on it; a prompt already in flight
+    (elsewhere, or earlier in the same batch) goes through call_llm afterwards and joins that call.
+    A prompt whose fan-out call fails, or whose breaker is open, also goes through call_llm
+    (Cohere retry, mock fallback). Without an async client for the provider every prompt simply
+    goes through call_llm.
+    """
+    provider, model = (LLM_MODEL.split(":", 1) + [""])[:2]
+    provider = provider.lower()
+
+    misses = []
+    for i, prompt in enumerate(prompts):
+        digest = _compute_cache_key(prompt, LLM_MODEL, temperature)
+        cached = _read_llm_cache(digest)
+        if cached:
+            yield i, cached
+        else:
+            misses.append((i, prompt, digest))
+    if not misses:
+        return
+    if not async_llm.available(provider):
+        for i, prompt, _ in misses:
+            yield i, call_llm(prompt, temperature)
+        return
+
+    breaker = llm_breakers.get(provider, model, max_timeout=LLM_TIMEOUT_SECONDS)
+    timeout = breaker.timeout()
+    outgoing, fallback = [], []
+    for miss in misses:
+        if not llm_single_flight.try_lead(miss[2]):
+            fallback.append(miss)
+            continue
+        if not breaker.allow():
+            llm_single_flight.finish(miss[2])
+            fallback.append(miss)
+            continue
         try:
-            redis_client.setex(cache_key, 86400, result)
-        except Exception as e:
-            logger.warning(f"llm.cache_write_error error={e}")
+            _govern_llm_call(provider, miss[1])
+        except RateLimitShed:
+            breaker.release_probe()
+            llm_single_flight.finish(miss[2])
+            fallback.append(miss)
+            continue
+        outgoing.append(miss)
+    started = time.time()
+    calls = [(provider, model, prompt, temperature, timeout) for _, prompt, _ in outgoing]
+    leading = {digest for _, _, digest in outgoing}
+    try:
+        for j, response in async_llm.map_unordered(calls):
+            i, prompt, digest = outgoing[j]
+            leading.discard(digest)
+            if isinstance(response, Exception) or not response:
+                llm_single_flight.finish(digest)
+                if isinstance(response, LLMDeadlineExceeded):
+                    breaker.record_timeout(timeout)
+                elif isinstance(response, LLMRejectedError) or (
+                    isinstance(response, Exception) and _provider_throttled(provider, response)
+                ):
+                    breaker.release_probe()
+                else:
+                    breaker.record(time.time() - started, ok=False)
+                logger.warning(f"llm.fan_out_failed provider={provider} error={response} falling_back=call_llm")
+                fallback.append(outgoing[j])
+                continue
+            breaker.record(time.time() - started, ok=True)
+            _write_llm_cache(digest, prompt, response)
+            llm_single_flight.finish(digest, response)
+            yield i, response
+    finally:
+        # A consumer that stops early must not leave followers waiting on keys nobody will finish
+        for digest in leading:
+            llm_single_flight.finish(digest)
+    logger.info(
+        f"llm.fan_out provider={provider} calls={len(outgoing)} fallback={len(fallback)} "
+        f"ms={round((time.time() - started) * 1000)}"
+    )
+    for i, prompt, _ in fallback:
+        yield i, call_llm(prompt, temperature)
+
+def call_llm_stream(prompt, temperature=0.6):
+    """Streaming variant of call_llm: yields text chunks as the provider produces them.
+    - Cached responses replay as one chunk
+    - A completed stream is written to the same llm_cache entry call_llm reads
+    - Unconfigured provider, or a failure before the first chunk: falls back to call_llm
+      (Cohere retry, mock response) and yields its result as one chunk
+    - A failure after chunks were sent is raised; nothing is cached
+    """
+    provider, model = (LLM_MODEL.split(":", 1) + [""])[:2]
+    provider = provider.lower()
 
-    return result
+    digest = _compute_cache_key(prompt, LLM_MODEL, temperature)
+    cached = _read_llm_cache(digest)
+    if cached:
+        yield cached
+        return
+
+    stream_fn = None
+    if provider == "cohere" and cohere_client:
+        stream_fn = _cohere_chat_stream
+    elif provider == "openai" and openai_client:
+        stream_fn = _openai_chat_stream
+    breaker = llm_breakers.get(provider, model, max_timeout=LLM_TIMEOUT_SECONDS)
+    if stream_fn is None or not breaker.allow():
+        result = call_llm(prompt, temperature)
+        if result:
+            yield result
+        return
+    try:
+        _govern_llm_call(provider, prompt)
+    except RateLimitShed:
+        result = call_llm(prompt, temperature)
+        if result:
+            yield result
+        return
+
+    parts = []
+    started = time.time()
+    try:
+        for chunk in llm_executor.stream(
+            provider, stream_fn, model, prompt, temperature, LLM_STREAM_TIMEOUT_SECONDS,
+            timeout=LLM_STREAM_TIMEOUT_SECONDS,
+        ):
+            parts.append(chunk)
+            yield chunk
+    except Exception as e:
+        if not isinstance(e, (LLMRejectedError, LLMSlotTimeout)) and not _provider_throttled(provider, e):
+            breaker.record(time.time() - started, ok=False)
+        if parts:
+            logger.error(f"llm.stream_failed provider={provider} chunks={len(parts)} error={e}")
+            raise
+        logger.warning(f"llm.stream_unavailable provider={provider} error={e} falling_back=call_llm")
+        result = call_llm(prompt, temperature)
+        if result:
+            yield result
+        return
+
+    # Stream duration is not comparable to a single completion, so it updates health but not the timeout
+    breaker.record(None, ok=True)
+    _write_llm_cache(digest, prompt, "".join(parts).strip())
+    logger.info(f"llm.stream_success provider={provider} chunks={len(parts)} ms={round((time.time() - started) * 1000)}")
 
 def verify_firebase_token(id_token):
     # Check for dev token strictly first
@@ -1545,16 +2032,71 @@ def verify_firebase_token(id_token):
         logger.warning("auth.verification_failed_fallback_to_guest")
         return {"uid": "guest-user", "email": "guest@demo.local"}
 
-def extract_text_from_pdf(file_storage):
+def _file_sha256(file_storage, data=None):
+    """SHA-256 of an uploaded file's bytes, memoized on the FileStorage object."""
+    digest = getattr(file_storage, "_content_sha256", None)
+    if digest:
+        return digest
+    if data is not None:
+        digest = hashlib.sha256(data).hexdigest()
+    else:
+        hasher = hashlib.sha256()
+        file_storage.seek(0)
+        for chunk in iter(lambda: file_storage.read(65536), b""):
+            hasher.update(chunk)
+        file_storage.seek(0)
+        digest = hasher.hexdigest()
+    try:
+        file_storage._content_sha256 = digest
+    except AttributeError:
+        pass
+    return digest
+
+def _pdf_cache_keys(digest, char_budget=None, fast=False):
+    """Cache keys that can satisfy a request, best first; the last one is where a new result is stored."""
+    keys = [f"{PDF_PARSER_VERSION}:{digest}"]  # full layout text serves every budget/mode
+    if fast:
+        keys.append(f"{PDF_PARSER_VERSION}:fast:{digest}")
+    if char_budget is not None:
+        keys.append(f"{PDF_PARSER_VERSION}:{'fast:' if fast else ''}b{char_budget}:{digest}")
+    return keys
+
+def extract_text_from_pdf(file_storage, char_budget=None, fast=False):
+    """Extract PDF text, content-addressed by SHA-256 of the upload.
+    A repeat upload of the same bytes skips parsing and is served from
+    response_cache (memory, then Redis) under pdf_text:<parser-version>:<sha256>.
+    Parsing runs on the shared pdf_extractor process pool with page/byte/time limits.
+
+    char_budget: callers that keep only the first N chars pass N; pages are parsed lazily
+                 and extraction stops once the budget is covered.
+    fast: skip pdfplumber layout clustering when line fidelity is not needed (e.g. JDs).
+    """
     try:
         file_storage.seek(0)
-        with pdfplumber.open(file_storage) as pdf:
-            full_text = ""
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    full_text += text + "\n"
-        return full_text.strip()
+        data = file_storage.read(config.PDF_MAX_BYTES + 1)
+        file_storage.seek(0)
+        if len(data) > config.PDF_MAX_BYTES:
+            logger.warning(f"pdf.too_large limit={config.PDF_MAX_BYTES}")
+            return None
+
+        keys = _pdf_cache_keys(_file_sha256(file_storage, data), char_budget, fast)
+        for cache_key in keys:
+            cached = response_cache.get(PDF_TEXT_CACHE_NAMESPACE, cache_key)
+            if cached is not None:
+                logger.info(f"pdf.cache_hit key={cache_key[-16:]}")
+                return cached[:char_budget] if char_budget is not None else cached
+
+        result = pdf_extractor.extract(data, char_budget=char_budget, fast=fast)
+        # A budgeted run holds the whole document only if it neither stopped early nor was clipped
+        clipped = char_budget is not None and (result.budget_reached or len(result.text) >= char_budget)
+        store_key = keys[-1] if clipped else keys[1 if fast else 0]
+        # Partial text (timeout, page errors, truncation) is cached briefly so a hostile PDF can't
+        # burn CPU on every retry, but a transient failure is not pinned for the full TTL
+        response_cache.set(PDF_TEXT_CACHE_NAMESPACE, store_key, result.text, ttl=3600 if result.partial else None)
+        return result.text
+    except PDFTooLargeError as e:
+        logger.warning(f"pdf.too_large error={e}")
+        return None
     except Exception as e:
         logger.error(f"pdf.extract_error error={e}")
         return None
@@ -1603,38 +2145,84 @@ def generate_endpoint_cache_key(resume_text, job_description, endpoint_type):
 
 def get_cached_analysis(resume_text, job_description, endpoint_type):
     """
-    Check if analysis result is cached.
+    Check if analysis result is cached (in-process first, then Redis).
     Returns cached result if found, None otherwise.
     Cache TTL: 7 days (604800 seconds)
     """
-    if not redis_client:
-        return None
-    
-    try:
-        cache_key = f"analysis_v2:{generate_endpoint_cache_key(resume_text, job_description, endpoint_type)}"
-        cached = redis_client.get(cache_key)
-        if cached:
-            logger.info(f"cache.analysis_hit endpoint={endpoint_type}")
-            return json.loads(cached.decode('utf-8'))
-    except Exception as e:
-        logger.warning(f"cache.analysis_read_error error={e}")
-    
-    return None
+    cached = response_cache.get_json(
+        ANALYSIS_CACHE_NAMESPACE,
+        generate_endpoint_cache_key(resume_text, job_description, endpoint_type),
+    )
+    if cached is not None:
+        logger.info(f"cache.analysis_hit endpoint={endpoint_type}")
+    return cached
 
 def cache_analysis_result(resume_text, job_description, endpoint_type, result):
     """
     Save analysis result to cache with 7-day TTL.
     """
-    if not redis_client:
-        return
-    
     try:
-        cache_key = f"analysis_v2:{generate_endpoint_cache_key(resume_text, job_description, endpoint_type)}"
-        redis_client.setex(cache_key, 604800, json.dumps(result))  # 7 days = 604800 seconds
+        response_cache.set_json(
+            ANALYSIS_CACHE_NAMESPACE,
+            generate_endpoint_cache_key(resume_text, job_description, endpoint_type),
+            result,
+        )
         logger.info(f"cache.analysis_saved endpoint={endpoint_type}")
     except Exception as e:
         logger.warning(f"cache.analysis_write_error error={e}")
 
+# ---------- Upload-once resume sessions ----------
+# A resume uploaded to /resumes is extracted and featurized once; follow-up calls pass its
+# resumeId (the SHA-256 of the PDF) instead of re-uploading. Sessions are scoped per user.
+RESUME_SESSION_TRIM_CHARS = 1200  # trim_resume_for_prompt(t, n) == excerpt[:n] for any n <= this
+
+def _resume_session_key(user_id, resume_id):
+    return f"{user_id}:{resume_id}"
+
+def create_resume_session(user_id, resume_id, resume_text):
+    """Precompute the per-resume features every endpoint needs and store them under resumeId."""
+    session = {
+        "resumeId": resume_id,
+        "text": resume_text,
+        "promptExcerpt": trim_resume_for_prompt(resume_text, max_length=RESUME_SESSION_TRIM_CHARS),
+        "sections": parse_resume_sections(resume_text),
+        "sectionSpans": {k: [list(span) for span in v] for k, v in resume_features(resume_text).section_spans.items()},
+        "skills": detect_skills(resume_text),
+        "bullets": extract_bullets(resume_text),
+        "createdAt": datetime.utcnow().isoformat() + "Z",
+    }
+    response_cache.set_json(RESUME_SESSION_NAMESPACE, _resume_session_key(user_id, resume_id), session)
+    return session
+
+def get_resume_session(user_id, resume_id):
+    if not resume_id:
+        return None
+    return response_cache.get_json(RESUME_SESSION_NAMESPACE, _resume_session_key(user_id, resume_id))
+
+def _resolve_resume_input(user_info, missing_error='No resume file provided', char_budget=None):
+    """
+    Resolve the resume for a request from a resumeId (form, JSON or query) or a 'resume' upload.
+    Returns (resume_text, resume_hash, session, error_response); session is None for raw uploads.
+    """
+    payload = request.get_json(silent=True) if request.is_json else None
+    resume_id = (payload or {}).get('resumeId') or request.form.get('resumeId') or request.args.get('resumeId')
+    if resume_id:
+        session = get_resume_session(user_info.get('uid', 'anonymous'), resume_id)
+        if session is None:
+            return None, None, None, (jsonify({'error': 'Unknown or expired resumeId'}), 404)
+        return session['text'], resume_id, session, None
+
+    resume_file = request.files.get('resume')
+    if not resume_file:
+        return None, None, None, (jsonify({'error': missing_error}), 400)
+    return extract_text_from_pdf(resume_file, char_budget=char_budget), _file_sha256(resume_file), None, None
+
+def _session_prompt_excerpt(session, max_length=800):
+    """Precomputed trim_resume_for_prompt output for a session, or None for raw uploads."""
+    if not session:
+        return None
+    return session.get('promptExcerpt', '')[:max_length]
+
 def call_cohere_api(prompt):
     """Backward compatibility wrapper using unified call."""
     return call_llm(prompt, temperature=0.6)
@@ -1788,42 +2376,27 @@ def format_report(data):
 # =============================
 # Coaching / Resume Enhancement Utilities
 # =============================
-KNOWN_SKILLS = {
-    "python", "java", "javascript", "react", "node", "node.js", "typescript", "sql", "mysql", "postgres", "mongodb",
-    "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "linux", "git", "c", "c++", "go", "rust",
-    "tensorflow", "pytorch", "nlp", "machine learning", "deep learning", "django", "flask", "spring", "html", "css"
-}
+# Skill taxonomy (canonical name -> aliases) compiled once at startup; see backend/models/skill_taxonomy.json
+skill_matcher = get_skill_matcher(config.SKILL_TAXONOMY_PATH)
+KNOWN_SKILLS = skill_matcher.skills
 
 # =============================
 # Structured Resume Parsing
 # =============================
-SECTION_HEADERS = [
-    'experience', 'work experience', 'professional experience', 'education', 'projects', 'skills', 'certifications',
-    'achievements', 'summary', 'profile'
-]
+resume_feature_extractor = get_resume_feature_extractor(
+    skill_finder=skill_matcher.find,
+    section_vocabulary=SectionVocabulary.from_file(config.SECTION_HEADERS_PATH) if config.SECTION_HEADERS_PATH else None,
+)
+
+def resume_features(text):
+    """Memoized single-pass ResumeFeatures for a resume or JD text (shared; do not mutate)."""
+    return resume_feature_extractor.extract(text)
 
 def parse_resume_sections(text):
-    sections = {}
-    current = 'summary'
-    sections[current] = []
-    for line in text.splitlines():
-        clean = line.strip()
-        low = clean.lower()
-        if any(re.fullmatch(rf"{h}\:?", low) for h in SECTION_HEADERS):
-            current = low.split(':')[0]
-            if current not in sections:
-                sections[current] = []
-            continue
-        if clean:
-            sections.setdefault(current, []).append(clean)
-    # Join lines
-    joined = {k: '\n'.join(v) for k, v in sections.items() if v}
-    # Extract skills tokens if skills section present
-    if 'skills' in joined:
-        skill_line = joined['skills']
-        tokens = re.split(r"[,;\n]\s*", skill_line)
-        joined['skills_list_raw'] = [t.strip() for t in tokens if t.strip()]
-    return joined
+    sections = dict(resume_features(text).sections)
+    if 'skills_list_raw' in sections:
+        sections['skills_list_raw'] = list(sections['skills_list_raw'])
+    return sections
 
 STUDY_RESOURCES = {
     "python": ["https://docs.python.org/3/", "https://realpython.com/"],
@@ -1836,26 +2409,15 @@ STUDY_RESOURCES = {
 }
 
 def extract_bullets(text):
-    lines = [l.strip() for l in text.splitlines() if l.strip()]
-    bullets = []
-    for line in lines:
-        if re.match(r"^[-*•]", line) or len(line.split()) > 4:
-            bullets.append(line.lstrip("-*• ").strip())
-    return bullets[:100]
+    return list(resume_features(text).bullets)
 
 def detect_skills(text):
-    lower = text.lower()
-    found = set()
-    for skill in KNOWN_SKILLS:
-        if skill in lower:
-            found.add(skill)
-    return sorted(found)
+    return list(resume_features(text).skills)
 
 def detect_skill_gaps(resume_skills, job_text):
     if not job_text:
         return []
-    job_lower = job_text.lower()
-    needed = {s for s in KNOWN_SKILLS if s in job_lower}
+    needed = set(resume_features(job_text).skills)
     gaps = sorted(list(needed - set(resume_skills)))
     return gaps
 
@@ -1869,8 +2431,7 @@ def build_study_pack(gaps):
     return pack
 
 def compute_basic_metrics(text, bullets, skills, gaps):
-    words = re.findall(r"\w+", text)
-    word_count = len(words)
+    word_count = resume_features(text).word_count
     avg_bullet_len = round(sum(len(b.split()) for b in bullets) / max(len(bullets), 1), 2)
     coverage_ratio = round(len(skills) / max(len(skills) + len(gaps), 1), 2)
     return {
@@ -1885,23 +2446,19 @@ def compute_semantic_match(resume_text, job_text):
     if not job_text or not resume_text:
         return None
     try:
-        vect = TfidfVectorizer(max_features=4000, ngram_range=(1,2))
-        docs = [resume_text, job_text]
-        X = vect.fit_transform(docs)
-        sim = cosine_similarity(X[0:1], X[1:2])[0][0]
+        # Corpus-fitted IDF (loaded once, shared by all threads); pair fit only when the scorer defers
+        sim = semantic_scorer.score(resume_text, job_text)
+        if sim is None:
+            vect = TfidfVectorizer(max_features=4000, ngram_range=(1,2))
+            X = vect.fit_transform([resume_text, job_text])
+            sim = cosine_similarity(X[0:1], X[1:2])[0][0]
         return round(float(sim) * 100, 2)
     except Exception as e:
         logger.error(f"semantic.match_error error={e}")
         return None
 
 def _extract_quantified_impact_lines(text):
-    lines = [line.strip() for line in text.splitlines() if line.strip()]
-    quantified = []
-    pattern = re.compile(r"\b\d+(?:\.\d+)?\s*(?:%|percent|x|k|m|million|billion|\+)\b", re.IGNORECASE)
-    for line in lines:
-        if pattern.search(line):
-            quantified.append(line)
-    return quantified
+    return list(resume_features(text).quantified_lines)
 
 def build_recruiter_shortlist_dashboard(
     resume_text,
@@ -1911,13 +2468,18 @@ def build_recruiter_shortlist_dashboard(
     combined_score,
     strengths,
     improvement_areas,
+    required_skills=None,
+    features=None,
 ):
-    required_skills = detect_skills(job_desc_text)
-    resume_skills = detect_skills(resume_text)
+    # Batch ranking passes the JD skills once instead of re-detecting them per candidate
+    if required_skills is None:
+        required_skills = resume_features(job_desc_text).skills
+    features = features or resume_features(resume_text)
+    resume_skills = features.skills
     matched_skills = sorted(list(set(required_skills).intersection(set(resume_skills))))
     missing_skills = sorted(list(set(required_skills) - set(resume_skills)))
-    quantified_lines = _extract_quantified_impact_lines(resume_text)
-    resume_word_count = len(re.findall(r"\w+", resume_text or ""))
+    quantified_lines = list(features.quantified_lines)
+    resume_word_count = features.word_count
 
     skill_coverage = None
     if required_skills:
@@ -2017,6 +2579,251 @@ def build_recruiter_shortlist_dashboard(
         "interviewFocusAreas": improvement_areas[:4] if improvement_areas else [],
     }
 
+def _generate_recruiter_narrative(resume_text, job_desc_text):
+    """LLM strengths/improvementAreas/recommendedRoles/generalFeedback for one candidate, or None on AI error."""
+    return _parse_recruiter_narrative(call_cohere_api(_recruiter_narrative_prompt(resume_text, job_desc_text)))
+
+def _recruiter_narrative_prompt(resume_text, job_desc_text):
+    return f"""
+You are an AI recruitment expert.
+
+Analyze the candidate's resume versus the job description below and provide a detailed professional JSON report including:
+
+- strengths: detailed list of the candidate's main strengths.
+- improvementAreas: detailed list of areas for improvement.
+- recommendedRoles: relevant job roles for the candidate.
+- generalFeedback: a detailed paragraph including a summary and recommendations.
+
+Include professional inferences if information is missing.
+
+Respond ONLY with the JSON object.
+
+Resume:
+\"\"\"{resume_text}\"\"\"
+
+Job Description:
+\"\"\"{job_desc_text}\"\"\"
+"""
+
+def _parse_recruiter_narrative(ai_response):
+    if not ai_response:
+        return None
+
+    parsed = extract_json_from_text(ai_response)
+    if not parsed:
+        parsed = {
+            "strengths": [],
+            "improvementAreas": [],
+            "recommendedRoles": [],
+            "generalFeedback": ai_response
+        }
+    return ensure_non_empty_fields(parsed)
+
+def compute_recruiter_scores(resume_text, job_desc_text, features=None):
+    """(lexical, semantic, combined) match percentages for one resume/JD pair; no LLM involved."""
+    # Simple lexical match percentage calculation
+    resume_words = (features or resume_features(resume_text)).word_set
+    job_words = resume_features(job_desc_text).word_set
+    common_words = resume_words.intersection(job_words)
+    match_percentage = round(len(common_words) / max(len(job_words), 1) * 100, 2)
+    semantic_score = compute_semantic_match(resume_text, job_desc_text)
+    if semantic_score is not None:
+        combined = round((semantic_score + match_percentage) / 2, 2)
+    else:
+        combined = match_percentage
+    return match_percentage, semantic_score, combined
+
+def build_fast_analysis(mode, resume_text, job_desc_text):
+    """Deterministic half of run_analysis_task's result, computed locally in milliseconds."""
+    features = resume_features(resume_text)
+    if mode == "recruiter":
+        lexical, semantic, combined = compute_recruiter_scores(resume_text, job_desc_text, features)
+        result = {
+            "lexicalMatchPercentage": lexical,
+            "combinedMatchPercentage": combined,
+            "shortlistDashboard": build_recruiter_shortlist_dashboard(
+                resume_text=resume_text,
+                job_desc_text=job_desc_text,
+                lexical_score=lexical,
+                semantic_score=semantic,
+                combined_score=combined,
+                strengths=[],
+                improvement_areas=[],
+                features=features,
+            ),
+        }
+        if semantic is not None:
+            result["semanticMatchPercentage"] = semantic
+        return result
+
+    skills = list(features.skills)
+    gaps = detect_skill_gaps(skills, job_desc_text)
+    result = {
+        "skills": skills,
+        "skillGaps": gaps,
+        "metrics": compute_basic_metrics(resume_text, features.bullets, skills, gaps),
+    }
+    semantic = compute_semantic_match(resume_text, job_desc_text) if job_desc_text else None
+    if semantic is not None:
+        result["semanticMatchPercentage"] = semantic
+    return result
+
+def score_candidates_batch(job_desc_text, resume_texts):
+    """
+    Lexical, semantic and combined match of one JD against many resumes in a single sparse pass.
+    Per pair the numbers equal run_analysis_task's recruiter scores.
+    Returns (lexical, semantic, combined) lists aligned with resume_texts.
+    """
+    n = len(resume_texts)
+    lexical = [0.0] * n
+    try:
+        # Binary JD vocabulary: row sums are |resume words ∩ JD words|, same tokens as re.findall(r"\w+")
+        job_vect = CountVectorizer(token_pattern=r"(?u)\w+", binary=True)
+        job_vect.fit([job_desc_text])
+        hits = np.asarray(job_vect.transform(resume_texts).sum(axis=1)).ravel()
+        job_word_count = max(len(job_vect.vocabulary_), 1)
+        lexical = [round(int(h) / job_word_count * 100, 2) for h in hits]
+    except ValueError:
+        pass  # JD without any word tokens
+
+    semantic = [None] * n
+    if job_desc_text and semantic_scorer.available:
+        matrix = semantic_scorer.transform([job_desc_text] + list(resume_texts))
+        if matrix[0].nnz:
+            sims = np.asarray((matrix[1:] @ matrix[0].T).todense()).ravel()
+            row_nnz = np.diff(matrix.indptr)[1:]
+            semantic = [round(float(sims[i]) * 100, 2) if row_nnz[i] and resume_texts[i] else None for i in range(n)]
+    for i in range(n):
+        if semantic[i] is None and resume_texts[i]:
+            # Same per-pair fallback compute_semantic_match uses when the corpus model has no opinion
+            semantic[i] = compute_semantic_match(resume_texts[i], job_desc_text)
+
+    combined = [
+        round((semantic[i] + lexical[i]) / 2, 2) if semantic[i] is not None else lexical[i]
+        for i in range(n)
+    ]
+    return lexical, semantic, combined
+
+def _top_k_indices(scores, k):
+    """Indices of the k highest scores, best first (ties keep input order); argpartition avoids a full sort."""
+    values = np.asarray(scores, dtype=float)
+    k = max(0, min(k, len(values)))
+    if k == 0:
+        return []
+    candidates = np.argpartition(-values, k - 1)[:k] if k < len(values) else np.arange(len(values))
+    return [int(i) for i in candidates[np.lexsort((candidates, -values[candidates]))]]
+
+def _recruiter_candidate_narrative(resume_text, job_desc_text, lexical, semantic, combined, required_skills, narrative=False):
+    """
+    LLM narrative for one ranked candidate plus the dashboard rebuilt with its strengths; {} on AI error.
+    Pass ``narrative`` (parsed, or None on AI error) when it was already generated in a batch.
+    """
+    if narrative is False:
+        narrative = _generate_recruiter_narrative(resume_text, job_desc_text)
+    if narrative is None:
+        return {}
+    return {
+        "narrative": {
+            key: narrative.get(key) for key in ("strengths", "improvementAreas", "recommendedRoles", "generalFeedback")
+        },
+        "shortlistDashboard": build_recruiter_shortlist_dashboard(
+            resume_text=resume_text,
+            job_desc_text=job_desc_text,
+            lexical_score=lexical,
+            semantic_score=semantic,
+            combined_score=combined,
+            strengths=narrative.get("strengths", []),
+            improvement_areas=narrative.get("improvementAreas", []),
+            required_skills=required_skills,
+        ),
+    }
+
+def _iter_recruiter_ranking(job_desc_text, candidates, top_k, narrative_top_k=0, defer_narratives=False, owner=None):
+    """
+    Rank candidates against one JD, yielding progress events and finally the result.
+    candidates: [{"candidateId", "text"}] or [{"candidateId", "file"}] (files are extracted here).
+    Yields {"stage": ..., "done": i, "total": n} and ends with {"stage": "complete", "result": {...}}.
+    With defer_narratives the top candidates get a narrativeJobId instead of an inline narrative.
+    """
+    started = time.time()
+    total = len(candidates)
+    texts, ids, skipped = [], [], []
+    for i, candidate in enumerate(candidates, start=1):
+        text = candidate.get("text")
+        if text is None and candidate.get("file") is not None:
+            text = extract_text_from_pdf(candidate["file"], char_budget=3000)
+        if text and text.strip():
+            texts.append(text[:3000])
+            ids.append(candidate["candidateId"])
+        else:
+            skipped.append({"candidateId": candidate["candidateId"], "error": "Could not extract resume text"})
+        yield {"stage": "extract", "done": i, "total": total}
+    extract_ms = round((time.time() - started) * 1000)
+
+    score_started = time.time()
+    lexical, semantic, combined = score_candidates_batch(job_desc_text, texts)
+    selected = _top_k_indices(combined, top_k)
+    required_skills = detect_skills(job_desc_text)
+    score_ms = round((time.time() - score_started) * 1000)
+    yield {"stage": "score", "done": len(texts), "total": len(texts)}
+
+    ranked = []
+    for rank, idx in enumerate(selected, start=1):
+        ranked.append({
+            "rank": rank,
+            "candidateId": ids[idx],
+            "lexicalMatchPercentage": lexical[idx],
+            "semanticMatchPercentage": semantic[idx],
+            "combinedMatchPercentage": combined[idx],
+            "shortlistDashboard": build_recruiter_shortlist_dashboard(
+                resume_text=texts[idx],
+                job_desc_text=job_desc_text,
+                lexical_score=lexical[idx],
+                semantic_score=semantic[idx],
+                combined_score=combined[idx],
+                strengths=[],
+                improvement_areas=[],
+                required_skills=required_skills,
+            ),
+        })
+
+    narrative_started = time.time()
+    narrative_count = min(narrative_top_k, len(ranked))
+    narrative_args = []
+    for entry in ranked[:narrative_count]:
+        idx = selected[entry["rank"] - 1]
+        narrative_args.append((texts[idx], job_desc_text, lexical[idx], semantic[idx], combined[idx], required_skills))
+    if defer_narratives:
+        # Fast mode: the ranking returns now; each narrative is fetched from /analyze/narrative/<id>
+        for entry, args in zip(ranked, narrative_args):
+            entry["narrativeJobId"] = narrative_jobs.submit(
+                _with_llm_scope(_recruiter_candidate_narrative, tenant=owner, priority=BATCH),
+                *args, kind="recruiter.rank", owner=owner,
+            )
+    elif narrative_args:
+        # All narrative prompts fan out at once (iter_llm_many); progress counts them as they land
+        prompts = [_recruiter_narrative_prompt(args[0], args[1]) for args in narrative_args]
+        for done, (i, response) in enumerate(iter_llm_many(prompts), start=1):
+            ranked[i].update(
+                _recruiter_candidate_narrative(*narrative_args[i], narrative=_parse_recruiter_narrative(response))
+            )
+            yield {"stage": "narrative", "done": done, "total": narrative_count}
+
+    yield {"stage": "complete", "result": {
+        "totalCandidates": total,
+        "scoredCandidates": len(texts),
+        "topK": len(ranked),
+        "requiredSkills": required_skills,
+        "ranked": ranked,
+        "skipped": skipped,
+        "timingsMs": {
+            "extract": extract_ms,
+            "score": score_ms,
+            "narratives": round((time.time() - narrative_started) * 1000),
+            "total": round((time.time() - started) * 1000),
+        },
+    }}
+
 def _generate_interview_questions_for_role(resume_excerpt, target_role, top_skills):
     prompt = f'''
 You are an expert technical interviewer.
@@ -2041,8 +2848,8 @@ Top Skills: {', '.join(top_skills)}
     except Exception:
         return [q.strip() for q in re.split(r"\n+", resp) if q.strip()][:8]
 
-def _generate_cover_letter_text(resume_text, job_description):
-    prompt = f"""
+def _cover_letter_prompt(resume_text, job_description):
+    return f"""
 You are an expert career coach. Write a professional and persuasive cover letter for the following candidate based on their resume and the job description.
 
 RESUME:
@@ -2053,7 +2860,9 @@ JOB DESCRIPTION:
 
 The cover letter should be formatted correctly, highlight relevant skills, and express enthusiasm for the role.
 """
-    cover_letter = call_llm(prompt, temperature=0.7)
+
+def _generate_cover_letter_text(resume_text, job_description):
+    cover_letter = call_llm(_cover_letter_prompt(resume_text, job_description), temperature=0.7)
     return cover_letter or "Failed to generate cover letter."
 
 def _infer_orchestrator_role(job_description, analysis_result):
@@ -2071,34 +2880,105 @@ def _infer_orchestrator_role(job_description, analysis_result):
 
     return "Target Role"
 
-def _build_orchestrator_workflow(analysis_result, tailored_resume, cover_letter, interview_questions, target_role):
+ORCHESTRATOR_MODES = ("parallel", "fused")
+
+def _fused_orchestrator_prompt(resume_text, job_description, top_skills):
+    # One prompt for all four orchestrator outputs, so the resume is sent (and billed) once
+    return f"""
+You are an expert AI career coach, resume writer and technical interviewer.
+
+Using the candidate's resume and the job description below, produce ONE JSON object with exactly these keys:
+- analysis: {{"strengths": [...], "improvementAreas": [...], "recommendedRoles": [...], "generalFeedback": "paragraph"}}
+- tailoredResume: {{"rewritten_summary": "string", "tailored_bullets": [{{"original": "string", "rewritten": "string"}}]}}
+- coverLetter: a professional, persuasive cover letter as a single string, highlighting relevant skills
+- interviewQuestions: an array of 8 interview questions for the first recommended role, using the top skills
+
+Top Skills: {', '.join(top_skills)}
+
+Respond ONLY with the JSON object. Do not include any markdown formatting, preamble, or conversational text.
+
+Resume:
+\"\"\"{resume_text[:3000]}\"\"\"
+
+Job Description:
+\"\"\"{job_description[:3000]}\"\"\"
+"""
+
+def _split_fused_orchestrator_response(response, resume_text, job_description):
+    """
+    Split the fused JSON into the per-step shapes of the parallel mode. Keys that are missing or
+    malformed are left out, so the orchestrator can fill them with the regular per-step calls.
+    """
+    parsed = extract_json_from_text(response) if response else None
+    if not isinstance(parsed, dict):
+        return {}
+
+    parts = {}
+    analysis = parsed.get("analysis")
+    if not isinstance(analysis, dict) and any(k in parsed for k in ("strengths", "improvementAreas", "recommendedRoles")):
+        analysis = {k: parsed[k] for k in ("strengths", "improvementAreas", "recommendedRoles", "generalFeedback") if k in parsed}
+    if isinstance(analysis, dict) and analysis:
+        analysis = ensure_non_empty_fields(dict(analysis))
+        analysis["formattedReport"] = format_report(analysis)
+        semantic_score = compute_semantic_match(resume_text, job_description) if job_description else None
+        if semantic_score is not None:
+            analysis["semanticMatchPercentage"] = semantic_score
+        parts["analysis"] = analysis
+
+    tailored = parsed.get("tailoredResume")
+    if isinstance(tailored, dict) and tailored.get("rewritten_summary"):
+        parts["tailoredResume"] = tailored
+
+    cover_letter = parsed.get("coverLetter")
+    if isinstance(cover_letter, str) and cover_letter.strip():
+        parts["coverLetter"] = cover_letter.strip()
+
+    questions = parsed.get("interviewQuestions", parsed.get("questions"))
+    if isinstance(questions, list):
+        questions = [q.strip() for q in questions if isinstance(q, str) and q.strip()][:12]
+        if questions:
+            parts["interviewQuestions"] = questions
+    return parts
+
+def _build_orchestrator_workflow(analysis_result, tailored_resume, cover_letter, interview_questions, target_role, step_reports=None):
     workflow = [
         {
             "step": "Analyze resume",
+            "key": "analysis",
             "status": "completed",
             "summary": "Generated ATS-style insights, strengths, improvement areas, and match scoring.",
         },
         {
             "step": "Compare with job description",
+            "key": "analysis",
             "status": "completed",
             "summary": "Calculated lexical and semantic alignment to identify fit and skill gaps.",
         },
         {
             "step": "Tailor resume",
+            "key": "tailoredResume",
             "status": "completed",
             "summary": "Rewrote the candidate summary and experience bullets to better match the target role.",
         },
         {
             "step": "Generate cover letter",
+            "key": "coverLetter",
             "status": "completed",
             "summary": "Drafted a role-specific cover letter aligned with the candidate profile.",
         },
         {
             "step": "Generate interview questions",
+            "key": "interviewQuestions",
             "status": "completed",
             "summary": "Prepared targeted questions for the target role and the candidate's likely gaps.",
         },
     ]
+    # step_reports: {key: {"status", "durationMs"}} from the step graph
+    for entry in workflow:
+        report = (step_reports or {}).get(entry.pop("key"))
+        if report:
+            entry["status"] = report["status"]
+            entry["durationMs"] = report.get("durationMs")
 
     return {
         "targetRole": target_role,
@@ -2117,6 +2997,7 @@ def auth_required(fn):
 
         if config.DEV_BYPASS_AUTH:
             # Inject mock user only in dev mode
+            _llm_tenant.set("dev-user")
             return fn({"uid": "dev-user", "email": "dev@local"}, *args, **kwargs)
 
         auth_header = request.headers.get("Authorization")
@@ -2128,82 +3009,197 @@ def auth_required(fn):
         user_info = verify_firebase_token(id_token)
         if not user_info:
             return jsonify({"error": "Invalid or expired token"}), 401
+        _llm_tenant.set(user_info.get("uid"))
         return fn(user_info, *args, **kwargs)
     wrapper.__name__ = fn.__name__
     return wrapper
 
-@app.route('/ai-orchestrator', methods=['POST'])
-@cross_origin()
-@auth_required
-@rate_limit(max_requests=8, per_seconds=60)
-def ai_orchestrator(user_info):
-    if 'resume' not in request.files:
-        return jsonify({'error': 'No resume file provided'}), 400
-
-    resume_file = request.files['resume']
-    job_description = request.form.get('jobDescription', '')
-    resume_text = extract_text_from_pdf(resume_file)
+def _iter_ai_orchestrator(user_info, resume_text, job_description, session, resume_hash, stream_cover_letter=False,
+                          orchestrator_mode="parallel"):
+    """
+    The orchestrator workflow as (event, data) pairs: "step" when a stage finishes, "chunk" for cover
+    letter text as it streams (stream_cover_letter only), then a final "result" or "error".
 
-    if not resume_text:
-        return jsonify({'error': 'Could not extract text from PDF'}), 400
+    Analysis, tailoring and the cover letter run concurrently on orchestrator_pool; interview
+    questions start once the analysis has produced a target role. A step that overruns
+    ORCHESTRATOR_STEP_TIMEOUT_SECONDS is reported as timed out and the rest is returned with
+    partial=True instead of failing the whole request.
 
+    orchestrator_mode="fused" first asks for all four outputs in one prompt; each step then takes
+    its part of that response and only calls the provider itself if the part is missing (or the
+    fused call failed or timed out).
+    """
     user_id = user_info.get('uid', 'anonymous')
 
-    analysis_result = run_analysis_task.run(
-        "jobSeeker",
-        resume_text,
-        job_description,
-        "",
-        user_info,
-    )
-
-    if not isinstance(analysis_result, dict) or analysis_result.get('error'):
-        return jsonify({'error': 'Failed to analyze resume', 'details': analysis_result}), 500
-
-    tailored_resume = tailor_resume_task.run(resume_text, job_description, user_id)
-    if not isinstance(tailored_resume, dict) or tailored_resume.get('error'):
-        return jsonify({'error': 'Failed to tailor resume', 'details': tailored_resume}), 500
-
-    target_role = _infer_orchestrator_role(job_description, analysis_result)
-    top_skills = detect_skills(job_description or resume_text)
+    resume_skills = session['skills'] if session else None
+    top_skills = detect_skills(job_description) if job_description else []
     if not top_skills:
-        top_skills = detect_skills(resume_text)
+        top_skills = resume_skills if resume_skills is not None else detect_skills(resume_text)
+    resume_excerpt = _session_prompt_excerpt(session, max_length=900)
+    if resume_excerpt is None:
+        resume_excerpt = trim_resume_for_prompt(resume_text, max_length=900)
+
+    fused = orchestrator_mode == "fused"
+
+    def _fused(deps, emit):
+        response = call_llm(_fused_orchestrator_prompt(resume_text, job_description, top_skills[:8]), temperature=0.6)
+        parts = _split_fused_orchestrator_response(response, resume_text, job_description)
+        logger.info(f"orchestrator.fused_parsed parts={','.join(sorted(parts)) or '-'}")
+        return parts
+
+    def _analysis(deps, emit):
+        if deps.get("fused", {}).get("analysis"):
+            return deps["fused"]["analysis"]
+        result = run_analysis_task.run("jobSeeker", resume_text, job_description, "", user_info)
+        if not isinstance(result, dict) or result.get('error'):
+            raise StepFailed('Failed to analyze resume', result)
+        return result
 
-    resume_excerpt = trim_resume_for_prompt(resume_text, max_length=900)
-    interview_questions = _generate_interview_questions_for_role(
-        resume_excerpt,
-        target_role,
-        top_skills[:8],
+    def _tailored_resume(deps, emit):
+        if deps.get("fused", {}).get("tailoredResume"):
+            return _save_tailored_resume(deps["fused"]["tailoredResume"], resume_text, job_description, user_id)
+        result = tailor_resume_task.run(
+            resume_text, job_description, user_id, trimmed_resume=_session_prompt_excerpt(session)
+        )
+        if not isinstance(result, dict) or result.get('error'):
+            raise StepFailed('Failed to tailor resume', result)
+        return result
+
+    def _cover_letter(deps, emit):
+        if deps.get("fused", {}).get("coverLetter"):
+            if stream_cover_letter:
+                emit("chunk", {"step": "coverLetter", "text": deps["fused"]["coverLetter"]})
+            return deps["fused"]["coverLetter"]
+        if not stream_cover_letter:
+            return _generate_cover_letter_text(resume_text, job_description)
+        parts = []
+        for chunk in call_llm_stream(_cover_letter_prompt(resume_text, job_description), temperature=0.7):
+            parts.append(chunk)
+            emit("chunk", {"step": "coverLetter", "text": chunk})
+        return "".join(parts).strip() or "Failed to generate cover letter."
+
+    def _interview_questions(deps, emit):
+        if deps.get("fused", {}).get("interviewQuestions"):
+            return deps["fused"]["interviewQuestions"]
+        target_role = _infer_orchestrator_role(job_description, deps["analysis"])
+        return _generate_interview_questions_for_role(resume_excerpt, target_role, top_skills[:8])
+
+    first = ("fused",) if fused else ()
+    steps = [
+        *([Step("fused", _fused, optional=True)] if fused else []),
+        Step("analysis", _analysis, depends_on=first),
+        Step("tailoredResume", _tailored_resume, depends_on=first),
+        Step("coverLetter", _cover_letter, depends_on=first),
+        Step("interviewQuestions", _interview_questions, depends_on=first + ("analysis",)),
+    ]
+    results = {}
+    step_reports = {}
+    started = time.time()
+    for kind, name, data in run_step_graph(
+        orchestrator_pool, steps, default_timeout=config.ORCHESTRATOR_STEP_TIMEOUT_SECONDS
+    ):
+        if kind == "emit":
+            yield data["event"], data["data"]
+        elif name == "fused":
+            # The parts are reported by the steps that consume them; on failure each step uses its own prompt
+            if kind == "completed":
+                yield "step", {"step": name, "parts": sorted(data["result"]), "durationMs": data["durationMs"]}
+            else:
+                logger.warning(f"orchestrator.fused_{kind} error={data.get('error', '-')} falling_back=per_step")
+                yield "step", {"step": name, "status": kind, "durationMs": data.get("durationMs")}
+        elif kind == "failed":
+            logger.warning(f"orchestrator.step_failed step={name} error={data['error']}")
+            yield "error", {'error': data['error'], 'details': data['details']}
+            return
+        elif kind == "completed":
+            results[name] = data["result"]
+            step_reports[name] = {"status": "completed", "durationMs": data["durationMs"]}
+            yield "step", {"step": name, "result": data["result"], "durationMs": data["durationMs"]}
+        else:
+            step_reports[name] = {"status": kind, "durationMs": data.get("durationMs")}
+            yield "step", {"step": name, "status": kind, **data}
+
+    analysis_result = results.get("analysis")
+    pending_steps = [step.name for step in steps if step.name not in results and step.name != "fused"]
+    logger.info(
+        f"orchestrator.completed mode={orchestrator_mode} ms={round((time.time() - started) * 1000)} "
+        f"pending={','.join(pending_steps) or '-'}"
     )
-    cover_letter = _generate_cover_letter_text(resume_text, job_description)
 
     orchestrator_result = _build_orchestrator_workflow(
         analysis_result=analysis_result,
-        tailored_resume=tailored_resume,
-        cover_letter=cover_letter,
-        interview_questions=interview_questions,
-        target_role=target_role,
+        tailored_resume=results.get("tailoredResume"),
+        cover_letter=results.get("coverLetter"),
+        interview_questions=results.get("interviewQuestions"),
+        target_role=_infer_orchestrator_role(job_description, analysis_result),
+        step_reports=step_reports,
     )
 
     orchestrator_result["recommendations"] = {
         "primaryAction": "Use the tailored resume and cover letter for the target application.",
-        "interviewFocus": analysis_result.get("improvementAreas", [])[:4],
+        "interviewFocus": (analysis_result or {}).get("improvementAreas", [])[:4],
         "skillSignals": top_skills[:8],
     }
-    orchestrator_result["formattedReport"] = format_report(analysis_result)
+    orchestrator_result["formattedReport"] = format_report(analysis_result) if analysis_result else None
+    orchestrator_result["resumeHash"] = resume_hash
+    orchestrator_result["orchestratorMode"] = orchestrator_mode
+    orchestrator_result["partial"] = bool(pending_steps)
+    orchestrator_result["pendingSteps"] = pending_steps
+
+    try:
+        save_analysis(
+            user_id=user_id,
+            mode="ai_orchestrator",
+            result=orchestrator_result,
+            resume_excerpt=resume_text[:500],
+            job_desc_excerpt=job_description[:500],
+        )
+    except Exception as e:
+        logger.warning(f"Failed to save orchestrator result: {e}")
+
+    yield "result", orchestrator_result
+
+@app.route('/ai-orchestrator', methods=['POST'])
+@cross_origin()
+@auth_required
+@rate_limit(max_requests=8, per_seconds=60)
+def ai_orchestrator(user_info):
+    resume_text, resume_hash, session, error = _resolve_resume_input(user_info)
+    if error:
+        return error
+
+    job_description = request.form.get('jobDescription', '')
+
+    if not resume_text:
+        return jsonify({'error': 'Could not extract text from PDF'}), 400
 
-    try:
-        save_analysis(
-            user_id=user_id,
-            mode="ai_orchestrator",
-            result=orchestrator_result,
-            resume_excerpt=resume_text[:500],
-            job_desc_excerpt=job_description[:500],
-        )
-    except Exception as e:
-        logger.warning(f"Failed to save orchestrator result: {e}")
+    orchestrator_mode = (
+        request.form.get('orchestratorMode') or request.args.get('orchestratorMode') or config.ORCHESTRATOR_MODE
+    ).strip().lower()
+    if orchestrator_mode not in ORCHESTRATOR_MODES:
+        return jsonify({'error': f"orchestratorMode must be one of {', '.join(ORCHESTRATOR_MODES)}"}), 400
+
+    stream = _is_truthy(request.form.get('stream') or request.args.get('stream'))
+    workflow = _iter_ai_orchestrator(
+        user_info, resume_text, job_description, session, resume_hash, stream_cover_letter=stream,
+        orchestrator_mode=orchestrator_mode,
+    )
+    if stream:
+        def generate():
+            try:
+                for event, data in workflow:
+                    yield _sse_event(event, data)
+            except Exception as e:
+                logger.error(f"orchestrator.stream_failed error={e}")
+                yield _sse_event("error", {"error": "Orchestrator failed"})
+        return _sse_response(generate())
 
-    return jsonify(orchestrator_result)
+    for event, data in workflow:
+        if event == "error":
+            return jsonify(data), 500
+        if event == "result":
+            return jsonify(data)
+    return jsonify({'error': 'Orchestrator produced no result'}), 500
 
 @app.route("/", methods=["GET"])
 def index():
@@ -2217,6 +3213,13 @@ def start_request_tracing():
         req_id = str(uuid.uuid4())
     g.request_id = req_id
 
+    # 2. Opt this request's LLM calls into hedging (LLM_HEDGE_ENDPOINTS)
+    _llm_hedge_enabled.set(request.endpoint in LLM_HEDGE_ENDPOINTS)
+
+    # 3. LLM rate budget is charged to the signed-in user (set by auth_required), interactive priority
+    _llm_tenant.set(None)
+    _llm_priority.set(INTERACTIVE)
+
 
 @app.after_request
 def set_security_headers(response):
@@ -2269,7 +3272,8 @@ def add_cors_headers(response):
         response.headers["Access-Control-Allow-Origin"] = origin
         response.headers["Access-Control-Allow-Credentials"] = "true"
         response.headers["Access-Control-Allow-Methods"] = "GET,POST,PUT,PATCH,DELETE,OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = "Authorization,Content-Type,X-Requested-With"
+        response.headers["Access-Control-Allow-Headers"] = "Authorization,Content-Type,X-Requested-With,X-Session-ID"
+        response.headers["Access-Control-Expose-Headers"] = "Content-Disposition,X-Session-ID"
         vary = response.headers.get("Vary", "")
         response.headers["Vary"] = (f"{vary}, Origin".strip(", ") if vary else "Origin")
     return response
@@ -2324,7 +3328,7 @@ def auth_post_login(user_info):
 @app.route('/metrics', methods=['GET'])
 def metrics():
     uptime = round(time.time() - START_TIME, 1)
-    return jsonify({'uptimeSeconds': uptime, **_metrics})
+    return jsonify({'uptimeSeconds': uptime, **_metrics, 'llmExecutor': llm_executor.stats(), 'llmSingleFlight': llm_single_flight.stats(), 'cache': response_cache.stats(), 'pdfExtractor': pdf_extractor.stats(), 'semanticModel': semantic_scorer.stats(), 'narrativeJobs': narrative_jobs.stats(), 'llmBreakers': llm_breakers.stats(), 'llmHedging': llm_hedger.stats(), 'asyncLLM': async_llm.stats(), 'llmGovernor': llm_governor.stats()})
 
 @app.route('/internal/sys-info', methods=['GET'])
 def sys_info():
@@ -2457,51 +3461,12 @@ Job Description:
         return final_result
 
     elif mode == "recruiter":
-        # Simple lexical match percentage calculation
-        resume_words = set(re.findall(r"\w+", resume_text.lower()))
-        job_words = set(re.findall(r"\w+", job_desc_text.lower()))
-        common_words = resume_words.intersection(job_words)
-        match_percentage = round(len(common_words) / max(len(job_words), 1) * 100, 2)
-        semantic_score = compute_semantic_match(resume_text, job_desc_text)
-        if semantic_score is not None:
-            combined = round((semantic_score + match_percentage) / 2, 2)
-        else:
-            combined = match_percentage
-
-        prompt = f"""
-You are an AI recruitment expert.
-
-Analyze the candidate's resume versus the job description below and provide a detailed professional JSON report including:
-
-- strengths: detailed list of the candidate's main strengths.
-- improvementAreas: detailed list of areas for improvement.
-- recommendedRoles: relevant job roles for the candidate.
-- generalFeedback: a detailed paragraph including a summary and recommendations.
-
-Include professional inferences if information is missing.
+        features = resume_features(resume_text)
+        match_percentage, semantic_score, combined = compute_recruiter_scores(resume_text, job_desc_text, features)
 
-Respond ONLY with the JSON object.
-
-Resume:
-\"\"\"{resume_text}\"\"\"
-
-Job Description:
-\"\"\"{job_desc_text}\"\"\"
-"""
-        ai_response = call_cohere_api(prompt)
-        if not ai_response:
+        final_result = _generate_recruiter_narrative(resume_text, job_desc_text)
+        if final_result is None:
             return {"error": "AI service error"}
-
-        parsed = extract_json_from_text(ai_response)
-        if not parsed:
-            parsed = {
-                "strengths": [],
-                "improvementAreas": [],
-                "recommendedRoles": [],
-                "generalFeedback": ai_response
-            }
-        
-        final_result = ensure_non_empty_fields(parsed)
         final_result["generalFeedback"] = f"Lexical Match: {match_percentage}% | Semantic: {semantic_score if semantic_score is not None else 'N/A'}% | Combined: {combined}%\n\n{final_result['generalFeedback']}"
         final_result['lexicalMatchPercentage'] = match_percentage
         if semantic_score is not None:
@@ -2516,6 +3481,7 @@ Job Description:
             combined_score=combined,
             strengths=final_result.get("strengths", []),
             improvement_areas=final_result.get("improvementAreas", []),
+            features=features,
         )
             
         final_result["formattedReport"] = format_report(final_result)
@@ -2527,7 +3493,7 @@ Job Description:
     return {"error": "Invalid mode"}
 
 @celery.task(bind=True, name="backend.app.estimate_salary_task")
-def estimate_salary_task(self, resume_text, job_description, user_id="anonymous"):
+def estimate_salary_task(self, resume_text, job_description, user_id="anonymous", trimmed_resume=None):
     """
     Background task: Estimate salary based on resume and job description.
     Includes India salary benchmarks (2025-2026).
@@ -2558,7 +3524,7 @@ def estimate_salary_task(self, resume_text, job_description, user_id="anonymous"
             benchmark = INDIA_SALARY_BENCHMARKS[detected_role]
         
         # Use trimmed resume to reduce tokens
-        trimmed_resume = trim_resume_for_prompt(resume_text, max_length=800)
+        trimmed_resume = trimmed_resume or trim_resume_for_prompt(resume_text, max_length=800)
         trimmed_jd = job_description[:800] if job_description else ""
         
         prompt = f'''Based on candidate resume and job description, estimate salary for India market 2025-2026.
@@ -2616,13 +3582,13 @@ You MUST return the output as a valid and strict JSON object using the exact sch
         return {"error": str(e)}
 
 @celery.task(bind=True, name="backend.app.generate_career_path_task")
-def generate_career_path_task(self, resume_text, user_id="anonymous"):
+def generate_career_path_task(self, resume_text, user_id="anonymous", trimmed_resume=None):
     """
     Background task: Generate career roadmap based on resume.
     Uses trimmed resume to reduce tokens and improve speed.
     """
     try:
-        trimmed_resume = trim_resume_for_prompt(resume_text, max_length=800)
+        trimmed_resume = trimmed_resume or trim_resume_for_prompt(resume_text, max_length=800)
         
         prompt = f'''Analyze the candidate's resume and suggest a long-term career path roadmap.
 
@@ -2667,16 +3633,26 @@ You MUST return the output as a valid and strict JSON object using the exact sch
         return {"error": str(e)}
 
 @celery.task(bind=True, name="backend.app.tailor_resume_task")
-def tailor_resume_task(self, resume_text, job_description, user_id="anonymous"):
+def tailor_resume_task(self, resume_text, job_description, user_id="anonymous", trimmed_resume=None):
     """
     Background task: Tailor resume to job description.
     Uses trimmed resume to reduce tokens and improve speed.
     """
     try:
-        trimmed_resume = trim_resume_for_prompt(resume_text, max_length=800)
-        trimmed_jd = job_description[:800] if job_description else ""
-        
-        prompt = f'''Rewrite the candidate's resume summary and key experience bullet points to better align with the job description keywords and requirements.
+        trimmed_resume = trimmed_resume or trim_resume_for_prompt(resume_text, max_length=800)
+        response = call_llm(_tailor_resume_prompt(trimmed_resume, job_description), temperature=0.7)
+        if not response:
+            return {"error": "Failed to tailor resume"}
+        return _finish_tailored_resume(response, resume_text, job_description, user_id)
+    
+    except Exception as e:
+        logger.error(f"Tailor resume task failed: {e}")
+        return {"error": str(e)}
+
+def _tailor_resume_prompt(trimmed_resume, job_description):
+    trimmed_jd = job_description[:800] if job_description else ""
+
+    return f'''Rewrite the candidate's resume summary and key experience bullet points to better align with the job description keywords and requirements.
 
 RESUME (KEY SECTIONS):
 {trimmed_resume}
@@ -2695,30 +3671,26 @@ You MUST return the output as a valid and strict JSON object using the exact sch
         }}
     ]
 }}'''
-        
-        response = call_llm(prompt, temperature=0.7)
-        if not response:
-            return {"error": "Failed to tailor resume"}
-        
-        try:
-            if "```json" in response:
-                response = response.split("```json")[1].split("```")[0].strip()
-            elif "```" in response:
-                response = response.split("```")[1].split("```")[0].strip()
-            result = json.loads(response)
-        except:
-            result = {"raw_response": response}
-        
-        try:
-            save_analysis(user_id=user_id, mode="tailor_resume", result=result, resume_excerpt=resume_text[:500], job_desc_excerpt=job_description[:500])
-        except Exception as e:
-            logger.warning(f"Failed to save tailor resume: {e}")
-        
-        return result
-    
+
+def _finish_tailored_resume(response, resume_text, job_description, user_id):
+    """Parse the tailoring JSON (raw_response fallback) and save it to history."""
+    try:
+        if "```json" in response:
+            response = response.split("```json")[1].split("```")[0].strip()
+        elif "```" in response:
+            response = response.split("```")[1].split("```")[0].strip()
+        result = json.loads(response)
+    except:
+        result = {"raw_response": response}
+    return _save_tailored_resume(result, resume_text, job_description, user_id)
+
+def _save_tailored_resume(result, resume_text, job_description, user_id):
+    try:
+        save_analysis(user_id=user_id, mode="tailor_resume", result=result, resume_excerpt=resume_text[:500], job_desc_excerpt=job_description[:500])
     except Exception as e:
-        logger.error(f"Tailor resume task failed: {e}")
-        return {"error": str(e)}
+        logger.warning(f"Failed to save tailor resume: {e}")
+    
+    return result
 
 @app.route('/tasks/<task_id>', methods=['GET'])
 @cross_origin()
@@ -2737,6 +3709,12 @@ def get_task_status(task_id):
                 'state': state,
                 'status': 'Processing...'
             })
+        if state == 'PROGRESS':
+            return jsonify({
+                'state': state,
+                'status': 'Processing...',
+                'progress': task.info,
+            })
         if state == 'SUCCESS':
             return jsonify({
                 'state': state,
@@ -2752,6 +3730,148 @@ def get_task_status(task_id):
         return jsonify({'state': 'FAILURE', 'error': str(e)}), 500
 
 
+@celery.task(bind=True, name="backend.app.rank_candidates_task")
+def rank_candidates_task(self, job_desc_text, candidates, top_k, narrative_top_k=0, user_id="anonymous"):
+    """
+    Background task: rank many resumes against one JD (see _iter_recruiter_ranking).
+    candidates are {"candidateId", "text"} dicts; progress is published as PROGRESS task state.
+    """
+    def _rank():
+        # LLM calls made here are batch work: they wait longer but never use the interactive reserve
+        result = None
+        for event in _iter_recruiter_ranking(job_desc_text, candidates, top_k, narrative_top_k):
+            if event["stage"] == "complete":
+                result = event["result"]
+            elif self.request.id:
+                self.update_state(state="PROGRESS", meta=event)
+        return result
+
+    result = _with_llm_scope(_rank, tenant=user_id, priority=BATCH)()
+    write_audit(user_id, 'recruiter.rank', {'candidates': len(candidates), 'topK': top_k})
+    return result
+
+def _sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def _sse_response(events):
+    return Response(
+        stream_with_context(events),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def _stream_llm_events(prompt, temperature, finalize):
+    """SSE for one completion: a "chunk" event per provider chunk, then "result" with finalize(full_text)."""
+    parts = []
+    try:
+        for chunk in call_llm_stream(prompt, temperature):
+            parts.append(chunk)
+            yield _sse_event("chunk", {"text": chunk})
+        yield _sse_event("result", finalize("".join(parts).strip()))
+    except Exception as e:
+        logger.error(f"llm.sse_failed error={e}")
+        yield _sse_event("error", {"error": "Generation failed"})
+
+def _is_truthy(value):
+    return str(value or "").lower() in ("1", "true", "yes")
+
+def _collect_rank_candidates(user_info, payload):
+    """Candidates from uploaded 'resumes' files, JSON/form resume texts and resumeIds, in that order."""
+    candidates = []
+    for i, resume_file in enumerate(request.files.getlist("resumes"), start=1):
+        candidates.append({"candidateId": resume_file.filename or f"file-{i}", "file": resume_file})
+
+    resumes = payload.get("resumes")
+    if resumes is None:
+        resumes = request.form.getlist("resumeTexts")
+    for i, item in enumerate(resumes or [], start=1):
+        if isinstance(item, dict):
+            candidates.append({"candidateId": str(item.get("id") or f"text-{i}"), "text": item.get("text") or ""})
+        else:
+            candidates.append({"candidateId": f"text-{i}", "text": str(item)})
+
+    resume_ids = payload.get("resumeIds")
+    if resume_ids is None:
+        resume_ids = request.form.getlist("resumeIds")
+    user_id = user_info.get("uid", "anonymous")
+    for resume_id in resume_ids or []:
+        session = get_resume_session(user_id, resume_id)
+        candidates.append({"candidateId": resume_id, "text": session["text"] if session else ""})
+    return candidates
+
+@app.route('/recruiter/rank', methods=['POST'])
+@cross_origin()
+@auth_required
+@rate_limit(max_requests=6, per_seconds=60)
+def recruiter_rank(user_info):
+    """
+    Rank N resumes against one job description in a single vectorized pass.
+    Form/JSON fields: jobDescription (or job_description file), resumes (files or texts),
+    resumeIds, topK, narrativeTopK (LLM narratives for the best candidates only), stream,
+    fast (return scores at once; narratives become narrativeJobIds for /analyze/narrative/<id>).
+    """
+    payload = (request.get_json(silent=True) or {}) if request.is_json else {}
+    form = payload if request.is_json else request.form
+
+    job_desc_text = (form.get("jobDescription") or "").strip()
+    if not job_desc_text and request.files.get("job_description"):
+        job_desc_text = extract_text_from_pdf(request.files["job_description"], char_budget=2000, fast=True) or ""
+    job_desc_text = job_desc_text[:2000]
+    if not job_desc_text:
+        return jsonify({"error": "Job description is required"}), 400
+
+    candidates = _collect_rank_candidates(user_info, payload)
+    if not candidates:
+        return jsonify({"error": "At least one resume is required"}), 400
+    if len(candidates) > config.RECRUITER_RANK_MAX_CANDIDATES:
+        return jsonify({"error": f"At most {config.RECRUITER_RANK_MAX_CANDIDATES} resumes per request"}), 400
+
+    try:
+        top_k = int(form.get("topK") or len(candidates))
+        narrative_top_k = min(int(form.get("narrativeTopK") or 0), 10)
+    except (TypeError, ValueError):
+        return jsonify({"error": "topK and narrativeTopK must be integers"}), 400
+    top_k = max(1, top_k)
+    user_id = user_info.get("uid", "anonymous")
+    stream = _is_truthy(form.get("stream") or request.args.get("stream"))
+    fast = _is_truthy(form.get("fast") or request.args.get("fast"))
+    ranking_options = {"defer_narratives": fast, "owner": user_id}
+
+    if stream:
+        def generate():
+            for event in _iter_recruiter_ranking(job_desc_text, candidates, top_k, narrative_top_k, **ranking_options):
+                if event["stage"] == "complete":
+                    write_audit(user_id, 'recruiter.rank', {'candidates': len(candidates), 'topK': top_k})
+                    yield _sse_event("result", event["result"])
+                else:
+                    yield _sse_event("progress", event)
+        return _sse_response(generate())
+
+    if ASYNC_TASKS_ENABLED and not fast:
+        # Files can't cross the broker; extract here and queue text-only candidates
+        queued = [
+            {"candidateId": c["candidateId"], "text": c.get("text") if c.get("file") is None
+             else (extract_text_from_pdf(c["file"], char_budget=3000) or "")}
+            for c in candidates
+        ]
+        try:
+            task = rank_candidates_task.apply_async(
+                args=[job_desc_text, queued, top_k, narrative_top_k, user_id],
+                timeout=600,
+            )
+            return jsonify({"status": "queued", "job_id": task.id, "mode": "recruiter_rank"}), 202
+        except Exception as e:
+            logger.warning(f"Celery task queue failed: {e}, falling back to sync")
+            candidates = queued
+
+    result = None
+    for event in _iter_recruiter_ranking(job_desc_text, candidates, top_k, narrative_top_k, **ranking_options):
+        if event["stage"] == "complete":
+            result = event["result"]
+    write_audit(user_id, 'recruiter.rank', {'candidates': len(candidates), 'topK': top_k})
+    return jsonify(result)
+
+
 # Backward-compatible task aliases for jobs queued by older/local clients as __main__.*
 @celery.task(bind=True, name="__main__.estimate_salary_task")
 def estimate_salary_task_legacy(self, resume_text, job_description, user_id="anonymous"):
@@ -2772,6 +3892,72 @@ def tailor_resume_task_legacy(self, resume_text, job_description, user_id="anony
 def run_analysis_task_legacy(self, mode, resume_text, job_desc_text, recruiter_email, user_info):
     return run_analysis_task.run(mode, resume_text, job_desc_text, recruiter_email, user_info)
 
+def _resume_session_summary(session):
+    return {
+        "resumeId": session["resumeId"],
+        "createdAt": session.get("createdAt"),
+        "expiresInSeconds": response_cache.ttl_for(RESUME_SESSION_NAMESPACE),
+        "charCount": len(session.get("text", "")),
+        "sections": sorted(k for k in session.get("sections", {}) if k != "skills_list_raw"),
+        "skills": session.get("skills", []),
+        "bulletCount": len(session.get("bullets", [])),
+    }
+
+@app.route("/resumes", methods=["POST"])
+@cross_origin()
+@auth_required
+@rate_limit(20, 60)
+def upload_resume(user_info):
+    """Upload a resume once; follow-up endpoints accept the returned resumeId instead of a file."""
+    resume_file = request.files.get("resume")
+    if not resume_file:
+        return jsonify({"error": "Resume file is required"}), 400
+
+    resume_text = extract_text_from_pdf(resume_file)
+    if not resume_text:
+        return jsonify({"error": "Could not extract text from resume PDF"}), 400
+
+    user_id = user_info.get("uid", "anonymous")
+    resume_id = _file_sha256(resume_file)
+    session = get_resume_session(user_id, resume_id) or create_resume_session(user_id, resume_id, resume_text)
+    write_audit(user_id, 'resume.upload', {'resumeId': resume_id[:16]})
+    return jsonify(_resume_session_summary(session)), 201
+
+@app.route("/resumes/<resume_id>", methods=["GET"])
+@cross_origin()
+@auth_required
+def get_resume(user_info, resume_id):
+    session = get_resume_session(user_info.get("uid", "anonymous"), resume_id)
+    if session is None:
+        return jsonify({"error": "Unknown or expired resumeId"}), 404
+    return jsonify(_resume_session_summary(session))
+
+def _run_deferred_analysis(mode, resume_text, job_desc_text, recruiter_email, user_info):
+    """Full analysis (LLM narrative included) for a fast-path request; saved like the sync path."""
+    result = run_analysis_task.run(mode, resume_text, job_desc_text, recruiter_email, user_info)
+    if isinstance(result, dict) and not result.get("error"):
+        save_analysis(
+            user_id=user_info.get("uid", "anonymous"),
+            mode=mode,
+            result=result,
+            resume_excerpt=resume_text[:500],
+            job_desc_excerpt=job_desc_text[:500],
+        )
+    return result
+
+def _submit_analysis_narrative(mode, resume_text, job_desc_text, recruiter_email, user_info):
+    """Queue the LLM half of an analysis; returns a job ID served by /analyze/narrative/<job_id>."""
+    args = [mode, resume_text, job_desc_text, recruiter_email, user_info]
+    if ASYNC_TASKS_ENABLED:
+        try:
+            return run_analysis_task.apply_async(args=args, timeout=600).id
+        except Exception as e:
+            logger.warning(f"Async queue unavailable ({e}), deferring narrative in-process")
+    owner = user_info.get("uid", "anonymous")
+    return narrative_jobs.submit(
+        _with_llm_scope(_run_deferred_analysis, tenant=owner), *args, kind=f"analysis.{mode}", owner=owner
+    )
+
 @app.route("/analyze", methods=["POST"])
 @cross_origin()
 @rate_limit(40, 60)
@@ -2788,7 +3974,13 @@ def analyze(user_info):
         if mode not in ["jobSeeker", "recruiter"]:
             return jsonify({"error": "Invalid mode; must be 'jobSeeker' or 'recruiter'"}), 400
         
-        resume_text = data.get("resume", "")
+        resume_hash = None
+        if data.get("resumeId"):
+            resume_text, resume_hash, _, error = _resolve_resume_input(user_info)
+            if error:
+                return error
+        else:
+            resume_text = data.get("resume", "")
         if not resume_text or len(resume_text.strip()) < 40:
              return jsonify({"error": "Resume text is required and must be at least 40 characters"}), 400
         
@@ -2811,11 +4003,11 @@ def analyze(user_info):
         if mode not in ["jobSeeker", "recruiter"]:
             return jsonify({"error": "Invalid mode; must be 'jobSeeker' or 'recruiter'"}), 400
 
-        resume_file = request.files.get("resume")
-        if not resume_file:
-            return jsonify({"error": "Resume file is required"}), 400
-
-        resume_text = extract_text_from_pdf(resume_file)
+        resume_text, resume_hash, _, error = _resolve_resume_input(
+            user_info, missing_error="Resume file is required", char_budget=3000
+        )
+        if error:
+            return error
         if not resume_text:
             return jsonify({"error": "Could not extract text from resume PDF"}), 400
 
@@ -2830,11 +4022,31 @@ def analyze(user_info):
              job_desc_file = request.files.get("job_description")
              recruiter_email = request.form.get("recruiterEmail", "").strip()
              if job_desc_file:
-                 job_desc_text = extract_text_from_pdf(job_desc_file) or ""
+                 job_desc_text = extract_text_from_pdf(job_desc_file, char_budget=2000, fast=True) or ""
                  job_desc_text = job_desc_text[:2000]
              if not job_desc_text or not recruiter_email:
                  return jsonify({"error": "Job description file and recruiterEmail are required"}), 400
 
+    # Fast path: deterministic scores now, LLM narrative via a job ID
+    fast = _is_truthy((data.get("fast") if request.is_json else request.form.get("fast")) or request.args.get("fast"))
+    if fast:
+        cached = get_cached_analysis(resume_text, job_desc_text, mode)
+        if cached:
+            result = {**cached, "narrativeStatus": "ready"}
+        else:
+            result = build_fast_analysis(mode, resume_text, job_desc_text)
+            job_id = _submit_analysis_narrative(mode, resume_text, job_desc_text, recruiter_email, user_info)
+            result.update({
+                "narrativeStatus": "pending",
+                "narrativeJobId": job_id,
+                "narrativeUrl": url_for("analysis_narrative", job_id=job_id),
+            })
+        result.update({"mode": mode, "execution_mode": "fast"})
+        if resume_hash:
+            result["resumeHash"] = resume_hash
+        write_audit(user_info.get('uid'), 'analyze.fast', {'mode': mode, 'ms': round((time.time() - start) * 1000)})
+        return jsonify(result)
+
     # Optional async mode for higher-capacity deployments.
     if ASYNC_TASKS_ENABLED:
         try:
@@ -2846,7 +4058,8 @@ def analyze(user_info):
             return jsonify({
                 "status": "queued",
                 "job_id": task.id,
-                "mode": mode
+                "mode": mode,
+                "resumeHash": resume_hash,
             }), 202
 
         except Exception as e:
@@ -2879,8 +4092,59 @@ def analyze(user_info):
 
     if isinstance(result, dict):
         result.setdefault("execution_mode", "sync")
+        if resume_hash:
+            result["resumeHash"] = resume_hash
     return jsonify(result)
 
+def _narrative_status(user_info, job_id):
+    """Job record for a deferred narrative (in-process jobs first, then Celery), or None."""
+    record = narrative_jobs.status(job_id)
+    if record is not None:
+        if record.get("owner") not in (None, user_info.get("uid", "anonymous")):
+            return None
+        return {key: record[key] for key in ("state", "result", "error", "elapsedMs") if key in record}
+    if ASYNC_TASKS_ENABLED:
+        task = celery.AsyncResult(job_id)
+        state = (task.state or "PENDING").upper()
+        if state == "SUCCESS":
+            return {"state": state, "result": task.result}
+        if state == "FAILURE":
+            return {"state": state, "error": str(task.info)}
+        return {"state": state}
+    return None
+
+@app.route("/analyze/narrative/<job_id>", methods=["GET"])
+@cross_origin()
+@auth_required
+def analysis_narrative(user_info, job_id):
+    """
+    Poll (or stream with ?stream=true) the LLM narrative of a fast-path analysis.
+    Streaming emits "status" events on state changes and ends with "result" or "error".
+    """
+    record = _narrative_status(user_info, job_id)
+    if record is None:
+        return jsonify({"error": "Unknown or expired narrative job"}), 404
+    if not _is_truthy(request.args.get("stream")):
+        return jsonify(record)
+
+    deadline = time.time() + LLM_TIMEOUT_SECONDS + LLM_RETRY_TIMEOUT_SECONDS + 30
+    def generate():
+        current, last_state = record, None
+        while True:
+            state = current.get("state") if current else "FAILURE"
+            if state == "SUCCESS":
+                yield _sse_event("result", current.get("result"))
+                return
+            if state == "FAILURE" or time.time() > deadline:
+                yield _sse_event("error", {"error": (current or {}).get("error") or "Narrative job did not finish"})
+                return
+            if state != last_state:
+                yield _sse_event("status", {"state": state})
+                last_state = state
+            time.sleep(0.25)
+            current = _narrative_status(user_info, job_id)
+    return _sse_response(generate())
+
 @app.route("/status/<job_id>", methods=["GET"])
 def job_status(job_id):
     # 1) Try RQ jobs first (used by /analyze)
@@ -3065,7 +4329,7 @@ def coaching_save_version(user_info):
     resume_file = request.files.get("resume")
     if not resume_file:
         return jsonify({"error": "Resume file is required"}), 400
-    resume_text = extract_text_from_pdf(resume_file) or ""
+    resume_text = extract_text_from_pdf(resume_file, char_budget=6000) or ""
     resume_text = resume_text[:6000]
 
     # Optional job description (text field or file)
@@ -3073,7 +4337,7 @@ def coaching_save_version(user_info):
     if "jobDescription" in request.form:
         job_desc_text = request.form.get("jobDescription", "")[:4000]
     elif request.files.get("job_description"):
-        job_desc_text = extract_text_from_pdf(request.files["job_description"]) or ""
+        job_desc_text = extract_text_from_pdf(request.files["job_description"], char_budget=4000, fast=True) or ""
         job_desc_text = job_desc_text[:4000]
 
     bullets = extract_bullets(resume_text)
@@ -3095,7 +4359,7 @@ def coaching_save_version(user_info):
     saved = add_version(user_id, record)
     write_audit(user_id, 'coaching.save_version', {'version': saved['version']})
     dispatch_event('version.saved', {'userId': user_id, 'version': saved['version']})
-    return jsonify({"saved": saved})
+    return jsonify({"saved": saved, "resumeHash": _file_sha256(resume_file)})
 
 @app.route("/coaching/progress", methods=["GET"])
 @auth_required
@@ -3473,15 +4737,23 @@ def generate_cover_letter(user_info):
     resume_file = request.files['resume']
     job_description = request.form.get('jobDescription', '')
     
-    resume_text = extract_text_from_pdf(resume_file)
+    resume_text = extract_text_from_pdf(resume_file, char_budget=3000)
     if not resume_text:
         return jsonify({'error': 'Could not extract text from PDF'}), 400
 
+    if _is_truthy(request.form.get('stream') or request.args.get('stream')):
+        resume_hash = _file_sha256(resume_file)
+        return _sse_response(_stream_llm_events(
+            _cover_letter_prompt(resume_text, job_description),
+            0.7,
+            lambda text: {'coverLetter': text or "Failed to generate cover letter.", 'resumeHash': resume_hash},
+        ))
+
     cover_letter = _generate_cover_letter_text(resume_text, job_description)
     if not cover_letter:
         return jsonify({'error': 'Failed to generate cover letter'}), 500
         
-    return jsonify({'coverLetter': cover_letter})
+    return jsonify({'coverLetter': cover_letter, 'resumeHash': _file_sha256(resume_file)})
 
 @app.route('/generate-interview-questions', methods=['POST'])
 @cross_origin()
@@ -3494,7 +4766,7 @@ def generate_interview_questions(user_info):
     resume_file = request.files['resume']
     job_description = request.form.get('jobDescription', '')
     
-    resume_text = extract_text_from_pdf(resume_file)
+    resume_text = extract_text_from_pdf(resume_file, char_budget=3000)
     
     prompt = f"""
     Generate 5-7 tailored interview questions for a candidate with the following resume applying for the described job.
@@ -3529,7 +4801,7 @@ def analyze_skills(user_info):
     resume_file = request.files['resume']
     job_description = request.form.get('jobDescription', '')
     
-    resume_text = extract_text_from_pdf(resume_file)
+    resume_text = extract_text_from_pdf(resume_file, char_budget=3000)
     
     prompt = f"""
     Analyze the skill gap between the candidate's resume and the job description.
@@ -3613,6 +4885,9 @@ def mock_interview(user_info):
     messages.append("Interviewer:")
     
     prompt = "\\n".join(messages)
+
+    if _is_truthy(data.get('stream') or request.args.get('stream')):
+        return _sse_response(_stream_llm_events(prompt, 0.7, lambda text: {'response': text}))
     
     response = call_llm(prompt, temperature=0.7)
     return jsonify({'response': response})
@@ -3623,12 +4898,10 @@ def mock_interview(user_info):
 @auth_required
 @rate_limit(max_requests=10, per_seconds=60)
 def generate_linkedin_profile(user_info):
-    if 'resume' not in request.files:
-        return jsonify({'error': 'No resume file provided'}), 400
-    
     try:
-        resume_file = request.files['resume']
-        resume_text = extract_text_from_pdf(resume_file)
+        resume_text, resume_hash, _, error = _resolve_resume_input(user_info, char_budget=3000)
+        if error:
+            return error
         
         if not resume_text:
              return jsonify({'error': 'Could not extract text from resume'}), 400
@@ -3662,6 +4935,7 @@ def generate_linkedin_profile(user_info):
                 parsed = {}
 
         result = normalize_linkedin_profile(parsed, fallback_text=response)
+        result["resumeHash"] = resume_hash
             
         return jsonify(result)
     except Exception as e:
@@ -3722,23 +4996,23 @@ def analyze_mock_interview(user_info):
 @rate_limit(max_requests=10, per_seconds=60)
 def estimate_salary(user_info):
     """Queue salary estimation as an async task to avoid Gunicorn timeouts."""
-    if 'resume' not in request.files:
-        return jsonify({'error': 'No resume file provided'}), 400
-    
-    resume_file = request.files['resume']
+    resume_text, resume_hash, session, error = _resolve_resume_input(user_info)
+    if error:
+        return error
+    trimmed_resume = _session_prompt_excerpt(session)
     job_description = request.form.get('jobDescription', '')
-    resume_text = extract_text_from_pdf(resume_file)
     
     if ASYNC_TASKS_ENABLED:
         try:
             task = estimate_salary_task.apply_async(
-                args=[resume_text, job_description, user_info.get("uid", "anonymous")],
+                args=[resume_text, job_description, user_info.get("uid", "anonymous"), trimmed_resume],
                 timeout=300  # 5 minutes - extended for Cohere API calls
             )
             return jsonify({
                 "status": "queued",
                 "job_id": task.id,
-                "mode": "salary_estimation"
+                "mode": "salary_estimation",
+                "resumeHash": resume_hash,
             }), 202
         except Exception as e:
             logger.warning(f"Celery task queue failed: {e}, falling back to sync")
@@ -3746,8 +5020,11 @@ def estimate_salary(user_info):
     result = estimate_salary_task.run(
         resume_text,
         job_description,
-        user_info.get("uid", "anonymous")
+        user_info.get("uid", "anonymous"),
+        trimmed_resume=trimmed_resume,
     )
+    if isinstance(result, dict):
+        result["resumeHash"] = resume_hash
     return jsonify(result)
 
 @app.route('/tailor-resume', methods=['POST'])
@@ -3756,26 +5033,37 @@ def estimate_salary(user_info):
 @rate_limit(max_requests=10, per_seconds=60)
 def tailor_resume(user_info):
     """Queue resume tailoring as async task to avoid Gunicorn timeouts."""
-    if 'resume' not in request.files:
-        return jsonify({'error': 'No resume file provided'}), 400
-    
-    resume_file = request.files['resume']
+    resume_text, resume_hash, session, error = _resolve_resume_input(user_info)
+    if error:
+        return error
+    trimmed_resume = _session_prompt_excerpt(session)
     job_description = request.form.get('jobDescription', '')
-    resume_text = extract_text_from_pdf(resume_file)
     
     if not resume_text:
         return jsonify({'error': 'Failed to extract resume text'}), 400
+
+    if _is_truthy(request.form.get('stream') or request.args.get('stream')):
+        user_id = user_info.get("uid", "anonymous")
+        prompt = _tailor_resume_prompt(trimmed_resume or trim_resume_for_prompt(resume_text, max_length=800), job_description)
+        def finalize(text):
+            if not text:
+                return {"error": "Failed to tailor resume"}
+            result = _finish_tailored_resume(text, resume_text, job_description, user_id)
+            result["resumeHash"] = resume_hash
+            return result
+        return _sse_response(_stream_llm_events(prompt, 0.7, finalize))
     
     if ASYNC_TASKS_ENABLED:
         try:
             task = tailor_resume_task.apply_async(
-                args=[resume_text, job_description, user_info.get("uid", "anonymous")],
+                args=[resume_text, job_description, user_info.get("uid", "anonymous"), trimmed_resume],
                 timeout=300  # 5 minutes - extended for Cohere API calls
             )
             return jsonify({
                 "status": "queued",
                 "job_id": task.id,
-                "mode": "tailor_resume"
+                "mode": "tailor_resume",
+                "resumeHash": resume_hash,
             }), 202
         except Exception as e:
             logger.warning(f"Celery task queue failed: {e}, falling back to sync")
@@ -3783,8 +5071,11 @@ def tailor_resume(user_info):
     result = tailor_resume_task.run(
         resume_text,
         job_description,
-        user_info.get("uid", "anonymous")
+        user_info.get("uid", "anonymous"),
+        trimmed_resume=trimmed_resume,
     )
+    if isinstance(result, dict):
+        result["resumeHash"] = resume_hash
     return jsonify(result)
 
 @app.route('/generate-career-path', methods=['POST'])
@@ -3793,11 +5084,10 @@ def tailor_resume(user_info):
 @rate_limit(max_requests=10, per_seconds=60)
 def generate_career_path(user_info):
     """Queue career path generation as async task to avoid Gunicorn timeouts."""
-    if 'resume' not in request.files:
-        return jsonify({'error': 'No resume file provided'}), 400
-    
-    resume_file = request.files['resume']
-    resume_text = extract_text_from_pdf(resume_file)
+    resume_text, resume_hash, session, error = _resolve_resume_input(user_info)
+    if error:
+        return error
+    trimmed_resume = _session_prompt_excerpt(session)
     
     if not resume_text:
         return jsonify({'error': 'Failed to extract resume text'}), 400
@@ -3805,21 +5095,25 @@ def generate_career_path(user_info):
     if ASYNC_TASKS_ENABLED:
         try:
             task = generate_career_path_task.apply_async(
-                args=[resume_text, user_info.get("uid", "anonymous")],
+                args=[resume_text, user_info.get("uid", "anonymous"), trimmed_resume],
                 timeout=300  # 5 minutes - extended for Cohere API calls
             )
             return jsonify({
                 "status": "queued",
                 "job_id": task.id,
-                "mode": "career_path"
+                "mode": "career_path",
+                "resumeHash": resume_hash,
             }), 202
         except Exception as e:
             logger.warning(f"Celery task queue failed: {e}, falling back to sync")
 
     result = generate_career_path_task.run(
         resume_text,
-        user_info.get("uid", "anonymous")
+        user_info.get("uid", "anonymous"),
+        trimmed_resume=trimmed_resume,
     )
+    if isinstance(result, dict):
+        result["resumeHash"] = resume_hash
     return jsonify(result)
 
 @app.route('/generate-job-description', methods=['POST'])
@@ -3950,15 +5244,8 @@ def resume_health_check(user_info):
     if file.filename == '':
         return jsonify({'error': 'No selected file'}), 400
         
-    try:
-        with pdfplumber.open(file) as pdf:
-            text = ""
-            for page in pdf.pages:
-                extracted = page.extract_text()
-                if extracted:
-                    text += extracted + "\n"
-    except Exception as e:
-        logger.error(f"pdf.extract_error error={e}")
+    text = extract_text_from_pdf(file)
+    if text is None:
         return jsonify({'error': 'Failed to extract text from PDF'}), 500
 
     prompt = f'''
@@ -4000,6 +5287,8 @@ def resume_health_check(user_info):
         result = json.loads(response)
     except:
         result = {"raw_response": response}
+    if isinstance(result, dict):
+        result["resumeHash"] = _file_sha256(file)
         
     return jsonify(result)
 
@@ -4096,31 +5385,115 @@ def generate_networking_message(user_info):
 
 # ─── RAG (LangChain + FAISS + HuggingFace) Endpoints ────────────────────────
 
+# Chunk embeddings by (model, text hash): re-uploaded resumes skip the embeddings model
+embedding_cache = get_embedding_cache(
+    cache_dir=os.path.join(config.DATA_DIR, "embedding_cache") if config.RAG_PERSIST_ENABLED else None,
+    max_bytes=config.RAG_EMBEDDING_CACHE_MB * 1024 * 1024,
+)
+# One index per user (or per anonymous session), LRU-evicted to stay within RAG_MEMORY_BUDGET_MB;
+# with RAG_PERSIST_ENABLED indexes live in DATA_DIR/rag and are memory-mapped back in
+rag_registry = get_rag_registry(
+    memory_budget_bytes=config.RAG_MEMORY_BUDGET_MB * 1024 * 1024,
+    persist_dir=os.path.join(config.DATA_DIR, "rag") if config.RAG_PERSIST_ENABLED else None,
+)
+
+
+def _load_rag_session_secret():
+    """RAG_SESSION_SECRET, else a random secret kept in DATA_DIR so every worker signs alike."""
+    if config.RAG_SESSION_SECRET:
+        return config.RAG_SESSION_SECRET
+    path = os.path.join(config.DATA_DIR, "rag_session_secret")
+    try:
+        os.makedirs(config.DATA_DIR, exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(uuid.uuid4().hex + uuid.uuid4().hex)
+        try:
+            os.link(tmp_path, path)  # first worker wins; the rest read its secret
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(tmp_path)
+        with open(path) as f:
+            return f.read().strip()
+    except OSError as e:
+        logger.warning(f"rag.session_secret_unavailable error={e} falling_back=process_secret")
+        return uuid.uuid4().hex + uuid.uuid4().hex
+
+
+_rag_session_secret = None
+_rag_session_lock = threading.Lock()
+
+
+def _rag_session_signing_key():
+    global _rag_session_secret
+    if _rag_session_secret is None:
+        with _rag_session_lock:
+            if _rag_session_secret is None:
+                _rag_session_secret = _load_rag_session_secret().encode("utf-8")
+    return _rag_session_secret
+
+
+def _sign_rag_session(session_id):
+    signature = hmac.new(_rag_session_signing_key(), session_id.encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+    return f"{session_id}.{signature}"
+
+
+def _verified_rag_session(token):
+    """The session id inside a token this server issued, or None for a missing or forged token."""
+    session_id, _, _ = (token or "").partition(".")
+    if session_id and hmac.compare_digest(_sign_rag_session(session_id), token):
+        return session_id
+    return None
+
+
+def _rag_index_key():
+    """
+    Registry key for this request's index: the verified uid, else the anonymous session from the
+    X-Session-ID token this server issued. Callers without a valid token get a new session; its
+    token goes back in the X-Session-ID response header for the client to send from then on.
+    """
+    auth_header = request.headers.get('Authorization', '')
+    if auth_header.startswith('Bearer '):
+        try:
+            decoded = verify_firebase_token(auth_header[7:])
+            uid = (decoded or {}).get('uid') or ''
+            # verify_firebase_token fails open to shared guest/dev uids; those are not a user's own index
+            if uid and not uid.startswith('guest-user') and not decoded.get('devBypass'):
+                return f"user:{uid}"
+        except Exception:
+            pass
+    session_id = _verified_rag_session(request.headers.get('X-Session-ID'))
+    if session_id is None:
+        session_id = uuid.uuid4().hex
+        g.rag_session_token = _sign_rag_session(session_id)
+    return f"session:{session_id}"
+
+
+@app.after_request
+def _attach_rag_session(response):
+    token = g.get('rag_session_token')
+    if token:
+        response.headers['X-Session-ID'] = token
+    return response
+
+
 @app.route('/api/rag/ingest', methods=['POST'])
 def rag_ingest():
     """Index resume text into FAISS vector store for RAG Q&A."""
     try:
-        uid = None
-        auth_header = request.headers.get('Authorization', '')
-        if auth_header.startswith('Bearer '):
-            try:
-                decoded = verify_firebase_token(auth_header[7:])
-                uid = decoded.get('uid')
-            except Exception:
-                pass
-
         data = request.get_json(force=True)
         if not data:
             return jsonify({'success': False, 'error': 'No JSON body provided.'}), 400
 
         text = data.get('text', '').strip()
         source_label = data.get('source_label', 'resume')
+        document_id = data.get('document_id') or None
 
         if not text:
             return jsonify({'success': False, 'error': 'Text field is required and cannot be empty.'}), 400
 
-        rag = get_rag_engine()
-        result = rag.ingest_text(text, source_label=source_label)
+        result = rag_registry.ingest(_rag_index_key(), text, source_label=source_label, document_id=document_id)
         return jsonify(result), 200 if result.get('success') else 500
 
     except Exception as e:
@@ -4142,7 +5515,7 @@ def rag_query():
         if not question:
             return jsonify({'success': False, 'error': 'Question field is required.'}), 400
 
-        rag = get_rag_engine()
+        rag = rag_registry.get(_rag_index_key())
         result = rag.query(question, top_k=top_k)
         return jsonify(result), 200 if result.get('success') else 400
 
@@ -4151,6 +5524,34 @@ def rag_query():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/rag/query-batch', methods=['POST'])
+def rag_query_batch():
+    """Many questions against the caller's index in one request (one similarity matrix product)."""
+    try:
+        data = request.get_json(force=True)
+        if not data:
+            return jsonify({'success': False, 'error': 'No JSON body provided.'}), 400
+
+        questions = data.get('questions')
+        top_k = int(data.get('top_k', 3))
+
+        if not isinstance(questions, list) or not questions:
+            return jsonify({'success': False, 'error': 'questions must be a non-empty list.'}), 400
+        if len(questions) > config.RAG_QUERY_BATCH_MAX:
+            return jsonify({'success': False, 'error': f'At most {config.RAG_QUERY_BATCH_MAX} questions per request.'}), 400
+        questions = [str(q).strip() for q in questions]
+        if not all(questions):
+            return jsonify({'success': False, 'error': 'Questions cannot be empty.'}), 400
+
+        rag = rag_registry.get(_rag_index_key())
+        result = rag.query_many(questions, top_k=top_k)
+        return jsonify(result), 200 if result.get('success') else 400
+
+    except Exception as e:
+        logger.error(f'RAG batch query error: {e}')
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @app.route('/api/rag/analyze', methods=['POST'])
 def rag_analyze():
     """
@@ -4170,7 +5571,7 @@ def rag_analyze():
         if not question:
             return jsonify({'success': False, 'error': 'Question field is required.'}), 400
 
-        rag = get_rag_engine()
+        rag = rag_registry.get(_rag_index_key())
         prompt_result = rag.build_grounded_prompt(question, job_description=job_description)
 
         if not prompt_result.get('success'):
@@ -4218,9 +5619,20 @@ def rag_analyze():
 def rag_status():
     """Return current RAG engine status — ready, indexed, chunk count."""
     try:
-        rag = get_rag_engine()
-        return jsonify(rag.status()), 200
+        rag = rag_registry.get(_rag_index_key())
+        return jsonify({**rag.status(), 'registry': rag_registry.stats(), 'embeddingCache': embedding_cache.stats()}), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/rag/documents/<document_id>', methods=['DELETE'])
+def rag_delete_document(document_id):
+    """Remove one ingested document from the caller's index (IDs come from /api/rag/ingest)."""
+    try:
+        result = rag_registry.delete_document(_rag_index_key(), document_id)
+        return jsonify(result), 200 if result.get('success') else 404
     except Exception as e:
+        logger.error(f'RAG delete error: {e}')
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
@@ -4228,8 +5640,7 @@ def rag_status():
 def rag_clear():
     """Clear the FAISS vector store — start fresh for new document session."""
     try:
-        rag = get_rag_engine()
-        result = rag.clear()
+        result = rag_registry.clear(_rag_index_key())
         return jsonify(result), 200
     except Exception as e:
         logger.error(f'RAG clear error: {e}')
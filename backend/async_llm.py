@@ -0,0 +1,249 @@
+# ASYNC LLM CLIENT: Native asyncio Cohere/OpenAI calls multiplexed on one event-loop thread
+# Dozens of provider calls can be in flight from a single request thread while they wait on the network;
+# a semaphore is the concurrency budget. Sync code uses run()/submit(), which hand coroutines to the loop.
+import asyncio
+import concurrent.futures
+import contextlib
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+try:
+    from backend.llm_executor import LLMDeadlineExceeded, LLMRejectedError
+except ImportError:
+    from llm_executor import LLMDeadlineExceeded, LLMRejectedError
+
+logger = logging.getLogger("resume_analyzer")
+
+# provider -> async fn(model, prompt, temperature, timeout) -> text
+AsyncChatFn = Callable[[str, str, float, float], Awaitable[str]]
+
+
+def _cohere_chat_fn(api_key: str, timeout: float) -> AsyncChatFn:
+    import cohere
+
+    client = None
+
+    async def chat(model, prompt, temperature, call_timeout):
+        nonlocal client
+        if client is None:  # created on the loop thread, where its httpx pool lives
+            client = cohere.AsyncClient(api_key, timeout=timeout)
+        resp = await client.chat(
+            model=model,
+            message=prompt,
+            temperature=temperature,
+            request_options={"timeout_in_seconds": call_timeout},
+        )
+        return resp.text.strip()
+
+    return chat
+
+
+def _openai_chat_fn(api_key: str, timeout: float) -> AsyncChatFn:
+    from openai import AsyncOpenAI
+
+    client = None
+
+    async def chat(model, prompt, temperature, call_timeout):
+        nonlocal client
+        if client is None:
+            client = AsyncOpenAI(api_key=api_key, timeout=timeout)
+        resp = await client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            timeout=call_timeout,
+        )
+        return resp.choices[0].message.content.strip()
+
+    return chat
+
+
+class AsyncLLMClient:
+    """
+    Provider calls as coroutines on a private event loop.
+
+    Features:
+      - One loop thread per process, started on first use; provider SDK async clients live on it
+      - ``max_concurrency`` calls talk to providers at once, up to ``max_pending`` more wait for a slot;
+        beyond that submissions are rejected (LLMRejectedError), as with LLMExecutor
+      - Per-provider slots: with ``provider_concurrency`` set, at most that many calls per provider
+        are in flight, the same cap LLMExecutor applies to its threads
+      - Per-call deadline covering the wait for a slot and the provider call (LLMDeadlineExceeded)
+    """
+
+    def __init__(
+        self,
+        providers: Optional[Dict[str, AsyncChatFn]] = None,
+        cohere_api_key: Optional[str] = None,
+        openai_api_key: Optional[str] = None,
+        max_concurrency: int = 32,
+        max_pending: int = 256,
+        provider_concurrency: Optional[int] = None,
+        sdk_timeout: float = 12.0,
+    ):
+        self.providers: Dict[str, AsyncChatFn] = dict(providers or {})
+        if providers is None:
+            if cohere_api_key:
+                self.providers["cohere"] = _cohere_chat_fn(cohere_api_key, sdk_timeout)
+            if openai_api_key:
+                try:
+                    self.providers["openai"] = _openai_chat_fn(openai_api_key, sdk_timeout)
+                except ImportError:
+                    logger.warning("llm.async_openai_unavailable")
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.max_pending = max(0, int(max_pending))
+        self.provider_concurrency = max(1, int(provider_concurrency)) if provider_concurrency else None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._provider_slots: Dict[str, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._in_flight = 0
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "timeouts": 0, "rejected": 0, "peakInFlight": 0}
+
+    def available(self, provider: str) -> bool:
+        return (provider or "").lower() in self.providers
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                if self.provider_concurrency:
+                    self._provider_slots = {name: asyncio.Semaphore(self.provider_concurrency) for name in self.providers}
+                self._thread = threading.Thread(target=loop.run_forever, name="llm-async-loop", daemon=True)
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    async def _call(self, provider: str, model: str, prompt: str, temperature: float, timeout: float) -> str:
+        chat = self.providers[provider]
+        provider_slot = self._provider_slots.get(provider) or contextlib.nullcontext()
+
+        async def _guarded():
+            # Provider slot first, so a call queued behind a saturated provider leaves the shared budget to others
+            async with provider_slot, self._semaphore:
+                with self._lock:
+                    self._in_flight += 1
+                    self._stats["peakInFlight"] = max(self._stats["peakInFlight"], self._in_flight)
+                try:
+                    return await chat(model, prompt, temperature, timeout)
+                finally:
+                    with self._lock:
+                        self._in_flight -= 1
+
+        try:
+            return await asyncio.wait_for(_guarded(), timeout=timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise LLMDeadlineExceeded(f"async call exceeded {timeout}s deadline")
+
+    def submit(self, provider: str, model: str, prompt: str, temperature: float = 0.6, timeout: float = 12.0) -> concurrent.futures.Future:
+        """Schedule one call on the loop; the returned future resolves to the response text."""
+        provider = (provider or "").lower()
+        if provider not in self.providers:
+            raise ValueError(f"No async client for provider {provider}")
+        with self._lock:
+            if self._pending >= self.max_concurrency + self.max_pending:
+                self._stats["rejected"] += 1
+                logger.warning(f"llm.async_rejected provider={provider} pending={self._pending}")
+                raise LLMRejectedError(f"LLM call rejected: {self._pending} async calls pending")
+            self._pending += 1
+            self._stats["submitted"] += 1
+
+        future = asyncio.run_coroutine_threadsafe(
+            self._call(provider, model, prompt, temperature, timeout), self._ensure_loop()
+        )
+
+        def _done(fut: concurrent.futures.Future):
+            with self._lock:
+                self._pending -= 1
+                if fut.cancelled() or fut.exception() is not None:
+                    self._stats["failed"] += 1
+                else:
+                    self._stats["completed"] += 1
+
+        future.add_done_callback(_done)
+        return future
+
+    def run(self, provider: str, model: str, prompt: str, temperature: float = 0.6, timeout: float = 12.0) -> str:
+        """Synchronous facade: block the calling thread until the call finishes or times out."""
+        future = self.submit(provider, model, prompt, temperature, timeout)
+        try:
+            # The coroutine enforces the deadline; the margin only covers loop scheduling
+            return future.result(timeout=timeout + 1)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise LLMDeadlineExceeded(f"{provider} call exceeded {timeout}s deadline")
+
+    def map_unordered(self, calls: Sequence[Tuple[str, str, str, float, float]]) -> Iterator[Tuple[int, Any]]:
+        """
+        Fan out (provider, model, prompt, temperature, timeout) calls from the calling thread and
+        yield (index, text or exception) as each finishes.
+        """
+        futures = {}
+        for i, call in enumerate(calls):
+            try:
+                futures[self.submit(*call)] = i
+            except Exception as e:
+                yield i, e
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], e
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "providers": sorted(self.providers),
+                "maxConcurrency": self.max_concurrency,
+                "maxPending": self.max_pending,
+                "providerConcurrency": self.provider_concurrency,
+                "pending": self._pending,
+                "inFlight": self._in_flight,
+                **self._stats,
+                "snapshotAt": time.time(),
+            }
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Cancel calls still on the loop, then stop and close it; a later submit starts a new one."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+            thread, self._thread = self._thread, None
+        if loop is None:
+            return
+
+        async def _cancel_outstanding():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(_cancel_outstanding(), loop).result(timeout=timeout)
+        except Exception as e:
+            logger.warning(f"llm.async_close_error error={e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=timeout)
+        if not thread.is_alive():
+            loop.close()
+
+
+# Singleton instance
+_client_instance: Optional[AsyncLLMClient] = None
+_client_lock = threading.Lock()
+
+
+def get_async_llm_client(**kwargs) -> AsyncLLMClient:
+    """Process-wide client; kwargs only apply on first call (same pattern as get_llm_executor)."""
+    global _client_instance
+    if _client_instance is None:
+        with _client_lock:
+            if _client_instance is None:
+                _client_instance = AsyncLLMClient(**kwargs)
+    return _client_instance
@@ -0,0 +1,69 @@
+# BACKGROUND JOBS: In-process deferred work with status kept in the shared response cache
+# Used when Celery is disabled (ASYNC_TASKS_ENABLED=False): the request returns a job ID at once and
+# the slow LLM part runs on a small thread pool; any gunicorn worker can answer the status poll via Redis.
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger("resume_analyzer")
+
+
+class BackgroundJobs:
+    """
+    Minimal job runner: ``submit`` schedules ``fn`` and returns a job ID; ``status`` reports
+    {"state": PENDING|STARTED|SUCCESS|FAILURE, "result"?, "error"?} using the same state names as
+    Celery so clients can share one polling loop.
+    """
+
+    def __init__(self, cache, namespace: str = "background_job", max_workers: int = 2):
+        self.cache = cache
+        self.namespace = namespace
+        self.max_workers = max(1, int(max_workers))
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=namespace)
+        self._stats_lock = threading.Lock()
+        self._stats = {"submitted": 0, "succeeded": 0, "failed": 0}
+
+    def _save(self, job_id: str, record: Dict[str, Any]) -> None:
+        self.cache.set_json(self.namespace, job_id, record)
+
+    def submit(self, fn: Callable[..., Any], *args, kind: str = "job", owner: Optional[str] = None, **kwargs) -> str:
+        """Schedule ``fn(*args, **kwargs)``; ``owner`` is stored so routes can scope status reads per user."""
+        job_id = uuid.uuid4().hex
+        base = {"kind": kind, "owner": owner}
+        self._save(job_id, {**base, "state": "PENDING", "submittedAt": time.time()})
+        self._bump("submitted")
+        self._pool.submit(self._run, job_id, base, fn, args, kwargs)
+        return job_id
+
+    def _run(self, job_id: str, base: Dict[str, Any], fn, args, kwargs) -> None:
+        started = time.time()
+        self._save(job_id, {**base, "state": "STARTED", "startedAt": started})
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"jobs.failed kind={base['kind']} job_id={job_id} error={e}")
+            self._save(job_id, {**base, "state": "FAILURE", "error": str(e)})
+            self._bump("failed")
+            return
+        elapsed_ms = round((time.time() - started) * 1000)
+        self._save(job_id, {**base, "state": "SUCCESS", "result": result, "elapsedMs": elapsed_ms})
+        self._bump("succeeded")
+        logger.info(f"jobs.completed kind={base['kind']} job_id={job_id} ms={elapsed_ms}")
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job record, or None if the ID is unknown or expired."""
+        return self.cache.get_json(self.namespace, job_id)
+
+    def _bump(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {**self._stats, "maxWorkers": self.max_workers}
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
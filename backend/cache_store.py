@@ -0,0 +1,217 @@
+# CACHE STORE: Two-tier response cache shared by the LLM and analysis layers
+# Tier 1: memory-bounded in-process LRU with TTL (works without Redis)
+# Tier 2: Redis with zlib/zstd-compressed values, per-namespace TTLs and hit/miss/eviction counters
+import json
+import logging
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("resume_analyzer")
+
+try:
+    import zstandard as _zstd
+    _zstd_available = True
+except ImportError:
+    _zstd = None
+    _zstd_available = False
+
+# Values written by this module start with MAGIC + a one-byte codec id.
+# Anything without the header is a legacy raw UTF-8 value and is returned as-is.
+_MAGIC = b"\x00tc1"
+_CODEC_RAW = b"r"
+_CODEC_ZLIB = b"z"
+_CODEC_ZSTD = b"s"
+
+
+class TwoTierCache:
+    """
+    String cache with an in-process LRU+TTL tier in front of Redis.
+
+    Keys are addressed as (namespace, key) and stored under ``{namespace}:{key}`` in both
+    tiers, so existing Redis key layouts (``llm_cache:<sha>``, ``analysis_v2:<hash>``) are kept.
+    """
+
+    def __init__(
+        self,
+        redis_client=None,
+        max_memory_bytes: int = 16 * 1024 * 1024,
+        namespace_ttls: Optional[Dict[str, int]] = None,
+        default_ttl: int = 3600,
+        compression: str = "zlib",
+        compress_min_bytes: int = 256,
+    ):
+        self.redis = redis_client
+        self.max_memory_bytes = max(0, int(max_memory_bytes))
+        self.namespace_ttls = dict(namespace_ttls or {})
+        self.default_ttl = int(default_ttl)
+        if compression == "zstd" and not _zstd_available:
+            logger.warning("cache.zstd_unavailable falling_back_to=zlib")
+            compression = "zlib"
+        self.compression = compression if compression in ("zlib", "zstd", "none") else "zlib"
+        self.compress_min_bytes = max(0, int(compress_min_bytes))
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()  # full_key -> (expires_at, value, size)
+        self._memory_bytes = 0
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._compression_stats = {"rawBytes": 0, "storedBytes": 0}
+
+    # ---------- helpers ----------
+    def ttl_for(self, namespace: str) -> int:
+        return int(self.namespace_ttls.get(namespace, self.default_ttl))
+
+    def _ns_stats(self, namespace: str) -> Dict[str, int]:
+        return self._stats.setdefault(namespace, {
+            "memoryHits": 0,
+            "redisHits": 0,
+            "misses": 0,
+            "sets": 0,
+            "evictions": 0,
+            "expirations": 0,
+        })
+
+    def _bump(self, namespace: str, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._ns_stats(namespace)[name] += amount
+
+    def _encode(self, value: str) -> bytes:
+        raw = value.encode("utf-8")
+        if self.compression == "none" or len(raw) < self.compress_min_bytes:
+            blob = _MAGIC + _CODEC_RAW + raw
+        elif self.compression == "zstd":
+            blob = _MAGIC + _CODEC_ZSTD + _zstd.ZstdCompressor(level=3).compress(raw)
+        else:
+            blob = _MAGIC + _CODEC_ZLIB + zlib.compress(raw, 6)
+        with self._lock:
+            self._compression_stats["rawBytes"] += len(raw)
+            self._compression_stats["storedBytes"] += len(blob)
+        return blob
+
+    @staticmethod
+    def _decode(blob: bytes) -> str:
+        if not blob.startswith(_MAGIC):
+            return blob.decode("utf-8")
+        codec = blob[len(_MAGIC):len(_MAGIC) + 1]
+        payload = blob[len(_MAGIC) + 1:]
+        if codec == _CODEC_ZLIB:
+            payload = zlib.decompress(payload)
+        elif codec == _CODEC_ZSTD:
+            if not _zstd_available:
+                raise ValueError("zstd-compressed cache entry but zstandard is not installed")
+            payload = _zstd.ZstdDecompressor().decompress(payload)
+        return payload.decode("utf-8")
+
+    # ---------- memory tier ----------
+    def _memory_get(self, namespace: str, full_key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(full_key)
+            if entry is None:
+                return None
+            expires_at, value, size = entry
+            if expires_at <= time.time():
+                del self._memory[full_key]
+                self._memory_bytes -= size
+                self._ns_stats(namespace)["expirations"] += 1
+                return None
+            self._memory.move_to_end(full_key)
+            self._ns_stats(namespace)["memoryHits"] += 1
+            return value
+
+    def _memory_set(self, namespace: str, full_key: str, value: str, ttl: float) -> None:
+        # Approximate footprint: UTF-8 payload plus key; good enough for an LRU budget
+        size = len(value.encode("utf-8")) + len(full_key)
+        if ttl <= 0 or size > self.max_memory_bytes:
+            return
+        with self._lock:
+            old = self._memory.pop(full_key, None)
+            if old is not None:
+                self._memory_bytes -= old[2]
+            self._memory[full_key] = (time.time() + ttl, value, size)
+            self._memory_bytes += size
+            while self._memory_bytes > self.max_memory_bytes and self._memory:
+                evicted_key, (_, _, evicted_size) = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted_size
+                self._ns_stats(evicted_key.split(":", 1)[0])["evictions"] += 1
+
+    # ---------- public API ----------
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        full_key = f"{namespace}:{key}"
+        value = self._memory_get(namespace, full_key)
+        if value is not None:
+            return value
+
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline()
+                pipe.get(full_key)
+                pipe.pttl(full_key)
+                blob, pttl = pipe.execute()
+                if blob:
+                    value = self._decode(blob)
+                    self._bump(namespace, "redisHits")
+                    remaining = (pttl / 1000.0) if pttl and pttl > 0 else self.ttl_for(namespace)
+                    self._memory_set(namespace, full_key, value, remaining)
+                    return value
+            except Exception as e:
+                logger.warning(f"cache.redis_read_error namespace={namespace} error={e}")
+
+        self._bump(namespace, "misses")
+        return None
+
+    def set(self, namespace: str, key: str, value: str, ttl: Optional[int] = None) -> None:
+        if value is None:
+            return
+        full_key = f"{namespace}:{key}"
+        ttl = int(ttl if ttl is not None else self.ttl_for(namespace))
+        self._memory_set(namespace, full_key, value, ttl)
+        self._bump(namespace, "sets")
+        if self.redis is not None:
+            try:
+                self.redis.setex(full_key, ttl, self._encode(value))
+            except Exception as e:
+                logger.warning(f"cache.redis_write_error namespace={namespace} error={e}")
+
+    def get_json(self, namespace: str, key: str) -> Any:
+        value = self.get(namespace, key)
+        if value is None:
+            return None
+        try:
+            return json.loads(value)
+        except ValueError:
+            return None
+
+    def set_json(self, namespace: str, key: str, obj: Any, ttl: Optional[int] = None) -> None:
+        self.set(namespace, key, json.dumps(obj, ensure_ascii=False), ttl=ttl)
+
+    def delete(self, namespace: str, key: str) -> None:
+        full_key = f"{namespace}:{key}"
+        with self._lock:
+            old = self._memory.pop(full_key, None)
+            if old is not None:
+                self._memory_bytes -= old[2]
+        if self.redis is not None:
+            try:
+                self.redis.delete(full_key)
+            except Exception as e:
+                logger.warning(f"cache.redis_delete_error namespace={namespace} error={e}")
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            raw = self._compression_stats["rawBytes"]
+            stored = self._compression_stats["storedBytes"]
+            return {
+                "memoryEntries": len(self._memory),
+                "memoryBytes": self._memory_bytes,
+                "memoryMaxBytes": self.max_memory_bytes,
+                "redisEnabled": self.redis is not None,
+                "compression": self.compression,
+                "compressionRatio": round(stored / raw, 3) if raw else None,
+                "namespaces": {ns: dict(v) for ns, v in self._stats.items()},
+            }
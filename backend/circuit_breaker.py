@@ -0,0 +1,276 @@
+# CIRCUIT BREAKER: Per provider/model breaker with rolling latency stats and an adaptive call timeout
+# When a provider is clearly down, calls fail fast to the fallback instead of each waiting out the full
+# deadline; the timeout itself follows the observed p95 so a healthy provider never waits 12s on a hang.
+import json
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("resume_analyzer")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider whose breaker is open."""
+
+
+def _percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    # Nearest-rank percentile
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after ``failure_threshold`` consecutive failures, or once the error rate since the
+    last state change reaches ``error_rate_threshold`` over at least ``min_samples`` calls.
+    Open -> half-open after ``open_seconds``; up to ``half_open_probes`` calls are let through and the
+    first result closes (success) or re-opens (failure) the breaker.
+
+    ``timeout()`` is p95 of recent calls x ``timeout_multiplier``, clamped to [min_timeout,
+    max_timeout]; until ``min_samples`` samples exist it is ``max_timeout``. A call cut off by that
+    deadline (``record_timeout``) is a censored sample: it counts at the deadline in the percentile,
+    lifts the timeout to at least deadline x ``timeout_multiplier`` while it is in the window, and is
+    not a failure unless the deadline was already ``max_timeout``. So the timeout backs off for slow
+    prompts instead of the breaker opening on misses it caused itself.
+
+    With ``redis_client`` the state and samples live in Redis so every gunicorn worker sees the same
+    breaker (last writer wins, which is fine for a breaker); Redis errors fall back to local state.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        redis_client=None,
+        window: int = 50,
+        min_samples: int = 5,
+        failure_threshold: int = 5,
+        error_rate_threshold: float = 0.5,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 1,
+        timeout_multiplier: float = 1.5,
+        min_timeout: float = 3.0,
+        max_timeout: float = 12.0,
+        key_prefix: str = "llm_breaker",
+    ):
+        self.name = name
+        self.redis = redis_client
+        self.window = max(1, int(window))
+        self.min_samples = max(1, int(min_samples))
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.error_rate_threshold = float(error_rate_threshold)
+        self.open_seconds = float(open_seconds)
+        self.half_open_probes = max(1, int(half_open_probes))
+        self.timeout_multiplier = float(timeout_multiplier)
+        self.max_timeout = float(max_timeout)
+        self.min_timeout = min(float(min_timeout), self.max_timeout)
+        self._state_key = f"{key_prefix}:{name}:state"
+        self._samples_key = f"{key_prefix}:{name}:samples"
+        self._lock = threading.Lock()
+        self._local_state = self._initial_state()
+        self._local_samples: deque = deque(maxlen=self.window)  # (ts, latency_s, ok, censored)
+        self._stats = {"allowed": 0, "shortCircuited": 0, "opened": 0}
+
+    @staticmethod
+    def _initial_state() -> Dict[str, Any]:
+        return {"state": CLOSED, "changedAt": 0.0, "consecutiveFailures": 0, "probes": 0}
+
+    # ---------- shared storage ----------
+    def _load(self) -> Dict[str, Any]:
+        if self.redis is not None:
+            try:
+                raw = self.redis.get(self._state_key)
+                return json.loads(raw) if raw else self._initial_state()
+            except Exception as e:
+                logger.warning(f"breaker.redis_read_error name={self.name} error={e}")
+        return dict(self._local_state)
+
+    def _save(self, state: Dict[str, Any]) -> None:
+        self._local_state = dict(state)
+        if self.redis is not None:
+            try:
+                self.redis.set(self._state_key, json.dumps(state))
+            except Exception as e:
+                logger.warning(f"breaker.redis_write_error name={self.name} error={e}")
+
+    def _push_sample(self, latency: Optional[float], ok: bool, censored: bool = False) -> None:
+        sample = (time.time(), latency, ok, censored)
+        self._local_samples.append(sample)
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline()
+                pipe.lpush(self._samples_key, json.dumps(sample))
+                pipe.ltrim(self._samples_key, 0, self.window - 1)
+                pipe.execute()
+            except Exception as e:
+                logger.warning(f"breaker.redis_write_error name={self.name} error={e}")
+
+    def _samples(self) -> List[Tuple[float, Optional[float], bool, bool]]:
+        if self.redis is not None:
+            try:
+                samples = [json.loads(raw) for raw in self.redis.lrange(self._samples_key, 0, self.window - 1)]
+                return [(*sample, False)[:4] for sample in samples]  # samples written before "censored" have 3 fields
+            except Exception as e:
+                logger.warning(f"breaker.redis_read_error name={self.name} error={e}")
+        return list(self._local_samples)
+
+    # ---------- breaker ----------
+    def _transition(self, state: Dict[str, Any], new_state: str) -> None:
+        if new_state == CLOSED:
+            logger.info(f"breaker.closed name={self.name}")
+        else:
+            logger.warning(f"breaker.{new_state} name={self.name} from={state['state']}")
+        state.update(state=new_state, changedAt=time.time(), consecutiveFailures=0, probes=0)
+        if new_state == OPEN:
+            self._stats["opened"] += 1
+
+    def allow(self) -> bool:
+        """Whether a call may go to the provider now; counts a half-open probe when it returns True."""
+        with self._lock:
+            state = self._load()
+            if state["state"] == OPEN and time.time() - state["changedAt"] >= self.open_seconds:
+                self._transition(state, HALF_OPEN)
+            if state["state"] == HALF_OPEN:
+                if state["probes"] >= self.half_open_probes:
+                    if time.time() - state["changedAt"] < self.max_timeout * 2:
+                        self._stats["shortCircuited"] += 1
+                        return False
+                    # The probes never reported back (worker died mid-call): start a new round
+                    state.update(changedAt=time.time(), probes=0)
+                state["probes"] += 1
+                self._save(state)
+            elif state["state"] == OPEN:
+                self._stats["shortCircuited"] += 1
+                return False
+            self._stats["allowed"] += 1
+            return True
+
+    def release_probe(self) -> None:
+        """Hand back a half-open probe from ``allow()`` whose call never reached the provider."""
+        with self._lock:
+            state = self._load()
+            if state["state"] == HALF_OPEN and state["probes"] > 0:
+                state["probes"] -= 1
+                self._save(state)
+
+    def record(self, latency: Optional[float], ok: bool) -> None:
+        """Report the outcome of an allowed call (``latency`` in seconds, None to skip the timeout stats)."""
+        with self._lock:
+            self._push_sample(latency, ok)
+            state = self._load()
+            if ok:
+                if state["state"] == HALF_OPEN:
+                    self._transition(state, CLOSED)
+                elif state["consecutiveFailures"] == 0:
+                    return
+                state["consecutiveFailures"] = 0
+                self._save(state)
+                return
+
+            state["consecutiveFailures"] += 1
+            if state["state"] == HALF_OPEN:
+                self._transition(state, OPEN)
+            elif state["state"] == CLOSED:
+                recent = [ok for ts, _, ok, censored in self._samples() if ts >= state["changedAt"] and not censored]
+                error_rate = recent.count(False) / len(recent) if recent else 0.0
+                if state["consecutiveFailures"] >= self.failure_threshold or (
+                    len(recent) >= self.min_samples and error_rate >= self.error_rate_threshold
+                ):
+                    self._transition(state, OPEN)
+            self._save(state)
+
+    def record_timeout(self, deadline: float) -> None:
+        """Report a call cut off by ``deadline`` (the value ``timeout()`` gave it)."""
+        if deadline >= self.max_timeout or self._load()["state"] == HALF_OPEN:
+            self.record(deadline, ok=False)  # even the longest deadline was not enough, or a failed probe
+            return
+        with self._lock:
+            self._push_sample(deadline, ok=False, censored=True)
+        logger.info(f"breaker.deadline_backoff name={self.name} deadline_s={deadline}")
+
+    @staticmethod
+    def _latencies(samples) -> List[float]:
+        """Successful latencies plus censored ones (the call took at least its deadline)."""
+        return sorted(latency for _, latency, ok, censored in samples if (ok or censored) and latency is not None)
+
+    def latency_percentile(self, pct: float) -> Optional[float]:
+        """Latency (seconds) at ``pct`` over recent calls, or None below ``min_samples``."""
+        latencies = self._latencies(self._samples())
+        if len(latencies) < self.min_samples:
+            return None
+        return _percentile(latencies, pct)
+
+    def timeout(self) -> float:
+        """Deadline for the next call: p95 of recent calls, backed off past any recent deadline miss."""
+        samples = self._samples()
+        latencies = self._latencies(samples)
+        if len(latencies) < self.min_samples:
+            return self.max_timeout
+        missed = max((latency for _, latency, _, censored in samples if censored), default=0.0)
+        wanted = max(_percentile(latencies, 95), missed) * self.timeout_multiplier
+        return round(min(self.max_timeout, max(self.min_timeout, wanted)), 2)
+
+    def stats(self) -> Dict[str, Any]:
+        samples = self._samples()
+        latencies = self._latencies(samples)
+        p50 = _percentile(latencies, 50)
+        p95 = _percentile(latencies, 95)
+        state = self._load()
+        return {
+            "state": state["state"],
+            "consecutiveFailures": state["consecutiveFailures"],
+            "samples": len(samples),
+            "errorRate": round(sum(1 for _, _, ok, censored in samples if not ok and not censored) / len(samples), 3) if samples else 0.0,
+            "deadlineMisses": sum(1 for *_, censored in samples if censored),
+            "p50Ms": round(p50 * 1000) if p50 is not None else None,
+            "p95Ms": round(p95 * 1000) if p95 is not None else None,
+            "timeoutSeconds": self.timeout(),
+            **self._stats,
+        }
+
+
+class CircuitBreakerRegistry:
+    """One CircuitBreaker per "provider:model", created on first use with shared settings."""
+
+    def __init__(self, redis_client=None, **settings):
+        self.redis = redis_client
+        self.settings = settings
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str, model: str = "", **overrides) -> CircuitBreaker:
+        name = f"{(provider or 'unknown').lower()}:{model}"
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name, redis_client=self.redis, **{**self.settings, **overrides})
+                self._breakers[name] = breaker
+            return breaker
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            breakers = list(self._breakers.items())
+        return {name: breaker.stats() for name, breaker in breakers}
+
+
+# Singleton instance
+_registry_instance: Optional[CircuitBreakerRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_circuit_breakers(redis_client=None, **settings) -> CircuitBreakerRegistry:
+    """Process-wide registry; arguments only apply on first call (same pattern as get_llm_executor)."""
+    global _registry_instance
+    if _registry_instance is None:
+        with _registry_lock:
+            if _registry_instance is None:
+                _registry_instance = CircuitBreakerRegistry(redis_client=redis_client, **settings)
+    return _registry_instance
@@ -24,8 +24,55 @@ class Config:
     OPENAI_API_KEY: str | None = os.getenv("OPENAI_API_KEY")
     LLM_MODEL: str = os.getenv("LLM_MODEL", "cohere:command-r")
     LLM_TIMEOUT_SECONDS: int = int(os.getenv("LLM_TIMEOUT_SECONDS", "12"))
+    LLM_STREAM_TIMEOUT_SECONDS: int = int(os.getenv("LLM_STREAM_TIMEOUT_SECONDS", "90"))
+    LLM_MAX_WORKERS: int = int(os.getenv("LLM_MAX_WORKERS", "4"))
+    LLM_MAX_QUEUE: int = int(os.getenv("LLM_MAX_QUEUE", "16"))
+    LLM_PROVIDER_CONCURRENCY: int = int(os.getenv("LLM_PROVIDER_CONCURRENCY", "3"))
+    LLM_ASYNC_ENABLED: bool = os.getenv("LLM_ASYNC_ENABLED", "1").lower() in ("1", "true", "yes")
+    LLM_ASYNC_MAX_CONCURRENCY: int = int(os.getenv("LLM_ASYNC_MAX_CONCURRENCY", "32"))
+    LLM_BREAKER_FAILURE_THRESHOLD: int = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5"))
+    LLM_BREAKER_ERROR_RATE: float = float(os.getenv("LLM_BREAKER_ERROR_RATE", "0.5"))
+    LLM_BREAKER_OPEN_SECONDS: float = float(os.getenv("LLM_BREAKER_OPEN_SECONDS", "30"))
+    LLM_BREAKER_WINDOW: int = int(os.getenv("LLM_BREAKER_WINDOW", "50"))
+    LLM_TIMEOUT_P95_MULTIPLIER: float = float(os.getenv("LLM_TIMEOUT_P95_MULTIPLIER", "1.5"))
+    LLM_MIN_TIMEOUT_SECONDS: float = float(os.getenv("LLM_MIN_TIMEOUT_SECONDS", "3"))
+    # Hedging: comma separated Flask endpoint names (e.g. "analyze,ai_orchestrator"); empty disables it
+    LLM_HEDGE_ENDPOINTS: str = os.getenv("LLM_HEDGE_ENDPOINTS", "")
+    LLM_HEDGE_MODEL: str = os.getenv("LLM_HEDGE_MODEL", "")  # provider:model; default is the other provider
+    LLM_HEDGE_PERCENTILE: float = float(os.getenv("LLM_HEDGE_PERCENTILE", "90"))
+    LLM_HEDGE_DEFAULT_DELAY_SECONDS: float = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY_SECONDS", "4"))
+    # "60" for every provider or "cohere=100,openai=500"; 0 means unlimited
+    LLM_REQUESTS_PER_MINUTE: str = os.getenv("LLM_REQUESTS_PER_MINUTE", "300")
+    LLM_TOKENS_PER_MINUTE: str = os.getenv("LLM_TOKENS_PER_MINUTE", "300000")
+    LLM_TENANT_SHARE: float = float(os.getenv("LLM_TENANT_SHARE", "0.5"))
+    LLM_BATCH_RESERVE: float = float(os.getenv("LLM_BATCH_RESERVE", "0.25"))
+    LLM_GOVERNOR_MAX_WAIT_SECONDS: float = float(os.getenv("LLM_GOVERNOR_MAX_WAIT_SECONDS", "5"))
+    LLM_BATCH_MAX_WAIT_SECONDS: float = float(os.getenv("LLM_BATCH_MAX_WAIT_SECONDS", "30"))
+    LLM_COMPLETION_TOKEN_ESTIMATE: int = int(os.getenv("LLM_COMPLETION_TOKEN_ESTIMATE", "500"))
     ASYNC_TASKS_ENABLED: bool = os.getenv("ASYNC_TASKS_ENABLED", "0").lower() in ("1", "true", "yes")
 
+    CACHE_MEMORY_MAX_BYTES: int = int(os.getenv("CACHE_MEMORY_MAX_BYTES", str(16 * 1024 * 1024)))
+    CACHE_COMPRESSION: str = os.getenv("CACHE_COMPRESSION", "zlib").lower()
+    PDF_EXTRACT_WORKERS: int = int(os.getenv("PDF_EXTRACT_WORKERS", "2"))
+    PDF_EXTRACT_TIMEOUT_SECONDS: float = float(os.getenv("PDF_EXTRACT_TIMEOUT_SECONDS", "20"))
+    PDF_MAX_BYTES: int = int(os.getenv("PDF_MAX_BYTES", str(10 * 1024 * 1024)))
+    PDF_MAX_PAGES: int = int(os.getenv("PDF_MAX_PAGES", "50"))
+    SEMANTIC_MODE: str = os.getenv("SEMANTIC_MODE", "hashing").lower()
+    SEMANTIC_MODEL_PATH: str | None = os.getenv("SEMANTIC_MODEL_PATH")
+    SKILL_TAXONOMY_PATH: str | None = os.getenv("SKILL_TAXONOMY_PATH")
+    SECTION_HEADERS_PATH: str | None = os.getenv("SECTION_HEADERS_PATH")
+    RECRUITER_RANK_MAX_CANDIDATES: int = int(os.getenv("RECRUITER_RANK_MAX_CANDIDATES", "500"))
+    NARRATIVE_WORKERS: int = int(os.getenv("NARRATIVE_WORKERS", "2"))
+    ORCHESTRATOR_WORKERS: int = int(os.getenv("ORCHESTRATOR_WORKERS", "8"))
+    ORCHESTRATOR_STEP_TIMEOUT_SECONDS: float = float(os.getenv("ORCHESTRATOR_STEP_TIMEOUT_SECONDS", "40"))
+    ORCHESTRATOR_MODE: str = os.getenv("ORCHESTRATOR_MODE", "parallel")  # parallel | fused
+    RAG_MEMORY_BUDGET_MB: int = int(os.getenv("RAG_MEMORY_BUDGET_MB", "64"))
+    RAG_EMBEDDING_CACHE_MB: int = int(os.getenv("RAG_EMBEDDING_CACHE_MB", "64"))
+    RAG_QUERY_BATCH_MAX: int = int(os.getenv("RAG_QUERY_BATCH_MAX", "50"))
+    RAG_PERSIST_ENABLED: bool = os.getenv("RAG_PERSIST_ENABLED", "1").lower() in ("1", "true", "yes")
+    RAG_SESSION_SECRET: str | None = os.getenv("RAG_SESSION_SECRET")
+    RESUME_SESSION_TTL_SECONDS: int = int(os.getenv("RESUME_SESSION_TTL_SECONDS", "86400"))
+
     DATA_DIR: str = os.getenv("DATA_DIR", "data")
 
     SMTP_HOST: str | None = os.getenv("SMTP_HOST")
@@ -0,0 +1,200 @@
+# EMBEDDING CACHE: Chunk embeddings keyed by (model name, chunk text hash)
+# Vectors are float16 rows appended to one file per model (<model>.f16) with a hash index beside it
+# (<model>.idx: "dim=<n>" then one hash per row). Files are memory-mapped, so every worker shares them.
+import hashlib
+import logging
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: appends are serialized per process only
+    fcntl = None
+
+logger = logging.getLogger("resume_analyzer")
+
+
+def chunk_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+class _ModelStore:
+    """Rows for one embeddings model, on disk (memory-mapped) or in memory when ``cache_dir`` is None."""
+
+    def __init__(self, model: str, cache_dir: Optional[str]):
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model)
+        self.vectors_path = os.path.join(cache_dir, f"{slug}.f16") if cache_dir else None
+        self.index_path = os.path.join(cache_dir, f"{slug}.idx") if cache_dir else None
+        self.dim: Optional[int] = None
+        self.rows: Dict[str, int] = {}
+        self._index_size = 0
+        self._vectors = None  # np.memmap over the file, or ndarray in memory mode
+        self._refresh()
+
+    @property
+    def count(self) -> int:
+        return len(self.rows)
+
+    @property
+    def nbytes(self) -> int:
+        return self.count * (self.dim or 0) * 2
+
+    def _refresh(self) -> None:
+        """Pick up rows appended by this or another process since the last read."""
+        if not self.index_path or not os.path.exists(self.index_path):
+            return
+        size = os.path.getsize(self.index_path)
+        if size == self._index_size:
+            return
+        with open(self.index_path, encoding="ascii") as f:
+            lines = f.read().splitlines()
+        if not lines or not lines[0].startswith("dim="):
+            return
+        self.dim = int(lines[0][4:])
+        hashes = lines[1:]
+        row_bytes = self.dim * 2
+        complete = os.path.getsize(self.vectors_path) // row_bytes if os.path.exists(self.vectors_path) else 0
+        hashes = hashes[:complete]  # a row whose vector write did not finish is ignored
+        self.rows = {h: i for i, h in enumerate(hashes)}
+        self._vectors = np.memmap(self.vectors_path, dtype=np.float16, mode="r", shape=(len(hashes), self.dim)) if hashes else None
+        self._index_size = size
+
+    def _repair(self) -> None:
+        """
+        Under the append lock: cut both files back to the rows they agree on. A crash between the
+        vector write and the hash write leaves orphan vectors; appending after them would shift
+        every later hash onto another chunk's vector.
+        """
+        if self.dim is None or not os.path.exists(self.vectors_path):
+            return
+        row_bytes = self.dim * 2
+        with open(self.index_path, encoding="ascii") as f:
+            lines = f.read().splitlines()
+        hashes = lines[1:]
+        rows = min(len(hashes), os.path.getsize(self.vectors_path) // row_bytes)
+        if os.path.getsize(self.vectors_path) != rows * row_bytes:
+            logger.warning(f"embedding_cache.truncated path={self.vectors_path} rows={rows}")
+            os.truncate(self.vectors_path, rows * row_bytes)
+        if len(hashes) != rows:
+            logger.warning(f"embedding_cache.truncated path={self.index_path} rows={rows}")
+            with open(self.index_path, "w", encoding="ascii") as f:
+                f.write("".join(f"{line}\n" for line in lines[:rows + 1]))
+        self._index_size = -1  # re-read on the next refresh
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        row = self.rows.get(key)
+        return None if row is None else self._vectors[row]
+
+    def append(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        if self.dim is None:
+            self.dim = int(vectors.shape[1])
+        if not self.index_path:
+            start = self.count
+            self._vectors = vectors if self._vectors is None else np.vstack([self._vectors, vectors])
+            self.rows.update({key: start + i for i, key in enumerate(keys)})
+            return
+        with open(self.index_path, "a+", encoding="ascii") as index_file:
+            if fcntl is not None:
+                fcntl.flock(index_file, fcntl.LOCK_EX)
+            try:
+                self._refresh()  # another worker may have added some of these
+                self._repair()
+                self._refresh()
+                fresh = [(key, vector) for key, vector in zip(keys, vectors) if key not in self.rows]
+                if fresh:
+                    with open(self.vectors_path, "ab") as vectors_file:
+                        vectors_file.write(np.stack([v for _, v in fresh]).astype(np.float16).tobytes())
+                    if os.path.getsize(self.index_path) == 0:
+                        index_file.write(f"dim={self.dim}\n")
+                    index_file.write("".join(f"{key}\n" for key, _ in fresh))
+                    index_file.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(index_file, fcntl.LOCK_UN)
+        self._refresh()
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache.
+
+    Features:
+      - ``embed_many(model, texts, compute)`` returns cached vectors and calls ``compute`` only for
+        texts this model has not embedded before (duplicates within a batch are computed once)
+      - Stored as float16: half the size of the float32 vectors; every caller gets the same
+        rounded vector for a chunk, hit or miss
+      - Stops adding rows once the files reach ``max_bytes`` (lookups keep working)
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = 64 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max(0, int(max_bytes))
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._stores: Dict[str, _ModelStore] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "skippedFull": 0}
+
+    def _store(self, model: str) -> _ModelStore:
+        store = self._stores.get(model)
+        if store is None:
+            store = self._stores[model] = _ModelStore(model, self.cache_dir)
+        return store
+
+    def _total_bytes(self) -> int:
+        return sum(store.nbytes for store in self._stores.values())
+
+    def embed_many(self, model: str, texts: Sequence[str], compute: Callable[[List[str]], List[List[float]]]) -> List[List[float]]:
+        keys = [chunk_hash(text) for text in texts]
+        with self._lock:
+            store = self._store(model)
+            store._refresh()
+            found = {key: store.get(key) for key in dict.fromkeys(keys)}
+        missing = [key for key, vector in found.items() if vector is None]
+        if missing:
+            first_text = {}
+            for key, text in zip(keys, texts):
+                first_text.setdefault(key, text)
+            computed = np.asarray(compute([first_text[key] for key in missing]), dtype=np.float32).astype(np.float16)
+            with self._lock:
+                if self._total_bytes() + computed.nbytes <= self.max_bytes:
+                    store.append(missing, computed)
+                else:
+                    self._stats["skippedFull"] += len(missing)
+            found.update(zip(missing, computed))
+        missed = set(missing)
+        with self._lock:
+            self._stats["misses"] += sum(1 for key in keys if key in missed)
+            self._stats["hits"] += sum(1 for key in keys if key not in missed)
+        return [found[key].astype(np.float32).tolist() for key in keys]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "path": self.cache_dir,
+                "models": {model: {"entries": store.count, "dim": store.dim, "bytes": store.nbytes} for model, store in self._stores.items()},
+                "bytes": self._total_bytes(),
+                "maxBytes": self.max_bytes,
+                **self._stats,
+                "hitRate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+            }
+
+
+# Singleton instance
+_cache_instance: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache(**kwargs) -> EmbeddingCache:
+    """Process-wide cache; kwargs only apply on first call (same pattern as get_llm_executor)."""
+    global _cache_instance
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                _cache_instance = EmbeddingCache(**kwargs)
+    return _cache_instance
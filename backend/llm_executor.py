@@ -0,0 +1,238 @@
+# LLM EXECUTOR: Long-lived, size-bounded thread pool shared by every endpoint that talks to an LLM provider
+# Enforces per-call deadlines, caps in-flight calls per provider and exposes queue depth / rejection counters
+import concurrent.futures
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger("resume_analyzer")
+
+
+class LLMRejectedError(RuntimeError):
+    """Raised when a call is refused because the pool or the provider is saturated."""
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    """Raised when a provider call does not finish within its deadline."""
+
+
+class LLMSlotTimeout(LLMDeadlineExceeded):
+    """Raised when the deadline passes while the call is still waiting for a provider slot."""
+
+
+class LLMExecutor:
+    """
+    Process-wide executor for blocking provider SDK calls.
+
+    Features:
+      - Fixed worker count: threads are created once and reused, never leaked per call
+      - Bounded backlog: submissions beyond ``max_queue`` waiting calls are rejected immediately
+      - Per-provider slots: a call waits (up to its deadline) for one of ``provider_concurrency``
+        slots; a slot is held until the underlying call really finishes, so calls that outlive
+        their caller's deadline still count against the provider cap
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 16, provider_concurrency: int = 3):
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(0, int(max_queue))
+        self.provider_concurrency = max(1, int(provider_concurrency))
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="llm-worker",
+        )
+        self._lock = threading.Lock()
+        self._provider_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._queued = 0
+        self._running = 0
+        self._stats: Dict[str, Any] = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "timeouts": 0,
+            "rejected": 0,
+            "byProvider": {},
+        }
+
+    def _provider_stats(self, provider: str) -> Dict[str, int]:
+        return self._stats["byProvider"].setdefault(provider, {
+            "inFlight": 0,
+            "completed": 0,
+            "failed": 0,
+            "timeouts": 0,
+            "rejected": 0,
+        })
+
+    def _slot_for(self, provider: str) -> threading.BoundedSemaphore:
+        slot = self._provider_slots.get(provider)
+        if slot is None:
+            slot = threading.BoundedSemaphore(self.provider_concurrency)
+            self._provider_slots[provider] = slot
+        return slot
+
+    def _reject(self, provider: str, reason: str) -> None:
+        self._stats["rejected"] += 1
+        self._provider_stats(provider)["rejected"] += 1
+        logger.warning(f"llm.executor_rejected provider={provider} reason={reason}")
+        raise LLMRejectedError(f"LLM call rejected: {reason}")
+
+    def _count_timeout(self, provider: str) -> None:
+        with self._lock:
+            self._stats["timeouts"] += 1
+            self._provider_stats(provider)["timeouts"] += 1
+
+    def submit(self, provider: str, fn: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> concurrent.futures.Future:
+        """
+        Schedule ``fn`` on the shared pool. Waits up to ``timeout`` seconds for a provider slot
+        (LLMSlotTimeout after that); raises LLMRejectedError only if the backlog is full.
+        """
+        provider = (provider or "unknown").lower()
+        with self._lock:
+            backlog = self._queued - (self.max_workers - self._running)
+            if backlog >= self.max_queue:
+                self._reject(provider, f"queue full ({self._queued} waiting)")
+            slot = self._slot_for(provider)
+            # Callers waiting for a provider slot count as queued
+            self._queued += 1
+            self._stats["submitted"] += 1
+
+        if not slot.acquire(timeout=timeout):
+            with self._lock:
+                self._queued -= 1
+            self._count_timeout(provider)
+            logger.warning(f"llm.executor_slot_timeout provider={provider} timeout_s={timeout}")
+            raise LLMSlotTimeout(f"{provider} call waited {timeout}s for a free provider slot")
+        with self._lock:
+            self._provider_stats(provider)["inFlight"] += 1
+
+        state = {"started": False}
+
+        def _run():
+            with self._lock:
+                state["started"] = True
+                self._queued -= 1
+                self._running += 1
+            return fn(*args, **kwargs)
+
+        def _done(fut: concurrent.futures.Future):
+            with self._lock:
+                if state["started"]:
+                    self._running -= 1
+                else:
+                    self._queued -= 1
+                stats = self._provider_stats(provider)
+                stats["inFlight"] -= 1
+                if not fut.cancelled():
+                    if fut.exception() is None:
+                        self._stats["completed"] += 1
+                        stats["completed"] += 1
+                    else:
+                        self._stats["failed"] += 1
+                        stats["failed"] += 1
+            slot.release()
+
+        try:
+            future = self._pool.submit(_run)
+        except Exception:
+            with self._lock:
+                self._queued -= 1
+                self._provider_stats(provider)["inFlight"] -= 1
+            slot.release()
+            raise
+        future.add_done_callback(_done)
+        return future
+
+    def run(self, provider: str, fn: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Run ``fn`` on the pool and wait at most ``timeout`` seconds for its result."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        future = self.submit(provider, fn, *args, timeout=timeout, **kwargs)
+        try:
+            return future.result(timeout=None if deadline is None else max(0.0, deadline - time.monotonic()))
+        except concurrent.futures.TimeoutError:
+            # Drops the call if it never started; a running call keeps its provider slot until it returns.
+            future.cancel()
+            self._count_timeout((provider or "unknown").lower())
+            raise LLMDeadlineExceeded(f"{provider} call exceeded {timeout}s deadline")
+
+    def stream(self, provider: str, fn: Callable[..., Iterator[Any]], *args, timeout: Optional[float] = None, **kwargs) -> Iterator[Any]:
+        """
+        Run the iterator returned by ``fn`` on the pool and yield its items as they arrive.
+
+        ``timeout`` bounds the whole stream. The worker holds the provider slot until the provider
+        iterator ends; if the consumer stops early (client disconnect) or the deadline passes, the
+        worker stops pulling after the next item.
+        """
+        items: "queue.Queue" = queue.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def _pump():
+            try:
+                for item in fn(*args, **kwargs):
+                    if stop.is_set():
+                        break
+                    items.put((True, item))
+            except BaseException as e:
+                items.put((False, e))
+                raise
+            finally:
+                items.put((True, done))
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        future = self.submit(provider, _pump, timeout=timeout)
+        try:
+            while True:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    ok, item = items.get(timeout=remaining)
+                except queue.Empty:
+                    future.cancel()
+                    self._count_timeout((provider or "unknown").lower())
+                    raise LLMDeadlineExceeded(f"{provider} stream exceeded {timeout}s deadline")
+                if not ok:
+                    raise item
+                if item is done:
+                    return
+                yield item
+        finally:
+            stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool utilisation and counters for /metrics."""
+        with self._lock:
+            return {
+                "maxWorkers": self.max_workers,
+                "maxQueue": self.max_queue,
+                "providerConcurrency": self.provider_concurrency,
+                "queueDepth": self._queued,
+                "running": self._running,
+                "submitted": self._stats["submitted"],
+                "completed": self._stats["completed"],
+                "failed": self._stats["failed"],
+                "timeouts": self._stats["timeouts"],
+                "rejected": self._stats["rejected"],
+                "byProvider": {k: dict(v) for k, v in self._stats["byProvider"].items()},
+                "snapshotAt": time.time(),
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# Singleton instance
+_executor_instance: Optional[LLMExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_llm_executor(max_workers: int = 4, max_queue: int = 16, provider_concurrency: int = 3) -> LLMExecutor:
+    global _executor_instance
+    if _executor_instance is None:
+        with _executor_lock:
+            if _executor_instance is None:
+                _executor_instance = LLMExecutor(
+                    max_workers=max_workers,
+                    max_queue=max_queue,
+                    provider_concurrency=provider_concurrency,
+                )
+    return _executor_instance
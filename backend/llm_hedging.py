@@ -0,0 +1,127 @@
+# LLM HEDGING: Duplicate a slow call to a second provider and take whichever valid answer lands first
+# The hedge only fires after the primary has been slower than its usual tail (a latency percentile), so
+# most requests pay once; the duplicated spend is counted so the p99 gain can be weighed against it.
+import concurrent.futures
+import contextvars
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger("resume_analyzer")
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Rough token count (~4 characters per token) for spend accounting."""
+    return (len(text) + 3) // 4 if text else 0
+
+
+class Hedger:
+    """
+    ``run(primary, secondary, delay)`` starts ``primary()``; if it has not produced a valid result
+    within ``delay`` seconds (or fails sooner), ``secondary()`` is started too and the first valid
+    result wins. The loser keeps running to completion on the pool (provider SDK calls cannot be
+    interrupted) and its answer is discarded, but its completion tokens are still counted.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self.max_workers = max(2, int(max_workers))
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="llm-hedge")
+        self._lock = threading.Lock()
+        self._stats = {
+            "calls": 0,
+            "hedged": 0,
+            "primaryWins": 0,
+            "secondaryWins": 0,
+            "bothFailed": 0,
+            "extraPromptTokens": 0,
+            "extraCompletionTokens": 0,
+        }
+
+    def _bump(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[name] += amount
+
+    def run(
+        self,
+        primary: Callable[[], Any],
+        secondary: Callable[[], Any],
+        delay: float,
+        is_valid: Callable[[Any], bool] = bool,
+        prompt_tokens: int = 0,
+    ) -> Tuple[Any, str]:
+        """Returns (result, "primary"|"secondary"); when neither is valid, the primary's result."""
+        self._bump("calls")
+        # Both calls inherit the caller's context variables (e.g. LLM tenant and priority)
+        primary_future = self._pool.submit(contextvars.copy_context().run, primary)
+        try:
+            result = primary_future.result(timeout=max(0.0, delay))
+            if is_valid(result):
+                self._bump("primaryWins")
+                return result, "primary"
+        except concurrent.futures.TimeoutError:
+            pass
+        except Exception as e:
+            logger.warning(f"llm.hedge_primary_error error={e}")
+
+        self._bump("hedged")
+        self._bump("extraPromptTokens", prompt_tokens)
+        secondary_future = self._pool.submit(contextvars.copy_context().run, secondary)
+        logger.info(f"llm.hedge_fired delay_s={round(delay, 2)} primary_done={primary_future.done()}")
+        names = {primary_future: "primary", secondary_future: "secondary"}
+        pending = set(names)
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning(f"llm.hedge_{names[future]}_error error={e}")
+                    continue
+                if is_valid(result):
+                    winner = names[future]
+                    self._bump(f"{winner}Wins")
+                    for loser in pending:
+                        self._count_loser(loser, is_valid)
+                    return result, winner
+
+        self._bump("bothFailed")
+        try:
+            return primary_future.result(), "primary"
+        except Exception:
+            return None, "primary"
+
+    def _count_loser(self, future: concurrent.futures.Future, is_valid: Callable[[Any], bool]) -> None:
+        if future.cancel():
+            return
+
+        def _done(fut: concurrent.futures.Future):
+            if fut.cancelled() or fut.exception() is not None:
+                return
+            result = fut.result()
+            if is_valid(result):
+                self._bump("extraCompletionTokens", estimate_tokens(str(result)))
+
+        future.add_done_callback(_done)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["hedgeRate"] = round(stats["hedged"] / stats["calls"], 3) if stats["calls"] else 0.0
+        return stats
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# Singleton instance
+_hedger_instance: Optional[Hedger] = None
+_hedger_lock = threading.Lock()
+
+
+def get_hedger(max_workers: int = 8) -> Hedger:
+    global _hedger_instance
+    if _hedger_instance is None:
+        with _hedger_lock:
+            if _hedger_instance is None:
+                _hedger_instance = Hedger(max_workers=max_workers)
+    return _hedger_instance
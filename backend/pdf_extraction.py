@@ -0,0 +1,356 @@
+# PDF EXTRACTION: Process-pool pdfplumber text extraction with page/byte/wall-clock limits
+# Large PDFs are split into page ranges that run in parallel worker processes; a pathological
+# document can no longer pin the gunicorn request thread (or a Celery/RQ worker) for the full timeout.
+import io
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import pdfplumber
+
+logger = logging.getLogger("resume_analyzer")
+
+
+class PDFTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured byte limit (checked before parsing)."""
+
+
+@dataclass
+class PDFExtractionResult:
+    text: str
+    page_count: int = 0
+    pages_extracted: int = 0
+    timed_out: bool = False
+    truncated: bool = False  # page limit hit; trailing pages were never parsed
+    budget_reached: bool = False  # char_budget satisfied before the last page; remaining pages skipped
+    elapsed_ms: float = 0.0
+    mode: str = "pool"
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def partial(self) -> bool:
+        return self.timed_out or self.truncated or bool(self.errors)
+
+
+# ---------- worker-side functions (must be top-level so they pickle) ----------
+def _page_text(page, fast: bool) -> str:
+    # extract_text_simple groups chars into lines without the word/layout clustering pass
+    text = page.extract_text_simple() if fast else page.extract_text()
+    page.flush_cache()
+    return text or ""
+
+
+def _extract_page_range(pdf_bytes: bytes, start: int, stop: int, char_budget: Optional[int] = None, fast: bool = False):
+    """
+    Extract pages [start, stop); returns (page_count, one string per page).
+    With ``char_budget`` pages are read lazily and iteration stops once the budget is covered.
+    """
+    texts = []
+    chars = 0
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        pages = pdf.pages
+        for index in range(start, min(stop, len(pages))):
+            text = _page_text(pages[index], fast)
+            texts.append(text)
+            chars += len(text) + 1
+            if char_budget is not None and chars >= char_budget:
+                break
+        return len(pages), texts
+
+
+def _join_pages(pages: List[str], char_budget: Optional[int] = None) -> str:
+    text = "\n".join(text for text in pages if text).strip()
+    return text[:char_budget] if char_budget is not None else text
+
+
+def _budget_covered(pages: List[str], char_budget: Optional[int]) -> bool:
+    return char_budget is not None and sum(len(text) + 1 for text in pages) >= char_budget
+
+
+class PDFExtractor:
+    """
+    Text extraction engine shared by the Flask request path and background workers.
+
+    Limits:
+      - max_bytes: rejected before any parsing (PDFTooLargeError)
+      - max_pages: only the first N pages are parsed; result.truncated is set
+      - timeout: wall-clock budget per document; pages finished in time are returned as partial text
+
+    Per call, ``char_budget`` stops parsing once enough text is collected (callers that truncate
+    to N chars pass N) and ``fast`` uses pdfplumber's simple text path without layout clustering.
+
+    Runs inline (no pool) when max_workers is 0 or inside a daemonic process such as a Celery
+    prefork child, which is not allowed to spawn children of its own.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_bytes: int = 10 * 1024 * 1024,
+        max_pages: int = 50,
+        timeout: float = 20.0,
+        pages_per_task: int = 8,
+    ):
+        self.max_workers = max(0, int(max_workers))
+        self.max_bytes = int(max_bytes)
+        self.max_pages = max(1, int(max_pages))
+        self.timeout = float(timeout)
+        self.pages_per_task = max(1, int(pages_per_task))
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        # Which pool each unfinished task runs on, and which of those belong to timed-out documents
+        self._inflight: Dict[Future, ProcessPoolExecutor] = {}
+        self._stuck: Set[Future] = set()
+        self._inflight_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "documents": 0,
+            "pages": 0,
+            "timeouts": 0,
+            "truncated": 0,
+            "budgetStops": 0,
+            "pagesSkipped": 0,
+            "rejected": 0,
+            "failed": 0,
+            "poolRestarts": 0,
+        }
+
+    # ---------- pool management ----------
+    def _use_pool(self) -> bool:
+        return self.max_workers > 0 and not multiprocessing.current_process().daemon
+
+    def _submit(self, *args) -> Future:
+        with self._pool_lock:
+            if self._pool is None:
+                # fork is unsafe from a threaded gunicorn worker; forkserver/spawn start clean
+                methods = multiprocessing.get_all_start_methods()
+                ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=ctx)
+            future = self._pool.submit(*args)
+            with self._inflight_lock:
+                self._inflight[future] = self._pool
+            future.add_done_callback(self._forget)
+        return future
+
+    def _forget(self, future: Future) -> None:
+        with self._inflight_lock:
+            self._inflight.pop(future, None)
+            self._stuck.discard(future)
+
+    def _retire_pool(self, stuck: Iterable[Future]) -> None:
+        """Stop sending work to the pools running a timed-out document's tasks.
+
+        Other documents' tasks already on a retired pool are left to finish; a reaper thread then
+        terminates whatever is still running there, which is only the stuck pages.
+        """
+        # Ranges that never reached a worker are simply dropped
+        stuck = [future for future in stuck if not future.cancel()]
+        retired = []
+        with self._pool_lock, self._inflight_lock:
+            for future in stuck:
+                pool = self._inflight.get(future)
+                if pool is None:
+                    continue
+                self._stuck.add(future)
+                if pool is self._pool:
+                    self._pool = None
+                    retired.append(pool)
+        for pool in retired:
+            self._bump("poolRestarts")
+            threading.Thread(target=self._reap_pool, args=(pool,), name="pdf-pool-reaper", daemon=True).start()
+
+    def _reap_pool(self, pool: ProcessPoolExecutor) -> None:
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._inflight_lock:
+                others = [f for f, owner in self._inflight.items() if owner is pool and f not in self._stuck]
+            remaining = deadline - time.monotonic()
+            if not others or remaining <= 0:
+                break
+            wait(others, timeout=remaining)
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            try:
+                process.terminate()
+            except Exception:
+                pass
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    # ---------- extraction ----------
+    def extract(
+        self,
+        pdf_bytes: bytes,
+        timeout: Optional[float] = None,
+        max_pages: Optional[int] = None,
+        char_budget: Optional[int] = None,
+        fast: bool = False,
+    ) -> PDFExtractionResult:
+        if len(pdf_bytes) > self.max_bytes:
+            self._bump("rejected")
+            raise PDFTooLargeError(f"PDF is {len(pdf_bytes)} bytes; limit is {self.max_bytes}")
+        timeout = self.timeout if timeout is None else float(timeout)
+        max_pages = self.max_pages if max_pages is None else max(1, int(max_pages))
+        char_budget = None if char_budget is None else max(1, int(char_budget))
+
+        started = time.monotonic()
+        if self._use_pool():
+            result = self._extract_pooled(pdf_bytes, started + timeout, max_pages, char_budget, fast)
+        else:
+            result = self._extract_inline(pdf_bytes, started + timeout, max_pages, char_budget, fast)
+        result.elapsed_ms = round((time.monotonic() - started) * 1000, 1)
+
+        with self._stats_lock:
+            self._stats["documents"] += 1
+            self._stats["pages"] += result.pages_extracted
+            self._stats["timeouts"] += int(result.timed_out)
+            self._stats["truncated"] += int(result.truncated)
+            self._stats["budgetStops"] += int(result.budget_reached)
+            self._stats["pagesSkipped"] += max(0, min(result.page_count, max_pages) - result.pages_extracted)
+        if result.partial:
+            logger.warning(
+                f"pdf.partial_extract pages={result.pages_extracted}/{result.page_count} "
+                f"timed_out={result.timed_out} truncated={result.truncated} ms={result.elapsed_ms}"
+            )
+        return result
+
+    def _extract_inline(self, pdf_bytes: bytes, deadline: float, max_pages: int, char_budget: Optional[int], fast: bool) -> PDFExtractionResult:
+        # Deadline is checked between pages only; a single slow page cannot be interrupted in-process
+        pages: List[str] = []
+        timed_out = False
+        with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+            page_count = len(pdf.pages)
+            for index in range(min(page_count, max_pages)):
+                if _budget_covered(pages, char_budget):
+                    break
+                if time.monotonic() >= deadline:
+                    timed_out = True
+                    break
+                pages.append(_page_text(pdf.pages[index], fast))
+        return PDFExtractionResult(
+            text=_join_pages(pages, char_budget),
+            page_count=page_count,
+            pages_extracted=len(pages),
+            timed_out=timed_out,
+            truncated=page_count > max_pages and len(pages) == max_pages,
+            budget_reached=len(pages) < min(page_count, max_pages) and _budget_covered(pages, char_budget),
+            mode="inline",
+        )
+
+    def _extract_pooled(self, pdf_bytes: bytes, deadline: float, max_pages: int, char_budget: Optional[int], fast: bool) -> PDFExtractionResult:
+        # The first range also reports the page count, so 1-3 page resumes cost a single task
+        first_stop = min(self.pages_per_task, max_pages)
+        first = self._submit(_extract_page_range, pdf_bytes, 0, first_stop, char_budget, fast)
+        try:
+            page_count, first_pages = first.result(timeout=max(0.0, deadline - time.monotonic()))
+        except TimeoutError:
+            self._bump("failed")
+            self._retire_pool([first])
+            return PDFExtractionResult(text="", timed_out=True, errors=["first page range timed out"])
+        except Exception:
+            self._bump("failed")
+            raise
+
+        wanted = min(page_count, max_pages)
+        starts = [0] + list(range(first_stop, wanted, self.pages_per_task))
+        chunks: Dict[int, List[str]] = {0: first_pages}
+        errors: List[str] = []
+        if char_budget is not None:
+            stuck = self._collect_budgeted(pdf_bytes, starts[1:], wanted, deadline, char_budget, fast, chunks, errors)
+        else:
+            stuck = self._collect_parallel(pdf_bytes, starts[1:], wanted, deadline, fast, chunks, errors)
+        timed_out = bool(stuck)
+        if timed_out:
+            self._retire_pool(stuck)
+
+        # Keep document order and stop at the first gap so partial text is always a clean prefix
+        pages: List[str] = []
+        for start in starts:
+            if start not in chunks:
+                break
+            pages.extend(chunks[start])
+
+        return PDFExtractionResult(
+            text=_join_pages(pages, char_budget),
+            page_count=page_count,
+            pages_extracted=len(pages),
+            timed_out=timed_out,
+            truncated=page_count > max_pages and len(pages) == max_pages,
+            budget_reached=len(pages) < wanted and _budget_covered(pages, char_budget),
+            errors=errors,
+        )
+
+    def _collect_parallel(self, pdf_bytes, starts, wanted, deadline, fast, chunks, errors) -> Set[Future]:
+        futures = {
+            self._submit(_extract_page_range, pdf_bytes, start, min(start + self.pages_per_task, wanted), None, fast): start
+            for start in starts
+        }
+        pending = set(futures)
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    chunks[futures[future]] = future.result()[1]
+                except Exception as e:
+                    errors.append(f"pages {futures[future]}+: {e}")
+        return pending
+
+    def _collect_budgeted(self, pdf_bytes, starts, wanted, deadline, char_budget, fast, chunks, errors) -> Set[Future]:
+        # Ranges run one after another with the remaining budget so unneeded pages are never parsed
+        collected = sum(len(text) + 1 for text in chunks[0])
+        for start in starts:
+            if collected >= char_budget:
+                return set()
+            future = self._submit(
+                _extract_page_range, pdf_bytes, start, min(start + self.pages_per_task, wanted),
+                char_budget - collected, fast,
+            )
+            try:
+                chunks[start] = future.result(timeout=max(0.0, deadline - time.monotonic()))[1]
+            except TimeoutError:
+                return {future}
+            except Exception as e:
+                errors.append(f"pages {start}+: {e}")
+                return set()
+            collected += sum(len(text) + 1 for text in chunks[start])
+        return set()
+
+    # ---------- metrics ----------
+    def _bump(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                **self._stats,
+                "maxWorkers": self.max_workers,
+                "maxBytes": self.max_bytes,
+                "maxPages": self.max_pages,
+                "timeoutSeconds": self.timeout,
+                "poolActive": self._pool is not None,
+            }
+
+
+_extractor: Optional[PDFExtractor] = None
+_extractor_lock = threading.Lock()
+
+
+def get_pdf_extractor(**kwargs) -> PDFExtractor:
+    """Process-wide extractor; kwargs only apply on first call (same pattern as get_llm_executor)."""
+    global _extractor
+    with _extractor_lock:
+        if _extractor is None:
+            _extractor = PDFExtractor(**kwargs)
+        return _extractor
@@ -4,8 +4,18 @@
 # Fallback: Scikit-Learn TF-IDF Vectorizer + Cosine Similarity (<5MB RAM)
 
 import gc
+import hashlib
+import json
 import logging
-from typing import Optional, List, Dict, Any
+import mmap
+import os
+import shutil
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +31,16 @@ try:
 except ImportError:
     pass
 
+try:
+    from langchain_core.embeddings import Embeddings
+except ImportError:
+    Embeddings = object
+
+try:
+    from backend.embedding_cache import get_embedding_cache
+except ImportError:
+    from embedding_cache import get_embedding_cache
+
 try:
     from langchain_community.vectorstores import FAISS
     from langchain_huggingface import HuggingFaceEmbeddings
@@ -29,12 +49,140 @@ except ImportError:
     pass
 
 try:
+    import numpy as np
+    from scipy import sparse
     from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
     _tfidf_available = True
 except ImportError:
     pass
 
+# Files of a persisted index (see ResumeRAGEngine.save)
+_META_FILE = "meta.json"
+_CHUNKS_FILE = "chunks.bin"
+_CHUNK_OFFSETS_FILE = "chunk_offsets.npy"
+_FAISS_FILE = "index.faiss"
+_TFIDF_VOCAB_FILE = "tfidf_vocab.json"
+_TFIDF_ARRAYS = ("idf", "data", "indices", "indptr")
+
+
+def _is_mapped(array) -> bool:
+    """True if ``array`` (or the array it views) lives in a memory-mapped file, not the heap."""
+    while array is not None:
+        if isinstance(array, (np.memmap, mmap.mmap)):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+
+class _MappedChunks:
+    """Read-only chunk list over a memory-mapped UTF-8 blob; chunks are decoded on access."""
+
+    def __init__(self, blob, offsets):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, idx: int) -> str:
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(idx)
+        return bytes(self._blob[self._offsets[idx]:self._offsets[idx + 1]]).decode("utf-8")
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+class _CachedEmbeddings(Embeddings):
+    """Embeddings whose document vectors come from the embedding cache when a chunk was seen before."""
+
+    def __init__(self, inner, model_name: str = EMBEDDING_MODEL_NAME):
+        self.inner = inner
+        self.model_name = model_name
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return get_embedding_cache().embed_many(self.model_name, texts, self.inner.embed_documents)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.inner.embed_query(text)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Batch query embedding; questions bypass the cache (they rarely repeat)."""
+        return self.inner.embed_documents(texts)
+
+
+# One embeddings model per process, shared by every user's index
+_embeddings_model = None
+_embeddings_lock = threading.Lock()
+
+
+def _shared_embeddings():
+    """Lazy load HuggingFace Embeddings on demand (once per process); None if unavailable."""
+    global _embeddings_model
+    if _embeddings_model is not None or not _huggingface_available:
+        return _embeddings_model
+    with _embeddings_lock:
+        if _embeddings_model is None:
+            try:
+                logger.info("Lazy-loading HuggingFace all-MiniLM-L6-v2 embeddings...")
+                _embeddings_model = _CachedEmbeddings(HuggingFaceEmbeddings(
+                    model_name=EMBEDDING_MODEL_NAME,
+                    model_kwargs={"device": "cpu"},
+                    encode_kwargs={"normalize_embeddings": True}
+                ))
+            except Exception as e:
+                logger.warning(f"Failed to load HuggingFace embeddings (RAM limit?): {e}. Falling back to TF-IDF engine.")
+    return _embeddings_model
+
+
+def _split_text(text: str) -> List[str]:
+    """Chunk a document (one pass of the splitter)."""
+    if _langchain_available:
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=500,
+            chunk_overlap=50,
+            separators=["\n\n", "\n", ". ", " ", ""]
+        )
+        return splitter.split_text(text)
+    # Simple fallback splitter
+    paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
+    return paragraphs if paragraphs else [text[i:i+500] for i in range(0, len(text), 450)]
+
+
+# Background TF-IDF refits/compactions, one at a time per process
+_compaction_pool: Optional[ThreadPoolExecutor] = None
+_compaction_pool_lock = threading.Lock()
+
+
+def _compaction_executor() -> ThreadPoolExecutor:
+    global _compaction_pool
+    with _compaction_pool_lock:
+        if _compaction_pool is None:
+            _compaction_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rag-compact")
+        return _compaction_pool
+
+
+def _load_faiss_store(index_path: str, embeddings, chunks, chunk_ids, sources):
+    """LangChain FAISS store over a memory-mapped index file (rows = live chunks); returns (store, mapped)."""
+    import faiss
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+
+    try:
+        index, mapped = faiss.read_index(index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY), True
+    except Exception:
+        index, mapped = faiss.read_index(index_path), False  # index type without mmap support
+    docstore = InMemoryDocstore({
+        chunk_id: Document(page_content=chunk, metadata={"source": source})
+        for chunk_id, chunk, source in zip(chunk_ids, chunks, sources)
+    })
+    store = FAISS(embeddings, index, docstore, dict(enumerate(chunk_ids)))
+    return store, mapped
+
 
 class ResumeRAGEngine:
     """
@@ -43,15 +191,30 @@ class ResumeRAGEngine:
     Features:
       - Lazy Loading: Embeddings model is loaded only on first query/ingest
       - Dual Vector Engine: Tries FAISS+HuggingFace first; falls back to lightweight TF-IDF (<5MB RAM)
+      - Incremental: documents are appended under stable chunk IDs ("<document id>:<n>"); new TF-IDF
+        rows use the current vocabulary, and once appended/deleted rows pass ``compact_threshold``
+        of the index a background compaction refits the vocabulary and drops deleted rows
       - Explicit GC: Clears memory pools after operations to prevent memory leaks
     """
 
-    def __init__(self):
+    def __init__(self, compact_threshold: float = 0.3):
         self.vector_store = None
         self.embeddings = None
-        self.chunk_count = 0
+        self.chunk_count = 0  # live chunks
+        self.compact_threshold = compact_threshold
+        self.on_compacted = None  # optional callback(engine) after a background compaction
         self._mode = "uninitialized"  # "faiss" or "tfidf"
+        # Row-aligned lists; deleted rows stay until compaction. _MappedChunks after load()
         self._raw_chunks: List[str] = []
+        self._chunk_ids: List[str] = []
+        self._sources: List[str] = []
+        self._deleted: set = set()  # row positions
+        self._documents: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # id -> source, hash, chunkIds
+        self._stale_rows = 0  # TF-IDF rows transformed with a vocabulary fitted without them
+        self._generation = 0  # bumped by every write; compaction discards its work if it moved
+        self._compaction = None
+        self._lock = threading.RLock()
+        self._faiss_mapped = False
         self._tfidf_vectorizer = None
         self._tfidf_matrix = None
 
@@ -64,86 +227,290 @@ class ResumeRAGEngine:
         return self.chunk_count > 0
 
     def _init_embeddings(self) -> bool:
-        """Lazy load HuggingFace Embeddings on demand."""
-        if self.embeddings is not None:
-            return True
-        if not _huggingface_available:
+        """Attach the process-wide embeddings model (loaded on first use)."""
+        if self.embeddings is None:
+            self.embeddings = _shared_embeddings()
+        return self.embeddings is not None
+
+    def memory_bytes(self) -> int:
+        """Approximate heap held by this index (chunk text, vectors, TF-IDF matrix and vocabulary)."""
+        # Memory-mapped chunks and arrays live in the shared page cache and are not counted
+        chunk_bytes = 0 if isinstance(self._raw_chunks, _MappedChunks) else sum(sys.getsizeof(c) for c in self._raw_chunks)
+        total = chunk_bytes
+        if self.vector_store is not None:
+            index = getattr(self.vector_store, "index", None)
+            if index is not None and not self._faiss_mapped:
+                total += int(index.ntotal) * int(index.d) * 4
+            # The docstore holds a second copy of every chunk
+            total += sum(sys.getsizeof(chunk) for chunk in self._raw_chunks)
+        if self._tfidf_matrix is not None:
+            matrix = self._tfidf_matrix
+            total += sum(a.nbytes for a in (matrix.data, matrix.indices, matrix.indptr) if not _is_mapped(a))
+        if self._tfidf_vectorizer is not None:
+            vocabulary = getattr(self._tfidf_vectorizer, "vocabulary_", {})
+            total += sum(sys.getsizeof(term) + 32 for term in vocabulary)
+            idf = getattr(self._tfidf_vectorizer, "idf_", None)
+            total += idf.nbytes if idf is not None and not _is_mapped(idf) else 0
+        return total
+
+    def _live_rows(self) -> List[int]:
+        return [i for i in range(len(self._raw_chunks)) if i not in self._deleted]
+
+    def _make_writable(self) -> None:
+        """Copy memory-mapped state into the heap before it is modified."""
+        if isinstance(self._raw_chunks, _MappedChunks):
+            self._raw_chunks = list(self._raw_chunks)
+        if self._faiss_mapped and self.vector_store is not None:
+            import faiss
+            self.vector_store.index = faiss.clone_index(self.vector_store.index)
+            self._faiss_mapped = False
+
+    def _compact_rows(self, live: List[int]) -> None:
+        self._make_writable()
+        self._raw_chunks = [self._raw_chunks[i] for i in live]
+        self._chunk_ids = [self._chunk_ids[i] for i in live]
+        self._sources = [self._sources[i] for i in live]
+        self._deleted = set()
+
+    def _refit_tfidf(self) -> None:
+        """Synchronous fit on the live rows (first document, or FAISS gave up)."""
+        self._compact_rows(self._live_rows())
+        self._tfidf_vectorizer = TfidfVectorizer(stop_words='english')
+        self._tfidf_matrix = self._tfidf_vectorizer.fit_transform(self._raw_chunks)
+        self._stale_rows = 0
+
+    def _delete_rows(self, document_id: str) -> int:
+        """Tombstone a document's rows (and drop its FAISS vectors); returns rows removed."""
+        chunk_ids = set(self._documents.pop(document_id)["chunkIds"])
+        rows = [i for i, chunk_id in enumerate(self._chunk_ids) if chunk_id in chunk_ids and i not in self._deleted]
+        if self.vector_store is not None:
+            self._make_writable()
+            self.vector_store.delete(list(chunk_ids))
+        self._deleted.update(rows)
+        self.chunk_count -= len(rows)
+        return len(rows)
+
+    def _maybe_compact(self) -> None:
+        rows = len(self._raw_chunks)
+        drift = (self._stale_rows + len(self._deleted)) / max(1, rows)
+        if drift <= self.compact_threshold or (self._compaction is not None and not self._compaction.done()):
+            return
+        logger.info(f"rag.compaction_scheduled rows={rows} stale={self._stale_rows} deleted={len(self._deleted)}")
+        self._compaction = _compaction_executor().submit(self.compact)
+
+    def compact(self) -> dict:
+        """
+        Drop deleted rows and, in TF-IDF mode, refit the vocabulary on the live chunks.
+        The fit runs outside the lock; if the index changed meanwhile the work is discarded
+        and the next write schedules another compaction.
+        """
+        with self._lock:
+            generation = self._generation
+            live = self._live_rows()
+            texts = [self._raw_chunks[i] for i in live]
+            refit = self._mode == "tfidf" and _tfidf_available and bool(texts)
+        vectorizer = matrix = None
+        if refit:
+            vectorizer = TfidfVectorizer(stop_words='english')
+            matrix = vectorizer.fit_transform(texts)
+        with self._lock:
+            if self._generation != generation:
+                logger.info("rag.compaction_skipped reason=concurrent_write")
+                return {"success": False, "error": "Index changed during compaction."}
+            dropped = len(self._raw_chunks) - len(live)
+            self._compact_rows(live)
+            if refit:
+                self._tfidf_vectorizer, self._tfidf_matrix = vectorizer, matrix
+                self._stale_rows = 0
+            self._generation += 1
+        logger.info(f"rag.compacted rows={len(live)} dropped={dropped} refit={refit}")
+        if self.on_compacted is not None:
+            try:
+                self.on_compacted(self)
+            except Exception as e:
+                logger.warning(f"rag.compaction_callback_failed error={e}")
+        return {"success": True, "rows": len(live), "dropped": dropped, "refit": refit}
+
+    def save(self, path: str) -> None:
+        """
+        Write the index to directory ``path``: chunk text as one UTF-8 blob plus offsets, the FAISS
+        index, and the TF-IDF vocabulary, idf and CSR arrays as .npy files. The directory is built
+        aside and swapped in, so readers never see a half-written index.
+        """
+        with self._lock:
+            if not self.is_indexed:
+                raise ValueError("Nothing to save: index is empty.")
+            tmp = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+            shutil.rmtree(tmp, ignore_errors=True)
+            os.makedirs(tmp)
+            encoded = [chunk.encode("utf-8") for chunk in self._raw_chunks]
+            with open(os.path.join(tmp, _CHUNKS_FILE), "wb") as f:
+                f.write(b"".join(encoded))
+            np.save(os.path.join(tmp, _CHUNK_OFFSETS_FILE), np.cumsum([0] + [len(b) for b in encoded], dtype=np.int64))
+
+            meta = {
+                "mode": self._mode,
+                "chunk_ids": list(self._chunk_ids),
+                "sources": list(self._sources),
+                "deleted": sorted(self._deleted),
+                "documents": self._documents,
+                "stale_rows": self._stale_rows,
+                "faiss": False,
+                "tfidf": None,
+            }
+            if self._mode == "faiss" and self.vector_store is not None:
+                import faiss
+                faiss.write_index(self.vector_store.index, os.path.join(tmp, _FAISS_FILE))
+                meta["faiss"] = True
+            if self._tfidf_matrix is not None and self._tfidf_vectorizer is not None:
+                matrix = self._tfidf_matrix.tocsr()
+                arrays = {"idf": self._tfidf_vectorizer.idf_, "data": matrix.data, "indices": matrix.indices, "indptr": matrix.indptr}
+                for name in _TFIDF_ARRAYS:
+                    np.save(os.path.join(tmp, f"tfidf_{name}.npy"), np.asarray(arrays[name]))
+                with open(os.path.join(tmp, _TFIDF_VOCAB_FILE), "w", encoding="utf-8") as f:
+                    json.dump({term: int(col) for term, col in self._tfidf_vectorizer.vocabulary_.items()}, f)
+                meta["tfidf"] = {"shape": list(matrix.shape)}
+            with open(os.path.join(tmp, _META_FILE), "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+
+            # Open mmaps of the old files stay valid after it is removed
+            old = f"{path}.old-{os.getpid()}-{threading.get_ident()}"
+            if os.path.isdir(path):
+                os.rename(path, old)
+            os.rename(tmp, path)
+            shutil.rmtree(old, ignore_errors=True)
+
+    def reopen(self, path: str) -> bool:
+        """Replace this index's state with the one saved at ``path``, memory-mapping its arrays."""
+        meta_path = os.path.join(path, _META_FILE)
+        if not os.path.exists(meta_path):
             return False
-
-        try:
-            logger.info("Lazy-loading HuggingFace all-MiniLM-L6-v2 embeddings...")
-            self.embeddings = HuggingFaceEmbeddings(
-                model_name="all-MiniLM-L6-v2",
-                model_kwargs={"device": "cpu"},
-                encode_kwargs={"normalize_embeddings": True}
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        offsets = np.load(os.path.join(path, _CHUNK_OFFSETS_FILE), mmap_mode="r")
+        blob = np.memmap(os.path.join(path, _CHUNKS_FILE), dtype=np.uint8, mode="r") if offsets[-1] else b""
+        chunks = _MappedChunks(blob, offsets)
+        rows = len(chunks)
+
+        vectorizer = matrix = None
+        if meta.get("tfidf") and _tfidf_available:
+            arrays = {name: np.load(os.path.join(path, f"tfidf_{name}.npy"), mmap_mode="r") for name in _TFIDF_ARRAYS}
+            with open(os.path.join(path, _TFIDF_VOCAB_FILE), encoding="utf-8") as f:
+                vocabulary = json.load(f)
+            vectorizer = TfidfVectorizer(stop_words='english')
+            vectorizer.vocabulary_ = vocabulary
+            vectorizer.idf_ = arrays["idf"]
+            matrix = sparse.csr_matrix(
+                (arrays["data"], arrays["indices"], arrays["indptr"]), shape=tuple(meta["tfidf"]["shape"]), copy=False
             )
-            return True
-        except Exception as e:
-            logger.warning(f"Failed to load HuggingFace embeddings (RAM limit?): {e}. Falling back to TF-IDF engine.")
-            self.embeddings = None
-            return False
 
-    def ingest_text(self, text: str, source_label: str = "resume") -> dict:
+        with self._lock:
+            self._raw_chunks = chunks
+            self._chunk_ids = list(meta.get("chunk_ids") or [str(i) for i in range(rows)])
+            self._sources = list(meta.get("sources") or ["resume"] * rows)
+            self._deleted = set(meta.get("deleted") or [])
+            self._documents = OrderedDict(meta.get("documents") or {})
+            self._stale_rows = int(meta.get("stale_rows") or 0)
+            self.chunk_count = rows - len(self._deleted)
+            self._tfidf_vectorizer, self._tfidf_matrix = vectorizer, matrix
+            self.vector_store, self._faiss_mapped = None, False
+            self._mode = "tfidf" if matrix is not None else "raw"
+            if meta.get("faiss") and _huggingface_available and self._init_embeddings():
+                live = self._live_rows()
+                try:
+                    self.vector_store, self._faiss_mapped = _load_faiss_store(
+                        os.path.join(path, _FAISS_FILE), self.embeddings,
+                        [chunks[i] for i in live], [self._chunk_ids[i] for i in live], [self._sources[i] for i in live],
+                    )
+                    self._mode = "faiss"
+                except Exception as e:
+                    logger.warning(f"rag.faiss_load_failed path={path} error={e}")
+            self._generation += 1
+        return True
+
+    @classmethod
+    def load(cls, path: str) -> Optional["ResumeRAGEngine"]:
+        """Reopen an index written by save(), memory-mapping its arrays; None if ``path`` holds none."""
+        engine = cls()
+        return engine if engine.reopen(path) else None
+
+    def ingest_text(self, text: str, source_label: str = "resume", document_id: Optional[str] = None) -> dict:
         """
-        Chunk raw text and store in vector index.
+        Chunk raw text and append it to the vector index.
         Uses FAISS+HuggingFace if RAM permits, otherwise TF-IDF.
+        ``document_id`` defaults to a hash of the text, so re-ingesting a document is a no-op;
+        ingesting different text under an existing ID replaces that document.
         """
         if not text or not text.strip():
             return {"success": False, "error": "Empty text provided."}
 
         try:
-            # 1. Chunk document
-            if _langchain_available:
-                splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=500,
-                    chunk_overlap=50,
-                    separators=["\n\n", "\n", ". ", " ", ""]
-                )
-                chunk_objs = splitter.create_documents(
-                    texts=[text],
-                    metadatas=[{"source": source_label}] * len(splitter.split_text(text))
-                )
-                chunks_text = [doc.page_content for doc in chunk_objs]
-            else:
-                # Simple fallback splitter
-                paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
-                chunks_text = paragraphs if paragraphs else [text[i:i+500] for i in range(0, len(text), 450)]
-
-            if not chunks_text:
-                return {"success": False, "error": "No chunks generated from document."}
-
-            self._raw_chunks = chunks_text
-            self.chunk_count = len(chunks_text)
-
-            # 2. Try FAISS Vector Store first
-            faiss_success = False
-            if _huggingface_available and self._init_embeddings():
-                try:
-                    if _langchain_available:
-                        docs = [Document(page_content=c, metadata={"source": source_label}) for c in chunks_text]
+            with self._lock:
+                content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+                document_id = document_id or content_hash
+                existing = self._documents.get(document_id)
+                if existing is not None and existing["hash"] == content_hash:
+                    return {
+                        "success": True,
+                        "document_id": document_id,
+                        "chunk_ids": existing["chunkIds"],
+                        "chunks_indexed": 0,
+                        "total_chunks": self.chunk_count,
+                        "engine_mode": self._mode,
+                        "message": "Document already indexed."
+                    }
+
+                # 1. Chunk document
+                chunks_text = _split_text(text)
+                if not chunks_text:
+                    return {"success": False, "error": "No chunks generated from document."}
+                if existing is not None:
+                    self._delete_rows(document_id)  # new version of the document
+
+                chunk_ids = [f"{document_id}:{i}" for i in range(len(chunks_text))]
+                self._make_writable()
+                self._raw_chunks.extend(chunks_text)
+                self._chunk_ids.extend(chunk_ids)
+                self._sources.extend([source_label] * len(chunks_text))
+                self._documents[document_id] = {"source": source_label, "hash": content_hash, "chunkIds": chunk_ids}
+                self.chunk_count += len(chunks_text)
+                self._generation += 1
+
+                # 2. Try FAISS Vector Store first (appends vectors under the chunk IDs)
+                faiss_success = False
+                if self._mode in ("uninitialized", "faiss") and _huggingface_available and self._init_embeddings():
+                    try:
+                        metadatas = [{"source": source_label}] * len(chunks_text)
                         if self.vector_store is None:
-                            self.vector_store = FAISS.from_documents(docs, self.embeddings)
+                            self.vector_store = FAISS.from_texts(chunks_text, self.embeddings, metadatas=metadatas, ids=chunk_ids)
                         else:
-                            self.vector_store.merge_from(FAISS.from_documents(docs, self.embeddings))
+                            self.vector_store.add_texts(chunks_text, metadatas=metadatas, ids=chunk_ids)
                         self._mode = "faiss"
                         faiss_success = True
-                except Exception as faiss_err:
-                    logger.warning(f"FAISS indexing error: {faiss_err}. Reverting to TF-IDF.")
-                    self.vector_store = None
-
-            # 3. TF-IDF Fallback (<5MB RAM footprint)
-            if not faiss_success:
-                if _tfidf_available:
-                    self._tfidf_vectorizer = TfidfVectorizer(stop_words='english')
-                    self._tfidf_matrix = self._tfidf_vectorizer.fit_transform(self._raw_chunks)
-                    self._mode = "tfidf"
-                else:
-                    self._mode = "raw"
+                    except Exception as faiss_err:
+                        logger.warning(f"FAISS indexing error: {faiss_err}. Reverting to TF-IDF.")
+                        self.vector_store = None
+
+                # 3. TF-IDF Fallback (<5MB RAM footprint): new rows use the current vocabulary
+                if not faiss_success:
+                    if _tfidf_available:
+                        if self._mode == "tfidf" and self._tfidf_vectorizer is not None:
+                            rows = self._tfidf_vectorizer.transform(chunks_text)
+                            self._tfidf_matrix = sparse.vstack([self._tfidf_matrix, rows], format="csr")
+                            self._stale_rows += len(chunks_text)
+                        else:
+                            self._refit_tfidf()
+                        self._mode = "tfidf"
+                    else:
+                        self._mode = "raw"
+                self._maybe_compact()
 
             gc.collect()  # Release transient objects from RAM
 
             return {
                 "success": True,
+                "document_id": document_id,
+                "chunk_ids": chunk_ids,
                 "chunks_indexed": len(chunks_text),
                 "total_chunks": self.chunk_count,
                 "engine_mode": self._mode,
@@ -154,6 +521,120 @@ class ResumeRAGEngine:
             logger.error(f"RAG ingest error: {e}")
             return {"success": False, "error": f"Indexing failed: {str(e)}"}
 
+    def delete_document(self, document_id: str) -> dict:
+        """Remove one document's chunks; TF-IDF rows are dropped by the next compaction."""
+        with self._lock:
+            if document_id not in self._documents:
+                return {"success": False, "error": "Document not found."}
+            removed = self._delete_rows(document_id)
+            self._generation += 1
+            self._maybe_compact()
+        return {"success": True, "document_id": document_id, "chunks_deleted": removed, "total_chunks": self.chunk_count}
+
+    def documents(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {"document_id": doc_id, "source": doc["source"], "chunks": len(doc["chunkIds"])}
+                for doc_id, doc in self._documents.items()
+            ]
+
+    def _faiss_search_many(self, questions: List[str], top_k: int) -> List[List[Dict[str, Any]]]:
+        """All questions embedded in one call and searched in one FAISS batch."""
+        if hasattr(self.embeddings, "embed_queries"):
+            vectors = self.embeddings.embed_queries(questions)
+        else:
+            vectors = [self.embeddings.embed_query(q) for q in questions]
+        index = self.vector_store.index
+        distances, rows = index.search(np.asarray(vectors, dtype=np.float32), min(top_k, int(index.ntotal)))
+        results = []
+        for row_distances, row_ids in zip(distances, rows):
+            chunks = []
+            for distance, row in zip(row_distances, row_ids):
+                if row < 0:
+                    continue
+                doc = self.vector_store.docstore.search(self.vector_store.index_to_docstore_id[int(row)])
+                chunks.append({
+                    "content": doc.page_content,
+                    "source": doc.metadata.get("source", "resume"),
+                    "relevance_score": round(float(max(0.0, 1.0 - distance)), 3)
+                })
+            results.append(chunks)
+        return results
+
+    def _tfidf_search_many(self, questions: List[str], top_k: int) -> List[List[Dict[str, Any]]]:
+        """One sparse product for every question, then argpartition for each row's top-k."""
+        q_matrix = self._tfidf_vectorizer.transform(questions)
+        # TF-IDF rows are L2-normalised, so the dot product is the cosine similarity
+        scores = (q_matrix @ self._tfidf_matrix.T).toarray()
+        if self._deleted:
+            scores[:, sorted(self._deleted)] = -1.0
+        k = min(top_k, scores.shape[1])
+        if k <= 0:
+            return [[] for _ in questions]
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row_scores, candidates in zip(scores, top):
+            chunks = []
+            for idx in candidates[np.argsort(-row_scores[candidates], kind="stable")]:
+                score = float(row_scores[idx])
+                if idx in self._deleted:
+                    continue
+                if score > 0.0 or not chunks:  # Include top match
+                    chunks.append({
+                        "content": self._raw_chunks[idx],
+                        "source": self._sources[idx],
+                        "relevance_score": round(score, 3)
+                    })
+            results.append(chunks)
+        return results
+
+    def _keyword_search(self, question: str, top_k: int) -> List[Dict[str, Any]]:
+        words = set(question.lower().split())
+        scored = []
+        for idx in self._live_rows():
+            chunk = self._raw_chunks[idx]
+            score = sum(1 for w in words if w in chunk.lower())
+            scored.append((score, idx))
+        scored.sort(key=lambda x: x[0], reverse=True)
+        return [{
+            "content": self._raw_chunks[idx],
+            "source": self._sources[idx],
+            "relevance_score": round(min(1.0, score / max(1, len(words))), 3)
+        } for score, idx in scored[:top_k]]
+
+    def _retrieve_many(self, questions: List[str], top_k: int) -> List[List[Dict[str, Any]]]:
+        results: List[List[Dict[str, Any]]] = [[] for _ in questions]
+        with self._lock:
+            # 1. FAISS Mode
+            if self._mode == "faiss" and self.vector_store is not None:
+                try:
+                    results = self._faiss_search_many(questions, top_k)
+                except Exception as query_err:
+                    logger.warning(f"FAISS query error: {query_err}. Switching to TF-IDF search.")
+                    self._mode = "tfidf"
+
+            # 2. TF-IDF Mode (Fast, low-RAM cosine similarity search)
+            pending = [i for i, chunks in enumerate(results) if not chunks]
+            if pending and _tfidf_available and self._tfidf_matrix is not None:
+                found = self._tfidf_search_many([questions[i] for i in pending], top_k)
+                for i, chunks in zip(pending, found):
+                    results[i] = chunks
+
+            # 3. Simple Keyword Search Mode (Last resort fallback)
+            for i, chunks in enumerate(results):
+                if not chunks and self._raw_chunks:
+                    results[i] = self._keyword_search(questions[i], top_k)
+        return results
+
+    @staticmethod
+    def _query_result(question: str, retrieved_chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "question": question,
+            "retrieved_chunks": retrieved_chunks,
+            "context": "\n\n---\n\n".join([c["content"] for c in retrieved_chunks]),
+            "chunks_retrieved": len(retrieved_chunks),
+        }
+
     def query(self, question: str, top_k: int = 3) -> dict:
         """
         Semantic/Cosine similarity search over indexed chunks.
@@ -164,66 +645,36 @@ class ResumeRAGEngine:
             return {"success": False, "error": "Question cannot be empty."}
 
         try:
-            retrieved_chunks = []
-
-            # 1. FAISS Mode
-            if self._mode == "faiss" and self.vector_store is not None:
-                try:
-                    docs_with_scores = self.vector_store.similarity_search_with_score(question, k=top_k)
-                    for doc, score in docs_with_scores:
-                        retrieved_chunks.append({
-                            "content": doc.page_content,
-                            "source": doc.metadata.get("source", "resume"),
-                            "relevance_score": round(float(max(0.0, 1.0 - score)), 3)
-                        })
-                except Exception as query_err:
-                    logger.warning(f"FAISS query error: {query_err}. Switching to TF-IDF search.")
-                    self._mode = "tfidf"
+            retrieved_chunks = self._retrieve_many([question], top_k)[0]
+            gc.collect()
+            return {"success": True, **self._query_result(question, retrieved_chunks), "engine_mode": self._mode}
 
-            # 2. TF-IDF Mode (Fast, low-RAM cosine similarity search)
-            if (self._mode == "tfidf" or not retrieved_chunks) and _tfidf_available and self._tfidf_matrix is not None:
-                q_vec = self._tfidf_vectorizer.transform([question])
-                sim_scores = cosine_similarity(q_vec, self._tfidf_matrix).flatten()
-                top_indices = sim_scores.argsort()[-top_k:][::-1]
-
-                for idx in top_indices:
-                    score = float(sim_scores[idx])
-                    if score > 0.0 or len(retrieved_chunks) < 1:  # Include top match
-                        retrieved_chunks.append({
-                            "content": self._raw_chunks[idx],
-                            "source": "resume",
-                            "relevance_score": round(score, 3)
-                        })
+        except Exception as e:
+            logger.error(f"RAG query error: {e}")
+            return {"success": False, "error": f"Query failed: {str(e)}"}
 
-            # 3. Simple Keyword Search Mode (Last resort fallback)
-            if not retrieved_chunks and self._raw_chunks:
-                words = set(question.lower().split())
-                scored = []
-                for chunk in self._raw_chunks:
-                    score = sum(1 for w in words if w in chunk.lower())
-                    scored.append((score, chunk))
-                scored.sort(key=lambda x: x[0], reverse=True)
-                for score, chunk in scored[:top_k]:
-                    retrieved_chunks.append({
-                        "content": chunk,
-                        "source": "resume",
-                        "relevance_score": round(min(1.0, score / max(1, len(words))), 3)
-                    })
+    def query_many(self, questions: List[str], top_k: int = 3) -> dict:
+        """
+        query() for a batch of questions: one embedding/transform call and one similarity
+        matrix product for the whole batch. Results keep the order of ``questions``.
+        """
+        if not self.is_indexed:
+            return {"success": False, "error": "No document indexed yet. Please upload a resume first."}
+        if not questions or any(not q or not q.strip() for q in questions):
+            return {"success": False, "error": "Questions cannot be empty."}
 
-            context = "\n\n---\n\n".join([c["content"] for c in retrieved_chunks])
+        try:
+            retrieved = self._retrieve_many(list(questions), top_k)
             gc.collect()
-
             return {
                 "success": True,
-                "question": question,
-                "retrieved_chunks": retrieved_chunks,
-                "context": context,
-                "chunks_retrieved": len(retrieved_chunks),
+                "results": [self._query_result(q, chunks) for q, chunks in zip(questions, retrieved)],
+                "questions": len(questions),
                 "engine_mode": self._mode
             }
 
         except Exception as e:
-            logger.error(f"RAG query error: {e}")
+            logger.error(f"RAG batch query error: {e}")
             return {"success": False, "error": f"Query failed: {str(e)}"}
 
     def build_grounded_prompt(self, question: str, job_description: str = "") -> dict:
@@ -257,12 +708,20 @@ Answer (grounded strictly in the resume context above):"""
 
     def clear(self) -> dict:
         """Clear indices and run garbage collection."""
-        self.vector_store = None
-        self.chunk_count = 0
-        self._raw_chunks = []
-        self._tfidf_vectorizer = None
-        self._tfidf_matrix = None
-        self._mode = "uninitialized"
+        with self._lock:
+            self.vector_store = None
+            self.chunk_count = 0
+            self._raw_chunks = []
+            self._chunk_ids = []
+            self._sources = []
+            self._deleted = set()
+            self._documents = OrderedDict()
+            self._stale_rows = 0
+            self._generation += 1
+            self._faiss_mapped = False
+            self._tfidf_vectorizer = None
+            self._tfidf_matrix = None
+            self._mode = "uninitialized"
         gc.collect()
         logger.info("RAG engine cleared and RAM garbage collected.")
         return {"success": True, "message": "Vector store cleared."}
@@ -275,10 +734,199 @@ Answer (grounded strictly in the resume context above):"""
             "chunks_indexed": self.chunk_count,
             "mode": self._mode,
             "embeddings_model": "all-MiniLM-L6-v2 (lazy-loaded)" if _huggingface_available else "TF-IDF (low-memory)",
-            "vector_store": self._mode.upper() if self.is_indexed else "empty"
+            "vector_store": self._mode.upper() if self.is_indexed else "empty",
+            "memory_bytes": self.memory_bytes(),
+            "documents": self.documents(),
+            "deleted_rows": len(self._deleted),
+            "stale_rows": self._stale_rows,
+            "compaction_pending": self._compaction is not None and not self._compaction.done(),
         }
 
 
+class RAGIndexRegistry:
+    """
+    One ResumeRAGEngine per user/session key, kept within a memory budget.
+
+    Features:
+      - LRU: every ingest/lookup marks the key most recently used
+      - Budget: after an ingest, least recently used indexes are evicted until the resident
+        footprint (ResumeRAGEngine.memory_bytes) fits ``memory_budget_bytes``; the index just
+        used is never evicted
+      - Persistence: with ``persist_dir`` every ingest, delete and background compaction saves the
+        index there (ResumeRAGEngine.save) and reopens it memory-mapped, so evictions, restarts and
+        other workers reload it from disk instead of re-embedding
+      - Transparent rebuild: without ``persist_dir`` the source documents of every key are kept,
+        so an evicted index is re-ingested on its next lookup
+    """
+
+    def __init__(self, memory_budget_bytes: int = 128 * 1024 * 1024, persist_dir: Optional[str] = None):
+        self.memory_budget_bytes = max(0, int(memory_budget_bytes))
+        self.persist_dir = persist_dir if persist_dir and _tfidf_available else None  # .npy files need numpy
+        if self.persist_dir:
+            os.makedirs(self.persist_dir, exist_ok=True)
+        self._engines: "OrderedDict[str, ResumeRAGEngine]" = OrderedDict()
+        self._footprints: Dict[str, int] = {}
+        self._documents: Dict[str, "OrderedDict[str, Tuple[str, str]]"] = {}  # key -> id -> (text, source_label)
+        # _lock guards the maps above and is only held for lookups, admission and eviction. Loading,
+        # ingesting and saving one key run under that key's stripe lock (and the engine's own lock),
+        # so one user's ingest never blocks another user's query.
+        self._lock = threading.RLock()
+        self._key_locks = [threading.RLock() for _ in range(64)]
+        self._stats = {"hits": 0, "loads": 0, "rebuilds": 0, "evictions": 0}
+
+    def _path(self, key: str) -> Optional[str]:
+        if not self.persist_dir:
+            return None
+        return os.path.join(self.persist_dir, hashlib.sha256(key.encode("utf-8")).hexdigest()[:32])
+
+    def _key_lock(self, key: str) -> threading.RLock:
+        return self._key_locks[int(hashlib.sha256(key.encode("utf-8")).hexdigest()[:8], 16) % len(self._key_locks)]
+
+    def _resident(self, key: str) -> Optional[ResumeRAGEngine]:
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is not None:
+                self._engines.move_to_end(key)
+                self._stats["hits"] += 1
+            return engine
+
+    def get(self, key: str) -> ResumeRAGEngine:
+        """The key's index; an empty, unregistered engine if nothing was ingested for it."""
+        engine = self._resident(key)
+        if engine is not None:
+            return engine
+        with self._key_lock(key):
+            engine = self._resident(key)  # loaded by another thread while we waited
+            if engine is not None:
+                return engine
+            path = self._path(key)
+            if path:
+                started = time.perf_counter()
+                engine = ResumeRAGEngine.load(path)
+                if engine is not None:
+                    logger.info(f"rag.index_loaded key={key} ms={round((time.perf_counter() - started) * 1000, 2)}")
+                    with self._lock:
+                        self._stats["loads"] += 1
+                        self._admit(key, engine)
+                    return engine
+            with self._lock:
+                documents = list(self._documents.get(key, {}).items())
+            if not documents:
+                return ResumeRAGEngine()
+            engine = ResumeRAGEngine()
+            for document_id, (text, source_label) in documents:
+                engine.ingest_text(text, source_label=source_label, document_id=document_id)
+            logger.info(f"rag.index_rebuilt key={key} documents={len(documents)}")
+            with self._lock:
+                self._stats["rebuilds"] += 1
+                self._admit(key, engine)
+            return engine
+
+    def ingest(self, key: str, text: str, source_label: str = "resume", document_id: Optional[str] = None) -> dict:
+        with self._key_lock(key):
+            engine = self.get(key)
+            result = engine.ingest_text(text, source_label=source_label, document_id=document_id)
+            if result.get("success") and result.get("chunks_indexed"):
+                saved = self._save(key, engine)
+                with self._lock:
+                    if not saved:
+                        self._documents.setdefault(key, OrderedDict())[result["document_id"]] = (text, source_label)
+                    self._admit(key, engine)
+            return result
+
+    def delete_document(self, key: str, document_id: str) -> dict:
+        with self._key_lock(key):
+            engine = self.get(key)
+            result = engine.delete_document(document_id)
+            if result.get("success"):
+                with self._lock:
+                    self._documents.get(key, {}).pop(document_id, None)
+                if engine.is_indexed:
+                    self._save(key, engine)
+                    with self._lock:
+                        self._admit(key, engine)
+                else:
+                    self.clear(key)
+            return result
+
+    def _save(self, key: str, engine: ResumeRAGEngine) -> bool:
+        """Persist ``engine`` and swap it to the memory-mapped files; False without persistence or on error."""
+        path = self._path(key)
+        if not path:
+            return False
+        try:
+            with engine._lock:
+                engine.save(path)
+                engine.reopen(path)
+            with self._lock:
+                self._documents.pop(key, None)
+            return True
+        except Exception as e:
+            logger.warning(f"rag.index_save_failed key={key} error={e} keeping=memory")
+            return False
+
+    def _compacted(self, key: str, engine: ResumeRAGEngine) -> None:
+        """Background compaction finished: persist it, unless the index was evicted or cleared meanwhile."""
+        with self._key_lock(key):
+            with self._lock:
+                if self._engines.get(key) is not engine:
+                    return
+            self._save(key, engine)
+            with self._lock:
+                if key in self._footprints:
+                    self._footprints[key] = engine.memory_bytes()
+
+    def clear(self, key: str) -> dict:
+        with self._key_lock(key):
+            with self._lock:
+                engine = self._engines.pop(key, None)
+                self._footprints.pop(key, None)
+                self._documents.pop(key, None)
+            path = self._path(key)
+            if path:
+                shutil.rmtree(path, ignore_errors=True)
+        if engine is not None:
+            return engine.clear()
+        return {"success": True, "message": "Vector store cleared."}
+
+    def _admit(self, key: str, engine: ResumeRAGEngine) -> None:
+        """
+        Register/re-measure ``key`` as most recently used, then evict LRU indexes over budget.
+        Evicted engines are only dropped (not cleared): a request still using one finishes normally.
+        """
+        self._engines[key] = engine
+        self._engines.move_to_end(key)
+        self._footprints[key] = engine.memory_bytes()
+        engine.on_compacted = lambda compacted, key=key: self._compacted(key, compacted)
+        while len(self._engines) > 1 and sum(self._footprints.values()) > self.memory_budget_bytes:
+            victim, victim_engine = next(iter(self._engines.items()))
+            if victim == key:
+                break
+            del self._engines[victim]
+            freed = self._footprints.pop(victim, 0)
+            victim_engine.on_compacted = None
+            self._stats["evictions"] += 1
+            logger.info(f"rag.index_evicted key={victim} freed_bytes={freed}")
+
+    def _known_count(self) -> int:
+        if not self.persist_dir:
+            return len(self._documents)
+        names = {os.path.basename(self._path(key)) for key in self._documents}
+        names.update(name for name in os.listdir(self.persist_dir) if "." not in name)
+        return len(names)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "residentIndexes": len(self._engines),
+                "knownIndexes": self._known_count(),
+                "residentBytes": sum(self._footprints.values()),
+                "budgetBytes": self.memory_budget_bytes,
+                "persistDir": self.persist_dir,
+                **self._stats,
+            }
+
+
 # Singleton instance
 _rag_instance: Optional[ResumeRAGEngine] = None
 
@@ -288,3 +936,17 @@ def get_rag_engine() -> ResumeRAGEngine:
     if _rag_instance is None:
         _rag_instance = ResumeRAGEngine()
     return _rag_instance
+
+
+_registry_instance: Optional[RAGIndexRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_rag_registry(**kwargs) -> RAGIndexRegistry:
+    """Process-wide per-user index registry; kwargs only apply on first call (same pattern as get_llm_executor)."""
+    global _registry_instance
+    if _registry_instance is None:
+        with _registry_lock:
+            if _registry_instance is None:
+                _registry_instance = RAGIndexRegistry(**kwargs)
+    return _registry_instance
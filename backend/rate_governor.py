@@ -0,0 +1,267 @@
+# RATE GOVERNOR: Outbound token buckets (requests/min and tokens/min) per provider and per tenant
+# Every provider call takes from its buckets before it is sent; batch work may not dip into the share
+# reserved for interactive users and is shed first, so a ranking job cannot starve /analyze.
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from backend.llm_executor import LLMRejectedError
+except ImportError:
+    from llm_executor import LLMRejectedError
+
+logger = logging.getLogger("resume_analyzer")
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+# Atomically refill and, if every bucket can pay without going below its floor, debit all of them.
+# KEYS: bucket hashes; ARGV: now, then (rate/s, capacity, cost, floor) per bucket.
+# Returns "0" when debited, else the wait in seconds until the scarcest bucket can pay.
+_TAKE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local levels = {}
+local wait = 0
+for i, key in ipairs(KEYS) do
+  local base = 1 + (i - 1) * 4
+  local rate, capacity = tonumber(ARGV[base + 1]), tonumber(ARGV[base + 2])
+  local cost, floor = tonumber(ARGV[base + 3]), tonumber(ARGV[base + 4])
+  local state = redis.call('HMGET', key, 'level', 'ts')
+  local level = tonumber(state[1]) or capacity
+  local ts = tonumber(state[2]) or now
+  level = math.min(capacity, level + math.max(0, now - ts) * rate)
+  levels[i] = level
+  if level - cost < floor then
+    wait = math.max(wait, (cost + floor - level) / rate)
+  end
+end
+if wait > 0 then
+  return tostring(wait)
+end
+for i, key in ipairs(KEYS) do
+  local base = 1 + (i - 1) * 4
+  local rate, capacity, cost = tonumber(ARGV[base + 1]), tonumber(ARGV[base + 2]), tonumber(ARGV[base + 3])
+  redis.call('HSET', key, 'level', levels[i] - cost, 'ts', now)
+  redis.call('EXPIRE', key, math.ceil(capacity / rate) * 2 + 1)
+end
+return "0"
+"""
+
+# Lower one bucket to at most ARGV[2] (refilling first), never below it: concurrent 429s do not stack.
+# KEYS: bucket hash; ARGV: now, level, rate/s, capacity.
+_PAUSE_SCRIPT = """
+local now, target = tonumber(ARGV[1]), tonumber(ARGV[2])
+local rate, capacity = tonumber(ARGV[3]), tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'level', 'ts')
+local level = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+level = math.min(capacity, level + math.max(0, now - ts) * rate)
+redis.call('HSET', KEYS[1], 'level', math.min(level, target), 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) * 2 + 1)
+return "0"
+"""
+
+
+class RateLimitShed(LLMRejectedError):
+    """Raised when a call would have to wait longer than its priority allows."""
+
+
+def parse_limits(spec: Optional[str], default: float) -> Dict[str, float]:
+    """"60" -> {"*": 60}; "cohere=100,openai=500" -> per provider, "*" falling back to ``default``."""
+    limits = {"*": float(default)}
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "=" in part:
+            name, value = part.split("=", 1)
+            limits[name.strip().lower()] = float(value)
+        else:
+            limits["*"] = float(part)
+    return limits
+
+
+class RateGovernor:
+    """
+    ``acquire(provider, tokens, tenant, priority)`` blocks until the call fits in:
+      - the provider's requests/min and tokens/min buckets
+      - the tenant's buckets on that provider (``tenant_share`` of the provider limits)
+    Buckets hold one minute of budget and refill continuously. Batch calls must leave
+    ``batch_reserve`` of each provider bucket untouched. A call that would wait longer than its
+    priority's max wait is shed with RateLimitShed (a LLMRejectedError) and never reaches the provider.
+
+    With ``redis_client`` the buckets are shared by every worker through one Lua script;
+    on Redis errors the governor falls back to process-local buckets.
+    """
+
+    def __init__(
+        self,
+        redis_client=None,
+        requests_per_minute: Optional[Dict[str, float]] = None,
+        tokens_per_minute: Optional[Dict[str, float]] = None,
+        tenant_share: float = 0.5,
+        batch_reserve: float = 0.25,
+        max_wait: Optional[Dict[str, float]] = None,
+        key_prefix: str = "llm_governor",
+    ):
+        self.redis = redis_client
+        self.requests_per_minute = requests_per_minute or {"*": 60.0}
+        self.tokens_per_minute = tokens_per_minute or {"*": 100000.0}
+        self.tenant_share = min(1.0, max(0.0, float(tenant_share)))
+        self.batch_reserve = min(0.9, max(0.0, float(batch_reserve)))
+        self.max_wait = {INTERACTIVE: 5.0, BATCH: 30.0, **(max_wait or {})}
+        self.key_prefix = key_prefix
+        self._script = None
+        self._pause_script = None
+        self._lock = threading.Lock()
+        self._local: Dict[str, List[float]] = {}  # key -> [level, ts]
+        self._waits: Dict[str, deque] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def _limit(self, limits: Dict[str, float], provider: str) -> float:
+        return float(limits.get(provider, limits.get("*", 0)) or 0)
+
+    def _buckets(self, provider: str, tokens: int, tenant: Optional[str], priority: str) -> List[Tuple[str, float, float, float, float]]:
+        """(key, rate/s, capacity, cost, floor) for every bucket this call must pay into."""
+        buckets = []
+        for kind, limits, cost in (("req", self.requests_per_minute, 1.0), ("tok", self.tokens_per_minute, float(tokens))):
+            per_minute = self._limit(limits, provider)
+            if per_minute <= 0:
+                continue  # unlimited
+            cost = min(cost, per_minute)  # an oversized prompt waits for a full bucket, not forever
+            floor = per_minute * self.batch_reserve if priority == BATCH else 0.0
+            buckets.append((f"{self.key_prefix}:{provider}:{kind}", per_minute / 60.0, per_minute, cost, floor))
+            if tenant and self.tenant_share < 1.0:
+                tenant_minute = max(1.0, per_minute * self.tenant_share)
+                buckets.append((
+                    f"{self.key_prefix}:{provider}:{kind}:tenant:{tenant}",
+                    tenant_minute / 60.0, tenant_minute, min(cost, tenant_minute), 0.0,
+                ))
+        return buckets
+
+    def _take(self, buckets, now: float) -> float:
+        if self.redis is not None:
+            try:
+                if self._script is None:
+                    self._script = self.redis.register_script(_TAKE_SCRIPT)
+                args = [now]
+                for _, rate, capacity, cost, floor in buckets:
+                    args.extend([rate, capacity, cost, floor])
+                result = self._script(keys=[b[0] for b in buckets], args=args)
+                return float(result.decode() if isinstance(result, bytes) else result)
+            except Exception as e:
+                logger.warning(f"governor.redis_error error={e} falling_back=local")
+        with self._lock:
+            levels = []
+            wait = 0.0
+            for key, rate, capacity, cost, floor in buckets:
+                level, ts = self._local.get(key, (capacity, now))
+                level = min(capacity, level + max(0.0, now - ts) * rate)
+                levels.append(level)
+                if level - cost < floor:
+                    wait = max(wait, (cost + floor - level) / rate)
+            if wait > 0:
+                return wait
+            for (key, _, _, cost, _), level in zip(buckets, levels):
+                self._local[key] = [level - cost, now]
+            return 0.0
+
+    def acquire(self, provider: str, tokens: int = 0, tenant: Optional[str] = None, priority: str = INTERACTIVE) -> float:
+        """Wait for budget and debit it; returns seconds waited or raises RateLimitShed."""
+        provider = (provider or "unknown").lower()
+        priority = priority if priority in self.max_wait else INTERACTIVE
+        buckets = self._buckets(provider, tokens, tenant, priority)
+        started = time.monotonic()
+        deadline = started + self.max_wait[priority]
+        while buckets:
+            wait = self._take(buckets, time.time())
+            if wait <= 0:
+                break
+            if time.monotonic() + wait > deadline:
+                self._record(provider, priority, time.monotonic() - started, shed=True)
+                logger.warning(f"governor.shed provider={provider} priority={priority} tenant={tenant} wait_s={round(wait, 2)}")
+                raise RateLimitShed(f"{provider} rate budget exhausted for {priority} work (wait {wait:.1f}s)")
+            time.sleep(min(wait, 1.0))
+        waited = time.monotonic() - started
+        self._record(provider, priority, waited, shed=False)
+        return waited
+
+    def penalize(self, provider: str, seconds: float = 5.0) -> None:
+        """After a provider 429: drop its request bucket so calls pause for at most ``seconds``."""
+        provider = (provider or "unknown").lower()
+        per_minute = self._limit(self.requests_per_minute, provider)
+        if per_minute <= 0:
+            return
+        rate = per_minute / 60.0
+        # Level -seconds*rate refills to zero after ``seconds``; min() keeps a burst of 429s to one pause
+        key = f"{self.key_prefix}:{provider}:req"
+        target = -max(0.0, float(seconds)) * rate
+        now = time.time()
+        paused = False
+        if self.redis is not None:
+            try:
+                if self._pause_script is None:
+                    self._pause_script = self.redis.register_script(_PAUSE_SCRIPT)
+                self._pause_script(keys=[key], args=[now, target, rate, per_minute])
+                paused = True
+            except Exception as e:
+                logger.warning(f"governor.redis_error error={e} falling_back=local")
+        if not paused:
+            with self._lock:
+                level, ts = self._local.get(key, (per_minute, now))
+                level = min(per_minute, level + max(0.0, now - ts) * rate)
+                self._local[key] = [min(level, target), now]
+        logger.warning(f"governor.provider_throttled provider={provider} pause_s={seconds}")
+
+    def _record(self, provider: str, priority: str, waited: float, shed: bool) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(provider, {
+                "calls": 0, "waited": 0, "shed": {INTERACTIVE: 0, BATCH: 0}, "totalWaitMs": 0, "maxWaitMs": 0,
+            })
+            waits = self._waits.setdefault(provider, deque(maxlen=200))
+            wait_ms = round(waited * 1000)
+            if shed:
+                stats["shed"][priority] += 1
+            else:
+                stats["calls"] += 1
+                stats["waited"] += 1 if wait_ms > 0 else 0
+                waits.append(wait_ms)
+            stats["totalWaitMs"] += wait_ms
+            stats["maxWaitMs"] = max(stats["maxWaitMs"], wait_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out = {}
+            for provider, stats in self._stats.items():
+                waits = sorted(self._waits.get(provider, ()))
+                out[provider] = {
+                    **stats,
+                    "shed": dict(stats["shed"]),
+                    "p50WaitMs": waits[len(waits) // 2] if waits else 0,
+                    "p95WaitMs": waits[min(len(waits) - 1, math.ceil(len(waits) * 0.95) - 1)] if waits else 0,
+                }
+            return {
+                "requestsPerMinute": dict(self.requests_per_minute),
+                "tokensPerMinute": dict(self.tokens_per_minute),
+                "tenantShare": self.tenant_share,
+                "batchReserve": self.batch_reserve,
+                "byProvider": out,
+            }
+
+
+# Singleton instance
+_governor_instance: Optional[RateGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_rate_governor(**kwargs) -> RateGovernor:
+    """Process-wide governor; kwargs only apply on first call (same pattern as get_llm_executor)."""
+    global _governor_instance
+    if _governor_instance is None:
+        with _governor_lock:
+            if _governor_instance is None:
+                _governor_instance = RateGovernor(**kwargs)
+    return _governor_instance
@@ -0,0 +1,291 @@
+# RESUME FEATURES: Single-pass deterministic features shared by every scorer and dashboard builder
+# Tokens, bullets, sections, skills and quantified lines are derived in one walk over the lines with
+# precompiled patterns, then memoized by content hash so repeated scorers on the same text are free.
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_SECTION_HEADERS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "section_headers.json")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"\w+")
+_BULLET_RE = re.compile(r"^[-*•]")
+_QUANTIFIED_RE = re.compile(r"\b\d+(?:\.\d+)?\s*(?:%|percent|x|k|m|million|billion|\+)\b", re.IGNORECASE)
+_SKILL_SPLIT_RE = re.compile(r"[,;\n]\s*")
+MAX_BULLETS = 100
+
+
+class SectionVocabulary:
+    """
+    Header line -> canonical section lookup table.
+
+    A line is a header when, lowercased with whitespace collapsed and one trailing colon removed,
+    it equals a canonical name or alias ("Employment History:" -> "experience"). Each line costs
+    one length check and at most one dict lookup, whatever the vocabulary size.
+    """
+
+    def __init__(self, sections: Dict[str, Iterable[str]]):
+        self.lookup: Dict[str, str] = {}
+        for canonical, aliases in sections.items():
+            canonical = self._normalize(canonical)
+            for header in (canonical, *(self._normalize(a) for a in aliases or [])):
+                if header:
+                    self.lookup[header] = canonical
+        self.max_length = max((len(h) for h in self.lookup), default=0)
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return _WHITESPACE_RE.sub(" ", (text or "").lower()).strip()
+
+    def match(self, low: str) -> Optional[str]:
+        """Canonical section for a stripped, lowercased line, or None."""
+        if len(low) > self.max_length + 1 and "  " not in low and "\t" not in low:
+            return None  # most content lines are longer than any header
+        if low.endswith(":"):
+            low = low[:-1].rstrip()
+        if "  " in low or "\t" in low:
+            low = _WHITESPACE_RE.sub(" ", low)
+        return self.lookup.get(low)
+
+    def parse(self, text: str):
+        """Sections and spans for ``text`` on their own (no tokens/skills); see ResumeFeatures."""
+        builder = _SectionBuilder(self)
+        for start, clean in _iter_lines(text or ""):
+            builder.feed(clean, clean.lower(), start)
+        return builder.finish()
+
+    @classmethod
+    def from_file(cls, path: str) -> "SectionVocabulary":
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        return cls(data.get("sections", data))
+
+
+def _iter_lines(text: str):
+    """Yield (char offset, stripped line) for every non-blank line."""
+    offset = 0
+    for raw in text.splitlines(keepends=True):
+        clean = raw.strip()
+        if clean:
+            yield offset + (len(raw) - len(raw.lstrip())), clean
+        offset += len(raw)
+
+
+class _SectionBuilder:
+    def __init__(self, vocabulary: SectionVocabulary):
+        self.vocabulary = vocabulary
+        self.current = 'summary'
+        self.lines: Dict[str, List[str]] = {'summary': []}
+        self.spans: Dict[str, List[List[int]]] = {}
+        self._open = None  # [start, end] span the next content line extends
+
+    def feed(self, clean: str, low: str, start: int) -> bool:
+        """Consume one stripped non-blank line; returns True if it was a header."""
+        header = self.vocabulary.match(low)
+        if header is not None:
+            self.current = header
+            self.lines.setdefault(header, [])
+            self._open = None
+            return True
+        self.lines.setdefault(self.current, []).append(clean)
+        end = start + len(clean)
+        if self._open is None:
+            self._open = [start, end]
+            self.spans.setdefault(self.current, []).append(self._open)
+        else:
+            self._open[1] = end
+        return False
+
+    def finish(self):
+        sections = {k: '\n'.join(v) for k, v in self.lines.items() if v}
+        if 'skills' in sections:
+            sections['skills_list_raw'] = [t.strip() for t in _SKILL_SPLIT_RE.split(sections['skills']) if t.strip()]
+        spans = {k: tuple((s, e) for s, e in v) for k, v in self.spans.items()}
+        return sections, spans
+
+
+_default_vocabulary: Optional[SectionVocabulary] = None
+
+
+def default_section_vocabulary() -> SectionVocabulary:
+    global _default_vocabulary
+    if _default_vocabulary is None:
+        _default_vocabulary = SectionVocabulary.from_file(DEFAULT_SECTION_HEADERS_PATH)
+    return _default_vocabulary
+
+
+@dataclass(frozen=True)
+class ResumeFeatures:
+    """
+    Immutable parse of one text (resume or job description). Instances are shared between
+    requests through the memo, so callers must copy before mutating ``sections``.
+    """
+    text_hash: str
+    tokens: Tuple[str, ...]  # lowercase \w+ tokens in document order
+    word_set: frozenset
+    bullets: Tuple[str, ...]
+    sections: Dict[str, object]
+    # Section -> ((start, end), ...) char offsets into the source text; a section may occur twice
+    section_spans: Dict[str, Tuple[Tuple[int, int], ...]]
+    skills: Tuple[str, ...]
+    quantified_lines: Tuple[str, ...]
+
+    @property
+    def word_count(self) -> int:
+        return len(self.tokens)
+
+    def section_slices(self, name: str) -> List[slice]:
+        """Slices of the source text holding section ``name`` (raw text, blank lines included)."""
+        return [slice(start, end) for start, end in self.section_spans.get(name, ())]
+
+
+class ResumeFeatureExtractor:
+    """
+    Builds ResumeFeatures with a bounded LRU memo keyed by the SHA-256 of the text.
+
+    ``skill_finder`` is the skill detector (SkillMatcher.find); it is the only part that does not
+    run inside the line loop, since the automaton already scans the text in one linear pass.
+    """
+
+    def __init__(self, skill_finder, section_vocabulary: Optional[SectionVocabulary] = None, max_entries: int = 512):
+        self.skill_finder = skill_finder
+        self.section_vocabulary = section_vocabulary or default_section_vocabulary()
+        self.max_entries = max(1, int(max_entries))
+        self._memo: "OrderedDict[str, ResumeFeatures]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def extract(self, text: Optional[str]) -> ResumeFeatures:
+        text = text or ""
+        digest = hashlib.sha256(text.encode("utf-8", errors="ignore")).hexdigest()
+        with self._lock:
+            cached = self._memo.get(digest)
+            if cached is not None:
+                self._memo.move_to_end(digest)
+                self._hits += 1
+                return cached
+            self._misses += 1
+        features = self._build(text, digest)
+        with self._lock:
+            self._memo[digest] = features
+            self._memo.move_to_end(digest)
+            while len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+        return features
+
+    def _build(self, text: str, digest: str) -> ResumeFeatures:
+        tokens = []
+        bullets = []
+        quantified = []
+        builder = _SectionBuilder(self.section_vocabulary)
+        for start, clean in _iter_lines(text):
+            low = clean.lower()
+            tokens.extend(_TOKEN_RE.findall(low))
+            if _QUANTIFIED_RE.search(clean):
+                quantified.append(clean)
+            if builder.feed(clean, low, start):
+                continue
+            if len(bullets) < MAX_BULLETS and (_BULLET_RE.match(clean) or len(clean.split()) > 4):
+                bullets.append(clean.lstrip("-*• ").strip())
+        sections, spans = builder.finish()
+
+        return ResumeFeatures(
+            text_hash=digest,
+            tokens=tuple(tokens),
+            word_set=frozenset(tokens),
+            bullets=tuple(bullets),
+            sections=sections,
+            section_spans=spans,
+            skills=tuple(self.skill_finder(text)) if text else (),
+            quantified_lines=tuple(quantified),
+        )
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._memo), "maxEntries": self.max_entries, "hits": self._hits, "misses": self._misses}
+
+
+_extractor: Optional[ResumeFeatureExtractor] = None
+_extractor_lock = threading.Lock()
+
+
+def get_resume_feature_extractor(**kwargs) -> ResumeFeatureExtractor:
+    """Process-wide extractor; kwargs only apply on first call (same pattern as get_llm_executor)."""
+    global _extractor
+    with _extractor_lock:
+        if _extractor is None:
+            _extractor = ResumeFeatureExtractor(**kwargs)
+        return _extractor
+
+
+# ---------- benchmark: python -m backend.resume_features --corpus backend/uploads ----------
+_LEGACY_HEADERS = [
+    'experience', 'work experience', 'professional experience', 'education', 'projects', 'skills', 'certifications',
+    'achievements', 'summary', 'profile'
+]
+
+
+def _legacy_parse_sections(text: str):
+    # The per-line, per-header f-string regex parser this module replaced; kept only as a baseline
+    sections = {'summary': []}
+    current = 'summary'
+    for line in text.splitlines():
+        clean = line.strip()
+        low = clean.lower()
+        if any(re.fullmatch(rf"{h}\:?", low) for h in _LEGACY_HEADERS):
+            current = low.split(':')[0]
+            sections.setdefault(current, [])
+            continue
+        if clean:
+            sections.setdefault(current, []).append(clean)
+    joined = {k: '\n'.join(v) for k, v in sections.items() if v}
+    if 'skills' in joined:
+        joined['skills_list_raw'] = [t.strip() for t in re.split(r"[,;\n]\s*", joined['skills']) if t.strip()]
+    return joined
+
+
+def _time_per_doc(fn, texts: List[str], rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - started) / (rounds * len(texts)) * 1e6
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    try:
+        from backend.semantic_model import iter_corpus_texts
+    except ImportError:
+        from semantic_model import iter_corpus_texts
+
+    parser = argparse.ArgumentParser(description="Benchmark section parsing on a resume/JD corpus")
+    parser.add_argument(
+        "--corpus", nargs="+", default=[os.path.join(os.path.dirname(os.path.abspath(__file__)), "uploads")],
+        help="Directories of resume/JD PDFs or .txt files",
+    )
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--vocabulary", default=DEFAULT_SECTION_HEADERS_PATH)
+    args = parser.parse_args(argv)
+
+    texts = [text for corpus_dir in args.corpus for text in iter_corpus_texts(corpus_dir)]
+    if not texts:
+        raise SystemExit("No documents found in corpus")
+    vocabulary = SectionVocabulary.from_file(args.vocabulary)
+    legacy_us = _time_per_doc(_legacy_parse_sections, texts, args.rounds)
+    current_us = _time_per_doc(vocabulary.parse, texts, args.rounds)
+    lines = sum(len(text.splitlines()) for text in texts)
+    print(f"{len(texts)} documents, {lines} lines, {args.rounds} rounds")
+    print(f"legacy per-header regex: {legacy_us:9.1f} us/doc")
+    print(f"lookup-table parser:     {current_us:9.1f} us/doc ({legacy_us / max(current_us, 1e-9):.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
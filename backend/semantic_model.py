@@ -0,0 +1,271 @@
+# SEMANTIC MODEL: Corpus-fitted TF-IDF scoring for resume <-> job description similarity
+# IDF weights are fitted once on a resume/JD corpus and persisted as gzip JSON; scoring a pair is
+# a transform plus a sparse dot product, with no per-request refit. Without a fitted model the
+# hashing mode still scores, with unweighted term frequencies.
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+from sklearn.preprocessing import normalize
+
+logger = logging.getLogger("resume_analyzer")
+
+MODEL_FORMAT_VERSION = 1
+DEFAULT_NGRAM_RANGE = (1, 2)
+DEFAULT_MAX_FEATURES = 20000
+DEFAULT_HASH_FEATURES = 2 ** 18
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "semantic_idf.json.gz")
+
+
+def _smooth_idf(n_docs: int, df: np.ndarray) -> np.ndarray:
+    # Same formula as sklearn's TfidfTransformer(smooth_idf=True)
+    return np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+
+
+def fit_corpus(
+    texts: Iterable[str],
+    ngram_range=DEFAULT_NGRAM_RANGE,
+    max_features: int = DEFAULT_MAX_FEATURES,
+    hash_features: int = DEFAULT_HASH_FEATURES,
+) -> Dict[str, Any]:
+    """Fit document frequencies for both the vocabulary and the hashing mode; returns a JSON-able model."""
+    docs = [t for t in texts if t and t.strip()]
+    if not docs:
+        raise ValueError("Cannot fit a semantic model on an empty corpus")
+    n_docs = len(docs)
+
+    counter = CountVectorizer(ngram_range=tuple(ngram_range), max_features=max_features)
+    counts = counter.fit_transform(docs)
+    df = np.bincount(counts.indices, minlength=counts.shape[1])
+    vocabulary = sorted(counter.vocabulary_, key=counter.vocabulary_.get)
+
+    hasher = HashingVectorizer(
+        n_features=hash_features, ngram_range=tuple(ngram_range), alternate_sign=False, norm=None
+    )
+    hashed = hasher.transform(docs).tocsr()
+    hashed.sum_duplicates()
+    hashed_df = np.bincount(hashed.indices, minlength=hash_features)
+    seen = np.flatnonzero(hashed_df)
+
+    return {
+        "formatVersion": MODEL_FORMAT_VERSION,
+        "nDocs": n_docs,
+        "ngramRange": list(ngram_range),
+        "vocabulary": vocabulary,
+        "idf": [round(float(v), 6) for v in _smooth_idf(n_docs, df)],
+        "hashing": {
+            "nFeatures": hash_features,
+            "indices": seen.tolist(),
+            "idf": [round(float(v), 6) for v in _smooth_idf(n_docs, hashed_df[seen])],
+            # Terms never seen in the corpus get the rarest-term weight
+            "defaultIdf": round(float(_smooth_idf(n_docs, np.zeros(1))[0]), 6),
+        },
+    }
+
+
+def save_model(model: Dict[str, Any], path: str) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as fh:
+        json.dump(model, fh, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def load_model(path: str) -> Dict[str, Any]:
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        model = json.load(fh)
+    if model.get("formatVersion") != MODEL_FORMAT_VERSION:
+        raise ValueError(f"Unsupported semantic model format: {model.get('formatVersion')}")
+    return model
+
+
+class SemanticScorer:
+    """
+    Cosine similarity over corpus-weighted TF-IDF vectors.
+
+    Modes:
+      - "hashing": HashingVectorizer features weighted by hashed corpus IDF (unseen terms keep max IDF);
+                   with no model file, plain L2-normalized term frequencies
+      - "tfidf":   fixed corpus vocabulary (unseen terms are ignored, so a text whose words are
+                   mostly outside it, below ``min_coverage``, is left to the per-pair fit)
+
+    The model file is loaded lazily on first use; afterwards all state is read-only and shared
+    across request threads. None is bundled: fit one on real resumes/JDs with
+    ``python -m backend.semantic_model``. Until then "tfidf" mode's ``score`` returns None so
+    callers can fall back to a per-pair fit.
+    """
+
+    def __init__(self, model_path: str = DEFAULT_MODEL_PATH, mode: str = "hashing", min_coverage: float = 0.5):
+        self.model_path = model_path
+        self.mode = mode if mode in ("tfidf", "hashing") else "hashing"
+        self.min_coverage = float(min_coverage)
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._vectorizer = None
+        self._idf: Optional[np.ndarray] = None
+        self._n_docs = 0
+        self._unigrams = None  # tfidf mode: tokenizer for the vocabulary coverage check
+
+    def _ensure_loaded(self) -> bool:
+        if self._loaded:
+            return self._vectorizer is not None
+        with self._lock:
+            if self._loaded:
+                return self._vectorizer is not None
+            try:
+                model = load_model(self.model_path)
+                self._build(model)
+                logger.info(f"semantic.model_loaded mode={self.mode} docs={self._n_docs} path={self.model_path}")
+            except FileNotFoundError:
+                fallback = "unweighted_hashing" if self.mode == "hashing" else "pair_fit"
+                logger.warning(f"semantic.model_missing path={self.model_path} falling_back={fallback}")
+                self._build_unweighted()
+            except Exception as e:
+                logger.error(f"semantic.model_load_error path={self.model_path} error={e}")
+                self._build_unweighted()
+            self._loaded = True
+            return self._vectorizer is not None
+
+    def _build(self, model: Dict[str, Any]) -> None:
+        ngram_range = tuple(model.get("ngramRange", DEFAULT_NGRAM_RANGE))
+        if self.mode == "hashing":
+            hashing = model["hashing"]
+            vectorizer = HashingVectorizer(
+                n_features=hashing["nFeatures"], ngram_range=ngram_range, alternate_sign=False, norm=None
+            )
+            idf = np.full(hashing["nFeatures"], hashing["defaultIdf"], dtype=np.float32)
+            idf[np.asarray(hashing["indices"], dtype=np.int64)] = np.asarray(hashing["idf"], dtype=np.float32)
+        else:
+            vectorizer = CountVectorizer(
+                ngram_range=ngram_range,
+                vocabulary={term: i for i, term in enumerate(model["vocabulary"])},
+            )
+            vectorizer.transform([""])  # validate the fixed vocabulary now, not concurrently on first request
+            idf = np.asarray(model["idf"], dtype=np.float32)
+            self._unigrams = CountVectorizer().build_analyzer()
+        self._idf = idf
+        self._n_docs = int(model.get("nDocs", 0))
+        self._vectorizer = vectorizer
+
+    def _build_unweighted(self) -> None:
+        # Hashing needs no fitted state; without IDF every term weighs the same
+        if self.mode == "hashing":
+            self._vectorizer = HashingVectorizer(
+                n_features=DEFAULT_HASH_FEATURES, ngram_range=DEFAULT_NGRAM_RANGE, alternate_sign=False, norm=None
+            )
+
+    @property
+    def available(self) -> bool:
+        return self._ensure_loaded()
+
+    def transform(self, texts: List[str]):
+        """L2-normalized TF-IDF rows for ``texts`` (CSR); rows of two texts dot to their cosine similarity."""
+        if not self._ensure_loaded():
+            raise RuntimeError("Semantic model is not available")
+        counts = self._vectorizer.transform(texts)
+        weighted = counts.multiply(self._idf).tocsr() if self._idf is not None else counts.tocsr()
+        return normalize(weighted, norm="l2", copy=False)
+
+    def coverage(self, text: str) -> float:
+        """Share of the distinct words in ``text`` the model has weights for (always 1.0 in hashing mode)."""
+        if not self._ensure_loaded() or self._unigrams is None:
+            return 1.0
+        words = set(self._unigrams(text))
+        if not words:
+            return 0.0
+        vocabulary = self._vectorizer.vocabulary_
+        return sum(1 for word in words if word in vocabulary) / len(words)
+
+    def score(self, text_a: str, text_b: str) -> Optional[float]:
+        """
+        Cosine similarity in [0, 1], or None if no vectorizer is available (tfidf mode without a
+        model) or a text is mostly outside the corpus vocabulary (the model has nothing reliable
+        to say about it).
+        """
+        if not self._ensure_loaded():
+            return None
+        if self._unigrams is not None and min(self.coverage(text_a), self.coverage(text_b)) < self.min_coverage:
+            return None
+        matrix = self.transform([text_a, text_b])
+        if matrix[0].nnz == 0 or matrix[1].nnz == 0:
+            return None
+        return float(matrix[0].multiply(matrix[1]).sum())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "modelPath": self.model_path,
+            "loaded": self._loaded and self._vectorizer is not None,
+            "idfFitted": self._idf is not None,
+            "corpusDocuments": self._n_docs,
+            "features": int(self._idf.shape[0]) if self._idf is not None else 0,
+        }
+
+
+_scorer: Optional[SemanticScorer] = None
+_scorer_lock = threading.Lock()
+
+
+def get_semantic_scorer(**kwargs) -> SemanticScorer:
+    """Process-wide scorer; kwargs only apply on first call (same pattern as get_llm_executor)."""
+    global _scorer
+    with _scorer_lock:
+        if _scorer is None:
+            _scorer = SemanticScorer(**kwargs)
+        return _scorer
+
+
+def iter_corpus_texts(corpus_dir: str) -> Iterable[str]:
+    """Yield text for each distinct PDF/TXT in ``corpus_dir`` (duplicate uploads are skipped by content hash)."""
+    try:
+        from backend.pdf_extraction import PDFExtractor
+    except ImportError:
+        from pdf_extraction import PDFExtractor
+
+    extractor = PDFExtractor(max_workers=0)
+    seen = set()
+    for name in sorted(os.listdir(corpus_dir)):
+        path = os.path.join(corpus_dir, name)
+        if not os.path.isfile(path) or not name.lower().endswith((".pdf", ".txt")):
+            continue
+        with open(path, "rb") as fh:
+            data = fh.read()
+        digest = hashlib.sha256(data).hexdigest()
+        if digest in seen:
+            continue
+        seen.add(digest)
+        try:
+            text = data.decode("utf-8", errors="ignore") if name.lower().endswith(".txt") else extractor.extract(data).text
+        except Exception as e:
+            logger.warning(f"semantic.corpus_skip file={name} error={e}")
+            continue
+        if text:
+            yield text
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Fit and persist the semantic TF-IDF model")
+    parser.add_argument(
+        "--corpus", nargs="+", default=[os.path.join(os.path.dirname(os.path.abspath(__file__)), "uploads")],
+        help="Directories of resume/JD PDFs or .txt files",
+    )
+    parser.add_argument("--out", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--max-features", type=int, default=DEFAULT_MAX_FEATURES)
+    args = parser.parse_args(argv)
+
+    texts = [text for corpus_dir in args.corpus for text in iter_corpus_texts(corpus_dir)]
+    model = fit_corpus(texts, max_features=args.max_features)
+    save_model(model, args.out)
+    print(f"Fitted semantic model on {len(texts)} documents "
+          f"({len(model['vocabulary'])} terms) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
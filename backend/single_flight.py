@@ -0,0 +1,223 @@
+# SINGLE FLIGHT: Coalesces concurrent identical calls so only one provider request runs per key
+# In-process callers share a threading.Event; other gunicorn/Celery workers coordinate through a Redis lock + pub/sub
+import json
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger("resume_analyzer")
+
+# Delete the lock only if we still own it (avoids releasing a lock that expired and was re-acquired)
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class _Call:
+    __slots__ = ("event", "value", "error", "abandoned", "token")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+        self.abandoned = False
+        self.token: Optional[str] = None
+
+
+class SingleFlight:
+    """
+    Duplicate-call suppression keyed by a caller-supplied string.
+
+    Features:
+      - In-process: the first caller for a key runs ``fn``; concurrent callers wait and share its result
+      - Cross-process: the leader also takes ``{namespace}_lock:{key}`` in Redis; leaders in other
+        workers wait for a ``{namespace}_done:{key}`` notification (or the ``fetch`` callback) instead
+        of issuing their own provider call
+      - Fail-open: if the leader dies, errors out, or the wait times out, followers run ``fn`` themselves
+      - ``try_lead``/``finish``: non-blocking leadership for callers that run many keys at once
+        (e.g. an asyncio fan-out); callers using ``do`` for those keys wait on them as usual
+    """
+
+    def __init__(self, redis_client=None, namespace: str = "llm", lock_ttl: float = 30.0, wait_timeout: float = 30.0):
+        self.redis = redis_client
+        self.namespace = namespace
+        self.lock_ttl = max(1.0, float(lock_ttl))
+        self.wait_timeout = max(0.1, float(wait_timeout))
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._stats = {
+            "leaders": 0,
+            "sharedInProcess": 0,
+            "sharedCrossProcess": 0,
+            "waitTimeouts": 0,
+        }
+
+    def _lock_key(self, key: str) -> str:
+        return f"{self.namespace}_lock:{key}"
+
+    def _channel(self, key: str) -> str:
+        return f"{self.namespace}_done:{key}"
+
+    def do(self, key: str, fn: Callable[[], Any], fetch: Optional[Callable[[], Any]] = None) -> Tuple[Any, bool]:
+        """
+        Run ``fn`` once per concurrent ``key``.
+        ``fetch`` is an optional cheap lookup (e.g. the result cache) used by cross-process followers.
+        Returns (value, shared) where ``shared`` is True if the value came from another caller.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            if not call.event.wait(self.wait_timeout):
+                self._bump("waitTimeouts")
+                logger.warning(f"singleflight.wait_timeout key={key[:16]}")
+                return fn(), False
+            if call.error is not None:
+                raise call.error
+            if call.abandoned:
+                return fn(), False
+            self._bump("sharedInProcess")
+            return call.value, True
+
+        shared = False
+        try:
+            call.value, shared = self._lead(key, fn, fetch)
+            return call.value, shared
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def try_lead(self, key: str) -> bool:
+        """
+        Become the leader for ``key`` without blocking. True means the caller runs the work and must
+        call ``finish(key, ...)``; False means a call for ``key`` is already in flight here or in
+        another worker, and ``do`` will join it.
+        """
+        with self._lock:
+            if key in self._calls:
+                return False
+        token = self._acquire_remote(key)
+        if token is None and self.redis is not None:
+            return False
+        with self._lock:
+            won = key not in self._calls
+            if won:
+                call = _Call()
+                call.token = token
+                self._calls[key] = call
+                self._stats["leaders"] += 1
+        if not won:
+            self._release_remote(key, token)
+        return won
+
+    def finish(self, key: str, value: Any = None) -> None:
+        """End a ``try_lead`` leadership; with no ``value`` followers run the call themselves."""
+        with self._lock:
+            call = self._calls.pop(key, None)
+        if call is None:
+            return
+        self._release_remote(key, call.token)
+        self._notify_remote(key, value, ok=value is not None)
+        call.value = value
+        call.abandoned = value is None
+        call.event.set()
+
+    def _lead(self, key: str, fn: Callable[[], Any], fetch: Optional[Callable[[], Any]]) -> Tuple[Any, bool]:
+        token = self._acquire_remote(key)
+        if token is None and self.redis is not None:
+            value = self._wait_remote(key, fetch)
+            if value is not None:
+                self._bump("sharedCrossProcess")
+                return value, True
+
+        self._bump("leaders")
+        try:
+            value = fn()
+        except BaseException:
+            self._notify_remote(key, None, ok=False)
+            raise
+        finally:
+            self._release_remote(key, token)
+        self._notify_remote(key, value, ok=True)
+        return value, False
+
+    def _acquire_remote(self, key: str) -> Optional[str]:
+        if self.redis is None:
+            return None
+        token = uuid.uuid4().hex
+        try:
+            if self.redis.set(self._lock_key(key), token, nx=True, px=int(self.lock_ttl * 1000)):
+                return token
+        except Exception as e:
+            logger.warning(f"singleflight.lock_error error={e}")
+        return None
+
+    def _release_remote(self, key: str, token: Optional[str]) -> None:
+        if self.redis is None or token is None:
+            return
+        try:
+            self.redis.eval(_RELEASE_LOCK_SCRIPT, 1, self._lock_key(key), token)
+        except Exception as e:
+            logger.warning(f"singleflight.unlock_error error={e}")
+
+    def _notify_remote(self, key: str, value: Any, ok: bool) -> None:
+        if self.redis is None:
+            return
+        try:
+            payload = json.dumps({"ok": ok, "value": value if ok else None})
+            self.redis.publish(self._channel(key), payload)
+        except Exception as e:
+            logger.warning(f"singleflight.publish_error error={e}")
+
+    def _wait_remote(self, key: str, fetch: Optional[Callable[[], Any]]) -> Any:
+        """Wait for another worker's leader; returns its value or None if we should run ourselves."""
+        pubsub = None
+        deadline = time.time() + self.wait_timeout
+        try:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(self._channel(key))
+            while time.time() < deadline:
+                # Subscribe first, then check: a result published before we subscribed is in the cache
+                if fetch is not None:
+                    value = fetch()
+                    if value is not None:
+                        return value
+                message = pubsub.get_message(timeout=min(0.5, max(0.0, deadline - time.time())))
+                if message and message.get("type") == "message":
+                    data = json.loads(message["data"])
+                    return data.get("value") if data.get("ok") else None
+                if not self.redis.exists(self._lock_key(key)):
+                    # Leader finished (or died) without us seeing the message; last look in the cache
+                    return fetch() if fetch is not None else None
+            self._bump("waitTimeouts")
+            logger.warning(f"singleflight.remote_wait_timeout key={key[:16]}")
+        except Exception as e:
+            logger.warning(f"singleflight.remote_wait_error error={e}")
+        finally:
+            if pubsub is not None:
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+        return None
+
+    def _bump(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "inFlightKeys": len(self._calls), "distributed": self.redis is not None}
@@ -0,0 +1,128 @@
+# SKILL MATCHER: Aho-Corasick skill taxonomy matcher with word boundaries and aliases
+# The taxonomy (canonical skill -> aliases) is compiled once into an automaton; detecting every
+# skill in a resume or JD is a single linear pass over the text instead of a substring scan per skill.
+import json
+import os
+import re
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "skill_taxonomy.json")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class SkillMatcher:
+    """
+    Multi-pattern matcher over a skill taxonomy.
+
+    - Every canonical name and alias is a pattern; matches report the canonical name
+      (``k8s`` -> ``kubernetes``, ``node`` -> ``node.js``)
+    - A match must not be glued to letters/digits on either side, so ``java`` does not match inside
+      ``javascript`` and ``c`` does not match inside ``cloud``
+    - Overlapping matches resolve leftmost-longest, so ``c++`` wins over ``c`` and ``react native`` over ``react``
+    """
+
+    def __init__(self, taxonomy: Dict[str, Iterable[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str]]] = [[]]  # node -> [(pattern_length, canonical)]
+        self.skills: Set[str] = set()
+        self.pattern_count = 0
+        for canonical, aliases in taxonomy.items():
+            canonical = self._normalize(canonical)
+            self.skills.add(canonical)
+            for pattern in {canonical, *(self._normalize(a) for a in aliases or [])}:
+                if pattern:
+                    self._add(pattern, canonical)
+        self._build_failure_links()
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return _WHITESPACE_RE.sub(" ", (text or "").lower()).strip()
+
+    def _add(self, pattern: str, canonical: str) -> None:
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(pattern), canonical))
+        self.pattern_count += 1
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                # Inherit outputs of the suffix state so every pattern ending here is reported
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def _iter_matches(self, text: str):
+        """Yield (start, end, canonical) for every bounded pattern occurrence in normalized text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        n = len(text)
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            end = i + 1
+            if end < n and _is_word_char(text[end]) and _is_word_char(ch):
+                continue  # every pattern ending here is glued to the next word
+            for length, canonical in out[node]:
+                start = end - length
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                yield start, end, canonical
+
+    def find(self, text: str) -> List[str]:
+        """Sorted canonical skills present in ``text``."""
+        if not text:
+            return []
+        matches = sorted(self._iter_matches(self._normalize(text)), key=lambda m: (m[0], -(m[1] - m[0])))
+        found = set()
+        covered_until = 0
+        for start, end, canonical in matches:
+            if start < covered_until:
+                continue  # inside a longer match that started earlier (e.g. "c" inside "c++")
+            found.add(canonical)
+            covered_until = end
+        return sorted(found)
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillMatcher":
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        return cls(data.get("skills", data))
+
+
+_matcher: Optional[SkillMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def get_skill_matcher(path: Optional[str] = None) -> SkillMatcher:
+    """Process-wide matcher compiled once from the taxonomy file (path only applies on first call)."""
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            _matcher = SkillMatcher.from_file(path or DEFAULT_TAXONOMY_PATH)
+        return _matcher
@@ -0,0 +1,141 @@
+# STEP GRAPH: Run a small dependency graph of blocking steps concurrently on a bounded pool
+# Each step starts as soon as its dependencies finish; a step that overruns its deadline is reported
+# as timed out (its dependents are skipped) while every other step still completes.
+import contextvars
+import logging
+import queue
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+logger = logging.getLogger("resume_analyzer")
+
+
+class StepFailed(RuntimeError):
+    """Raised by a step to report a handled failure (e.g. an error payload from a task)."""
+
+    def __init__(self, message: str, details: Any = None):
+        super().__init__(message)
+        self.details = details
+
+
+@dataclass
+class Step:
+    """
+    ``fn(deps, emit)`` receives the results of ``depends_on`` as a dict and an ``emit(event, data)``
+    callback for intermediate output (e.g. streamed tokens); its return value is the step result.
+    An ``optional`` step that fails or times out does not skip its dependents: they run without
+    its entry in ``deps``.
+    """
+    name: str
+    fn: Callable[[Dict[str, Any], Callable[[str, Any], None]], Any]
+    depends_on: Sequence[str] = ()
+    timeout: Optional[float] = None
+    optional: bool = False
+
+
+def run_step_graph(executor: Executor, steps: Sequence[Step], default_timeout: Optional[float] = None) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """
+    Execute ``steps`` and yield (kind, step_name, data) as things happen:
+      - ("emit", name, {"event", "data"}) for output a running step emits
+      - ("completed", name, {"result", "durationMs"})
+      - ("failed", name, {"error", "details", "durationMs"})
+      - ("timed_out", name, {"durationMs"}) when a step exceeds its timeout (measured from submission)
+      - ("skipped", name, {"reason"}) for steps whose dependencies did not complete
+    The generator returns once every step has reached one of the last four states.
+    """
+    by_name = {step.name: step for step in steps}
+    for step in steps:
+        missing = [dep for dep in step.depends_on if dep not in by_name]
+        if missing:
+            raise ValueError(f"Step {step.name} depends on unknown steps {missing}")
+
+    events: "queue.Queue" = queue.Queue()
+    results: Dict[str, Any] = {}
+    started: Dict[str, float] = {}
+    finished: Dict[str, str] = {}
+
+    def _submit(step: Step) -> None:
+        deps = {dep: results[dep] for dep in step.depends_on if dep in results}
+        started[step.name] = time.monotonic()
+
+        def _emit(event: str, data: Any) -> None:
+            events.put(("emit", step.name, {"event": event, "data": data}))
+
+        def _run():
+            try:
+                events.put(("completed", step.name, step.fn(deps, _emit)))
+            except StepFailed as e:
+                events.put(("failed", step.name, {"error": str(e), "details": e.details}))
+            except Exception as e:
+                logger.error(f"step_graph.step_error step={step.name} error={e}")
+                events.put(("failed", step.name, {"error": str(e), "details": None}))
+
+        # Steps inherit the caller's context variables (e.g. per-request LLM options)
+        executor.submit(contextvars.copy_context().run, _run)
+
+    def _elapsed_ms(name: str) -> int:
+        return round((time.monotonic() - started[name]) * 1000)
+
+    def _ready_or_skipped():
+        """Submit steps whose dependencies completed; skip those with a dependency that did not."""
+        out = []
+        progressed = True
+        while progressed:
+            progressed = False
+            for step in steps:
+                if step.name in finished or step.name in started:
+                    continue
+                blocked = [
+                    dep for dep in step.depends_on
+                    if dep in finished and finished[dep] != "completed" and not by_name[dep].optional
+                ]
+                if blocked:
+                    finished[step.name] = "skipped"
+                    out.append(("skipped", step.name, {"reason": f"{blocked[0]} did not complete"}))
+                    progressed = True
+                elif all(dep in finished for dep in step.depends_on):
+                    _submit(step)
+        return out
+
+    yield from _ready_or_skipped()
+    while len(finished) < len(steps):
+        running = [name for name in started if name not in finished]
+        if not running:
+            for step in steps:  # only reachable with a dependency cycle
+                if step.name not in finished:
+                    finished[step.name] = "skipped"
+                    yield "skipped", step.name, {"reason": "dependency cycle"}
+            return
+        deadlines = [
+            started[name] + timeout
+            for name in running
+            if (timeout := by_name[name].timeout or default_timeout) is not None
+        ]
+        wait = None if not deadlines else max(0.0, min(deadlines) - time.monotonic())
+        try:
+            kind, name, data = events.get(timeout=wait)
+        except queue.Empty:
+            now = time.monotonic()
+            for name in running:
+                timeout = by_name[name].timeout or default_timeout
+                if timeout is not None and now >= started[name] + timeout:
+                    finished[name] = "timed_out"
+                    logger.warning(f"step_graph.step_timeout step={name} timeout_s={timeout}")
+                    yield "timed_out", name, {"durationMs": _elapsed_ms(name)}
+            yield from _ready_or_skipped()
+            continue
+
+        if name in finished:
+            continue  # late output from a step that already timed out
+        if kind == "emit":
+            yield kind, name, data
+            continue
+        finished[name] = kind
+        if kind == "completed":
+            results[name] = data
+            yield kind, name, {"result": data, "durationMs": _elapsed_ms(name)}
+        else:
+            yield kind, name, {**data, "durationMs": _elapsed_ms(name)}
+        yield from _ready_or_skipped()
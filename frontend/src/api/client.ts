@@ -803,13 +803,29 @@ export async function downloadCoachingReportPdf(
 // RAG (LangChain + FAISS) API
 // =============================
 
+// Anonymous users get their own index through a server-issued session id (X-Session-ID);
+// it is kept for the browser tab and sent back on every RAG call.
+const RAG_SESSION_KEY = 'ragSessionId'
+
+async function ragFetch(path: string, token: string | null, init: RequestInit = {}) {
+  const sessionId = sessionStorage.getItem(RAG_SESSION_KEY)
+  const res = await fetch(`${API_BASE}${path}`, {
+    ...init,
+    headers: {
+      ...(init.headers as Record<string, string> | undefined),
+      ...(token ? { Authorization: `Bearer ${token}` } : {}),
+      ...(sessionId ? { 'X-Session-ID': sessionId } : {})
+    }
+  })
+  const issued = res.headers.get('X-Session-ID')
+  if (issued) sessionStorage.setItem(RAG_SESSION_KEY, issued)
+  return res
+}
+
 export async function ragIngest(token: string | null, payload: { text: string, source_label?: string }) {
-  const res = await fetch(`${API_BASE}/api/rag/ingest`, {
+  const res = await ragFetch('/api/rag/ingest', token, {
     method: 'POST',
-    headers: {
-      'Content-Type': 'application/json',
-      ...(token ? { Authorization: `Bearer ${token}` } : {})
-    },
+    headers: { 'Content-Type': 'application/json' },
     body: JSON.stringify(payload)
   })
   if (!res.ok) throw new Error(`RAG ingest failed: ${res.status}`)
@@ -817,12 +833,9 @@ export async function ragIngest(token: string | null, payload: { text: string, s
 }
 
 export async function ragQuery(token: string | null, payload: { question: string, top_k?: number }) {
-  const res = await fetch(`${API_BASE}/api/rag/query`, {
+  const res = await ragFetch('/api/rag/query', token, {
     method: 'POST',
-    headers: {
-      'Content-Type': 'application/json',
-      ...(token ? { Authorization: `Bearer ${token}` } : {})
-    },
+    headers: { 'Content-Type': 'application/json' },
     body: JSON.stringify(payload)
   })
   if (!res.ok) throw new Error(`RAG query failed: ${res.status}`)
@@ -830,12 +843,9 @@ export async function ragQuery(token: string | null, payload: { question: string
 }
 
 export async function ragAnalyze(token: string | null, payload: { question: string, job_description?: string }) {
-  const res = await fetch(`${API_BASE}/api/rag/analyze`, {
+  const res = await ragFetch('/api/rag/analyze', token, {
     method: 'POST',
-    headers: {
-      'Content-Type': 'application/json',
-      ...(token ? { Authorization: `Bearer ${token}` } : {})
-    },
+    headers: { 'Content-Type': 'application/json' },
     body: JSON.stringify(payload)
   })
   if (!res.ok) throw new Error(`RAG analyze failed: ${res.status}`)
@@ -843,18 +853,13 @@ export async function ragAnalyze(token: string | null, payload: { question: stri
 }
 
 export async function ragStatus(token: string | null) {
-  const res = await fetch(`${API_BASE}/api/rag/status`, {
-    headers: token ? { Authorization: `Bearer ${token}` } : {}
-  })
+  const res = await ragFetch('/api/rag/status', token)
   if (!res.ok) throw new Error(`RAG status failed: ${res.status}`)
   return res.json() as Promise<{ ready: boolean, indexed: boolean, chunks_indexed: number, embeddings_model: string, vector_store: string }>
 }
 
 export async function ragClear(token: string | null) {
-  const res = await fetch(`${API_BASE}/api/rag/clear`, {
-    method: 'POST',
-    headers: token ? { Authorization: `Bearer ${token}` } : {}
-  })
+  const res = await ragFetch('/api/rag/clear', token, { method: 'POST' })
   if (!res.ok) throw new Error(`RAG clear failed: ${res.status}`)
   return res.json() as Promise<{ success: boolean, message?: string }>
 }
@@ -0,0 +1,117 @@
+"""
+Benchmark /ai-orchestrator modes against the configured LLM provider.
+
+Runs the orchestrator workflow in "parallel" (four prompts) and "fused" (one combined prompt) mode
+and reports wall time, provider calls and prompt/response size per run. Token counts are estimated
+as characters / 4; set LLM_MODEL and the provider API key first, otherwise the mock responses are timed.
+
+    python orchestrator_benchmark.py --rounds 3 --resume resume.txt --job-description jd.txt
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend import app as app_module
+
+RESUME = '''John Doe
+Software Engineer
+SUMMARY
+Backend engineer with 6 years building Python services on AWS.
+EXPERIENCE
+Senior Software Engineer at TechCorp (2020-2024)
+- Led development of microservices architecture serving 2M requests per day
+- Improved API performance by 40% with caching and query tuning
+- Mentored 4 junior developers
+SKILLS
+Python, Flask, Docker, Kubernetes, AWS, PostgreSQL, Redis
+EDUCATION
+B.Sc. Computer Science, 2018
+'''
+
+JOB_DESCRIPTION = '''Senior Backend Engineer
+- 5+ years with Python and cloud services (AWS)
+- Experience designing APIs and distributed systems
+- Kubernetes, observability and on-call ownership
+'''
+
+
+class _CountingLLM:
+    """Wraps app.call_llm to count provider calls and prompt/response characters."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.prompt_chars = 0
+        self.response_chars = 0
+
+    def __call__(self, prompt, temperature=0.6):
+        response = self.inner(prompt, temperature)
+        with self.lock:
+            self.calls += 1
+            self.prompt_chars += len(prompt)
+            self.response_chars += len(response or "")
+        return response
+
+
+def run_once(mode, resume_text, job_description, counter):
+    # A unique suffix defeats the LLM and analysis caches so every round pays for real calls
+    job_description = f"{job_description}\n(benchmark run {uuid.uuid4().hex[:8]})"
+    counter.reset()
+    started = time.perf_counter()
+    result = None
+    for event, data in app_module._iter_ai_orchestrator(
+        {"uid": "benchmark"}, resume_text, job_description, None, None, orchestrator_mode=mode
+    ):
+        if event in ("result", "error"):
+            result = data
+    return {
+        "ms": (time.perf_counter() - started) * 1000,
+        "calls": counter.calls,
+        "inputTokens": counter.prompt_chars / 4,
+        "outputTokens": counter.response_chars / 4,
+        "partial": bool(result and result.get("partial")),
+        "error": bool(result and result.get("error")),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare parallel vs fused /ai-orchestrator modes")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--resume", help="Plain-text resume file (defaults to a built-in sample)")
+    parser.add_argument("--job-description", help="Plain-text job description file")
+    args = parser.parse_args()
+
+    resume_text = open(args.resume, encoding="utf-8").read() if args.resume else RESUME
+    job_description = open(args.job_description, encoding="utf-8").read() if args.job_description else JOB_DESCRIPTION
+
+    counter = _CountingLLM(app_module.call_llm)
+    app_module.call_llm = counter
+    app_module.save_analysis = lambda **kwargs: None
+
+    print(f"=== ORCHESTRATOR MODES ({app_module.LLM_MODEL}, {args.rounds} rounds) ===\n")
+    print(f"{'mode':<10}{'median ms':>12}{'calls':>8}{'input tok':>12}{'output tok':>12}{'partial':>9}{'errors':>8}")
+    for mode in app_module.ORCHESTRATOR_MODES:
+        runs = [run_once(mode, resume_text, job_description, counter) for _ in range(args.rounds)]
+        print(
+            f"{mode:<10}"
+            f"{statistics.median(r['ms'] for r in runs):>12.0f}"
+            f"{statistics.mean(r['calls'] for r in runs):>8.1f}"
+            f"{statistics.mean(r['inputTokens'] for r in runs):>12.0f}"
+            f"{statistics.mean(r['outputTokens'] for r in runs):>12.0f}"
+            f"{sum(r['partial'] for r in runs):>9}"
+            f"{sum(r['error'] for r in runs):>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import sys
 import os
+import pytest
 
 print("\n" + "=" * 70)
 print("TESTS/CONFTEST.PY EXECUTING")
@@ -68,3 +69,13 @@ def pytest_configure(config):
     print(f"  backend exists: {os.path.exists(os.path.join(project_root, 'backend'))}")
     print("=" * 70 + "\n")
 
+
+
+@pytest.fixture(autouse=True)
+def audit_log_dir(tmp_path_factory, monkeypatch):
+    """Point the audit and event logs at a temp dir so endpoint tests don't append to the repo's data/audit."""
+    import backend.app as app_mod
+    audit_dir = tmp_path_factory.mktemp("audit")
+    monkeypatch.setattr(app_mod, "AUDIT_LOG", str(audit_dir / "audit.jsonl"))
+    monkeypatch.setattr(app_mod, "EVENTS_LOG", str(audit_dir / "events.jsonl"))
+    return audit_dir
@@ -0,0 +1,79 @@
+"""
+Test the asyncio LLM client: bounded fan-out from one thread, deadlines and the sync facade.
+"""
+import asyncio
+import time
+
+import pytest
+
+from backend.async_llm import AsyncLLMClient
+from backend.llm_executor import LLMDeadlineExceeded, LLMRejectedError
+
+
+def _client(delay=0.1, **kwargs):
+    async def fake_chat(model, prompt, temperature, timeout):
+        await asyncio.sleep(delay)
+        if prompt == "boom":
+            raise RuntimeError("provider error")
+        return f"{model}:{prompt}"
+
+    return AsyncLLMClient(providers={"cohere": fake_chat}, **kwargs)
+
+
+def test_sync_facade_returns_text():
+    client = _client(delay=0)
+    assert client.available("Cohere") and not client.available("openai")
+    assert client.run("cohere", "command-r", "hello", timeout=1) == "command-r:hello"
+    client.close()
+
+
+def test_fan_out_runs_concurrently_within_budget():
+    client = _client(delay=0.1, max_concurrency=10)
+    calls = [("cohere", "m", f"p{i}", 0.6, 5) for i in range(30)]
+    started = time.monotonic()
+    results = dict(client.map_unordered(calls))
+    elapsed = time.monotonic() - started
+    assert results == {i: f"m:p{i}" for i in range(30)}
+    assert elapsed < 1.0  # 3 waves of 0.1s, not 30 sequential calls
+    assert client.stats()["peakInFlight"] == 10
+    client.close()
+
+
+def test_provider_concurrency_caps_each_provider():
+    client = _client(delay=0.05, max_concurrency=10, provider_concurrency=2)
+    results = dict(client.map_unordered([("cohere", "m", f"p{i}", 0.6, 5) for i in range(6)]))
+    assert results == {i: f"m:p{i}" for i in range(6)}
+    assert client.stats()["peakInFlight"] == 2
+    client.close()
+
+
+def test_errors_are_yielded_per_call():
+    client = _client(delay=0)
+    results = dict(client.map_unordered([("cohere", "m", "ok", 0.6, 1), ("cohere", "m", "boom", 0.6, 1)]))
+    assert results[0] == "m:ok"
+    assert isinstance(results[1], RuntimeError)
+    assert client.stats()["failed"] == 1
+    client.close()
+
+
+def test_deadline_and_rejection():
+    client = _client(delay=1.0, max_concurrency=1, max_pending=0)
+    with pytest.raises(LLMDeadlineExceeded):
+        client.run("cohere", "m", "slow", timeout=0.05)
+    blocker = client.submit("cohere", "m", "slow", timeout=2)
+    with pytest.raises(LLMRejectedError):
+        client.submit("cohere", "m", "one too many", timeout=2)
+    blocker.cancel()
+    assert client.stats()["timeouts"] == 1
+    client.close()
+
+
+def test_close_cancels_outstanding_calls_and_closes_the_loop():
+    client = _client(delay=5.0)
+    pending = client.submit("cohere", "m", "slow", timeout=10)
+    time.sleep(0.05)
+    loop = client._loop
+    client.close()
+    assert pending.cancelled()
+    assert loop.is_closed()
+    assert client.stats()["pending"] == 0
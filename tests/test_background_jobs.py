@@ -0,0 +1,44 @@
+"""
+Test the in-process background job runner used for deferred narratives.
+"""
+import threading
+import time
+
+from backend.background_jobs import BackgroundJobs
+from backend.cache_store import TwoTierCache
+
+
+def _wait(jobs, job_id, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        record = jobs.status(job_id)
+        if record["state"] in ("SUCCESS", "FAILURE"):
+            return record
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def test_job_moves_from_pending_to_success():
+    jobs = BackgroundJobs(TwoTierCache(), max_workers=1)
+    gate = threading.Event()
+    job_id = jobs.submit(lambda: gate.wait(2) and {"value": 42}, owner="u1")
+    assert jobs.status(job_id)["state"] in ("PENDING", "STARTED")
+    gate.set()
+    record = _wait(jobs, job_id)
+    assert record["result"] == {"value": 42}
+    assert record["owner"] == "u1"
+    assert jobs.stats()["succeeded"] == 1
+    jobs.shutdown(wait=True)
+
+
+def test_failures_are_recorded():
+    jobs = BackgroundJobs(TwoTierCache(), max_workers=1)
+
+    def boom():
+        raise RuntimeError("provider down")
+
+    record = _wait(jobs, jobs.submit(boom, kind="test"))
+    assert record["state"] == "FAILURE"
+    assert "provider down" in record["error"]
+    assert jobs.status("unknown") is None
+    jobs.shutdown(wait=True)
@@ -0,0 +1,96 @@
+"""
+Test the two-tier (memory LRU + compressed Redis) cache.
+"""
+import time
+
+from backend.cache_store import TwoTierCache
+
+
+class _DictRedis:
+    """Tiny in-memory Redis stand-in supporting the calls TwoTierCache makes."""
+
+    def __init__(self):
+        self.data = {}
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def pttl(self, key):
+        return 60000 if key in self.data else -2
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def pipeline(self):
+        redis = self
+
+        class _Pipe:
+            def __init__(self):
+                self.ops = []
+
+            def get(self, key):
+                self.ops.append(lambda: redis.get(key))
+
+            def pttl(self, key):
+                self.ops.append(lambda: redis.pttl(key))
+
+            def execute(self):
+                return [op() for op in self.ops]
+
+        return _Pipe()
+
+
+def test_memory_tier_works_without_redis():
+    cache = TwoTierCache(redis_client=None, namespace_ttls={"llm_cache": 60})
+    assert cache.get("llm_cache", "k") is None
+    cache.set("llm_cache", "k", "value")
+    assert cache.get("llm_cache", "k") == "value"
+    ns = cache.stats()["namespaces"]["llm_cache"]
+    assert ns["memoryHits"] == 1
+    assert ns["misses"] == 1
+
+
+def test_lru_eviction_respects_byte_budget():
+    cache = TwoTierCache(max_memory_bytes=300, namespace_ttls={"a": 60})
+    cache.set("a", "one", "x" * 100)
+    cache.set("a", "two", "y" * 100)
+    cache.get("a", "one")  # "one" becomes most recently used
+    cache.set("a", "three", "z" * 100)
+    assert cache.get("a", "two") is None
+    assert cache.get("a", "one") == "x" * 100
+    assert cache.stats()["memoryBytes"] <= 300
+    assert cache.stats()["namespaces"]["a"]["evictions"] == 1
+
+
+def test_ttl_expiry():
+    cache = TwoTierCache(namespace_ttls={"short": 1})
+    cache.set("short", "k", "v", ttl=1)
+    cache._memory["short:k"] = (time.time() - 1,) + cache._memory["short:k"][1:]
+    assert cache.get("short", "k") is None
+    assert cache.stats()["namespaces"]["short"]["expirations"] == 1
+
+
+def test_redis_values_are_compressed_and_promoted():
+    redis = _DictRedis()
+    cache = TwoTierCache(redis_client=redis, namespace_ttls={"analysis_v2": 60})
+    payload = {"strengths": ["Python"] * 200}
+    cache.set_json("analysis_v2", "h", payload)
+    stored = redis.data["analysis_v2:h"]
+    assert len(stored) < len(str(payload))
+
+    cache.clear_memory()
+    assert cache.get_json("analysis_v2", "h") == payload
+    assert cache.stats()["namespaces"]["analysis_v2"]["redisHits"] == 1
+    # Promoted into memory on the Redis hit
+    assert cache.get_json("analysis_v2", "h") == payload
+    assert cache.stats()["namespaces"]["analysis_v2"]["memoryHits"] == 1
+
+
+def test_legacy_uncompressed_redis_values_still_readable():
+    redis = _DictRedis()
+    redis.data["llm_cache:old"] = b'{"strengths": []}'
+    cache = TwoTierCache(redis_client=redis)
+    assert cache.get("llm_cache", "old") == '{"strengths": []}'
@@ -0,0 +1,148 @@
+"""
+Test the per provider/model circuit breaker and its adaptive timeout.
+"""
+import time
+
+from backend.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakerRegistry
+
+
+class _DictRedis:
+    """In-memory Redis stand-in supporting the calls CircuitBreaker makes."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+    def lrange(self, key, start, end):
+        return self.data.get(key, [])[start:end + 1]
+
+    def pipeline(self):
+        redis = self
+
+        class _Pipe:
+            def __init__(self):
+                self.ops = []
+
+            def lpush(self, key, value):
+                self.ops.append(lambda: redis.data.setdefault(key, []).insert(0, value))
+
+            def ltrim(self, key, start, end):
+                self.ops.append(lambda: redis.data.__setitem__(key, redis.data.get(key, [])[start:end + 1]))
+
+            def execute(self):
+                return [op() for op in self.ops]
+
+        return _Pipe()
+
+
+def test_opens_after_consecutive_failures_and_fails_fast():
+    breaker = CircuitBreaker("cohere:command-r", failure_threshold=3, min_samples=10, open_seconds=60)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record(1.0, ok=False)
+    assert breaker.stats()["state"] == OPEN
+    assert breaker.allow() is False
+    assert breaker.stats()["shortCircuited"] == 1
+
+
+def test_opens_on_error_rate():
+    breaker = CircuitBreaker("openai:gpt-4o", failure_threshold=10, min_samples=4, error_rate_threshold=0.5)
+    for ok in (True, False, True, False):
+        breaker.record(0.5, ok=ok)
+    assert breaker.stats()["state"] == OPEN
+
+
+def test_half_open_probe_closes_or_reopens():
+    breaker = CircuitBreaker("cohere:command", failure_threshold=1, open_seconds=0.05, half_open_probes=1)
+    breaker.record(1.0, ok=False)
+    assert breaker.allow() is False
+    time.sleep(0.06)
+
+    assert breaker.allow() is True  # the probe
+    assert breaker.stats()["state"] == HALF_OPEN
+    assert breaker.allow() is False  # only one probe at a time
+    breaker.record(2.0, ok=False)
+    assert breaker.stats()["state"] == OPEN
+
+    time.sleep(0.06)
+    assert breaker.allow() is True
+    breaker.record(0.4, ok=True)
+    assert breaker.stats()["state"] == CLOSED
+    assert breaker.allow() is True
+
+
+def test_released_probe_can_be_taken_again():
+    breaker = CircuitBreaker("cohere:command", failure_threshold=1, open_seconds=0.05, half_open_probes=1)
+    breaker.record(1.0, ok=False)
+    time.sleep(0.06)
+
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+    breaker.release_probe()
+    assert breaker.stats()["state"] == HALF_OPEN
+    assert breaker.allow() is True
+
+
+def test_timeout_follows_observed_p95():
+    breaker = CircuitBreaker("cohere:command-r", min_samples=5, timeout_multiplier=2.0, min_timeout=1.0, max_timeout=12.0)
+    assert breaker.timeout() == 12.0  # not enough data yet
+    for latency in (0.8, 0.9, 1.0, 1.1, 2.0):
+        breaker.record(latency, ok=True)
+    assert breaker.timeout() == 4.0
+    assert breaker.stats()["p50Ms"] == 1000
+
+    breaker.record(30.0, ok=True)
+    assert breaker.timeout() == 12.0  # capped at max_timeout
+    breaker.record(None, ok=True)  # stream completions do not count towards latency
+    assert breaker.stats()["samples"] == 7
+
+
+def test_state_is_shared_through_redis():
+    redis = _DictRedis()
+    worker_a = CircuitBreaker("cohere:command-r", redis_client=redis, failure_threshold=2, open_seconds=60)
+    worker_b = CircuitBreaker("cohere:command-r", redis_client=redis, failure_threshold=2, open_seconds=60)
+    worker_a.record(1.0, ok=False)
+    worker_b.record(1.0, ok=False)
+    assert worker_a.allow() is False
+    assert worker_b.stats()["samples"] == 2
+
+
+def test_registry_keys_by_provider_and_model():
+    registry = CircuitBreakerRegistry(failure_threshold=1)
+    registry.get("Cohere", "command-r").record(1.0, ok=False)
+    assert registry.get("cohere", "command-r").allow() is False
+    assert registry.get("cohere", "command", max_timeout=10).allow() is True
+    assert set(registry.stats()) == {"cohere:command-r", "cohere:command"}
+
+
+def test_deadline_misses_back_off_the_timeout_without_opening():
+    # Short prompts set a 3s timeout; longer prompts overrun it but the provider is healthy
+    breaker = CircuitBreaker("cohere:command-r", failure_threshold=3, min_samples=5, min_timeout=1.0, max_timeout=12.0)
+    for _ in range(20):
+        breaker.record(2.0, ok=True)
+    assert breaker.timeout() == 3.0
+
+    deadlines = []
+    for _ in range(5):
+        deadline = breaker.timeout()
+        deadlines.append(deadline)
+        if deadline < 8.0:  # an 8s prompt
+            breaker.record_timeout(deadline)
+        else:
+            breaker.record(8.0, ok=True)
+    assert deadlines[:4] == [3.0, 4.5, 6.75, 10.12]
+    assert breaker.stats()["state"] == CLOSED
+    assert breaker.stats()["deadlineMisses"] == 3
+    assert breaker.stats()["errorRate"] == 0.0
+
+
+def test_deadline_miss_at_max_timeout_is_a_failure():
+    breaker = CircuitBreaker("openai:gpt-4o", failure_threshold=2, max_timeout=12.0)
+    breaker.record_timeout(12.0)
+    breaker.record_timeout(12.0)
+    assert breaker.stats()["state"] == OPEN
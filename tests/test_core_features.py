@@ -7,6 +7,8 @@ import os
 import sys
 import json
 import io
+import threading
+import time
 import pytest
 from unittest.mock import patch, MagicMock
 from datetime import datetime
@@ -194,6 +196,60 @@ Short line"""
         assert 0 <= metrics["skillCoverageRatio"] <= 1
 
 
+class TestPdfTextCache:
+    @staticmethod
+    def _make_pdf(text):
+        from reportlab.pdfgen import canvas
+        buf = io.BytesIO()
+        c = canvas.Canvas(buf)
+        c.drawString(72, 720, text)
+        c.save()
+        return buf.getvalue()
+
+    def test_repeat_upload_skips_extraction(self):
+        from werkzeug.datastructures import FileStorage
+        import backend.app as app_mod
+        pdf_bytes = self._make_pdf("Cached Resume Python Flask")
+
+        first = app_mod.extract_text_from_pdf(FileStorage(io.BytesIO(pdf_bytes), "a.pdf"))
+        assert "Cached Resume" in first
+        with patch.object(app_mod.pdf_extractor, "extract") as mock_extract:
+            second = app_mod.extract_text_from_pdf(FileStorage(io.BytesIO(pdf_bytes), "b.pdf"))
+        mock_extract.assert_not_called()
+        assert second == first
+
+    def test_budgeted_request_is_served_from_full_text(self):
+        from werkzeug.datastructures import FileStorage
+        import backend.app as app_mod
+        pdf_bytes = self._make_pdf("Budgeted Resume Kubernetes Terraform")
+
+        full = app_mod.extract_text_from_pdf(FileStorage(io.BytesIO(pdf_bytes), "a.pdf"))
+        with patch.object(app_mod.pdf_extractor, "extract") as mock_extract:
+            clipped = app_mod.extract_text_from_pdf(FileStorage(io.BytesIO(pdf_bytes), "b.pdf"), char_budget=8)
+        mock_extract.assert_not_called()
+        assert clipped == full[:8]
+
+    def test_partial_results_get_the_short_ttl(self):
+        from werkzeug.datastructures import FileStorage
+        import backend.app as app_mod
+        from backend.pdf_extraction import PDFExtractionResult
+        pdf_bytes = self._make_pdf("Page errors are not final")
+        partial = PDFExtractionResult(text="Page errors", page_count=2, pages_extracted=1, errors=["pages 1+: boom"])
+
+        with patch.object(app_mod.pdf_extractor, "extract", return_value=partial), \
+                patch.object(app_mod.response_cache, "set") as cache_set:
+            app_mod.extract_text_from_pdf(FileStorage(io.BytesIO(pdf_bytes), "a.pdf"))
+        assert cache_set.call_args.kwargs["ttl"] == 3600
+
+    def test_file_hash_is_content_addressed(self):
+        from werkzeug.datastructures import FileStorage
+        import hashlib
+        from backend.app import _file_sha256
+        fs = FileStorage(io.BytesIO(b"same bytes"), "x.pdf")
+        assert _file_sha256(fs) == hashlib.sha256(b"same bytes").hexdigest()
+        assert fs.stream.tell() == 0
+
+
 # =============================
 # 4. Semantic Matching Tests
 # =============================
@@ -315,6 +371,19 @@ class TestAnalyzeEndpoint:
         assert "confidenceScore" in dashboard
 
 
+def _orchestrator_llm(analysis, tailored, questions, cover_letter):
+    """call_llm stand-in that answers by prompt, since orchestrator steps run concurrently."""
+    def answer(prompt, temperature=0.6):
+        if "expert technical interviewer" in prompt:
+            return json.dumps({"questions": questions})
+        if "cover letter" in prompt:
+            return cover_letter
+        if "Rewrite the candidate's resume summary" in prompt:
+            return json.dumps(tailored)
+        return json.dumps(analysis)
+    return answer
+
+
 class TestAIOrchestratorEndpoint:
     @patch("backend.app.extract_text_from_pdf")
     @patch("backend.app.call_llm")
@@ -325,20 +394,20 @@ class TestAIOrchestratorEndpoint:
             "Skills\nPython, Flask, Docker, AWS\n"
             "Experience\nBuilt scalable APIs and shipped production systems."
         )
-        mock_llm.side_effect = [
-            json.dumps({
+        mock_llm.side_effect = _orchestrator_llm(
+            analysis={
                 "strengths": ["Python", "Flask"],
                 "improvementAreas": ["System design"],
                 "recommendedRoles": ["Backend Engineer"],
                 "generalFeedback": "Strong match",
-            }),
-            json.dumps({
+            },
+            tailored={
                 "rewritten_summary": "Tailored summary",
                 "tailored_bullets": [{"original": "Built APIs", "rewritten": "Built scalable APIs"}],
-            }),
-            json.dumps({"questions": ["How would you scale this API?", "Describe a production incident."]}),
-            "Tailored cover letter for the role.",
-        ]
+            },
+            questions=["How would you scale this API?", "Describe a production incident."],
+            cover_letter="Tailored cover letter for the role.",
+        )
 
         data = {
             "resume": (io.BytesIO(b"fake pdf bytes"), "resume.pdf"),
@@ -359,8 +428,209 @@ class TestAIOrchestratorEndpoint:
         assert payload["coverLetter"]["coverLetter"] == "Tailored cover letter for the role."
         assert payload["interviewQuestions"]["questions"][0] == "How would you scale this API?"
         assert payload["recommendations"]["primaryAction"]
+        assert payload["partial"] is False
+        assert all("durationMs" in step for step in payload["workflow"])
         assert mock_save.call_count == 2
 
+    @patch("backend.app.extract_text_from_pdf")
+    @patch("backend.app.call_llm")
+    @patch("backend.app.save_analysis")
+    def test_ai_orchestrator_streams_steps(self, mock_save, mock_llm, mock_extract, client):
+        mock_extract.return_value = "Summary\nGo developer\nSkills\nGo, Kubernetes\nExperience\nRan clusters for streaming."
+        mock_llm.side_effect = _orchestrator_llm(
+            analysis={"strengths": ["Go"], "improvementAreas": ["Testing"],
+                      "recommendedRoles": ["Platform Engineer"], "generalFeedback": "Fit"},
+            tailored={"rewritten_summary": "Streamed summary", "tailored_bullets": []},
+            questions=["How do you roll out safely?"],
+            cover_letter="Streamed cover letter.",
+        )
+        response = client.post(
+            "/ai-orchestrator",
+            data={"resume": (io.BytesIO(b"orchestrator stream pdf"), "resume.pdf"),
+                  "jobDescription": "Platform role", "stream": "true"},
+            content_type="multipart/form-data",
+        )
+        body = response.get_data(as_text=True)
+        assert body.count("event: step") == 4  # one per step, cover letter included
+        assert '"step": "coverLetter", "text": "Streamed cover letter."' in body
+        assert body.rstrip().split("\n\n")[-1].startswith("event: result")
+
+    @patch("backend.app.extract_text_from_pdf")
+    @patch("backend.app.call_llm")
+    @patch("backend.app.save_analysis")
+    def test_ai_orchestrator_fused_mode_uses_one_llm_call(self, mock_save, mock_llm, mock_extract, client):
+        mock_extract.return_value = "Summary\nML engineer\nSkills\nPython, PyTorch\nExperience\nShipped ranking models."
+        mock_llm.return_value = json.dumps({
+            "analysis": {"strengths": ["PyTorch"], "improvementAreas": ["MLOps"],
+                         "recommendedRoles": ["ML Engineer"], "generalFeedback": "Good fit"},
+            "tailoredResume": {"rewritten_summary": "Fused summary", "tailored_bullets": []},
+            "coverLetter": "Fused cover letter.",
+            "interviewQuestions": ["How do you evaluate a ranking model?"],
+        })
+        response = client.post(
+            "/ai-orchestrator",
+            data={"resume": (io.BytesIO(b"orchestrator fused pdf"), "resume.pdf"),
+                  "jobDescription": "ML platform role", "orchestratorMode": "fused"},
+            content_type="multipart/form-data",
+        )
+
+        assert response.status_code == 200
+        payload = response.get_json()
+        assert mock_llm.call_count == 1
+        assert payload["orchestratorMode"] == "fused"
+        assert payload["targetRole"] == "ML Engineer"
+        assert payload["analysis"]["formattedReport"]
+        assert payload["tailoredResume"]["rewritten_summary"] == "Fused summary"
+        assert payload["coverLetter"]["coverLetter"] == "Fused cover letter."
+        assert payload["interviewQuestions"]["questions"] == ["How do you evaluate a ranking model?"]
+        assert payload["partial"] is False
+
+    @patch("backend.app.extract_text_from_pdf")
+    @patch("backend.app.call_llm")
+    @patch("backend.app.save_analysis")
+    def test_ai_orchestrator_fused_mode_fills_missing_parts(self, mock_save, mock_llm, mock_extract, client):
+        mock_extract.return_value = "Summary\nQA engineer\nSkills\nSelenium\nExperience\nAutomated test suites."
+        per_step = _orchestrator_llm(
+            analysis={}, tailored={"rewritten_summary": "Fallback summary", "tailored_bullets": []},
+            questions=["Unused"], cover_letter="Fallback cover letter.",
+        )
+        fused = json.dumps({
+            "analysis": {"strengths": ["Automation"], "improvementAreas": ["Performance testing"],
+                         "recommendedRoles": ["QA Engineer"], "generalFeedback": "Fit"},
+            "interviewQuestions": ["How do you keep suites fast?"],
+        })
+        mock_llm.side_effect = lambda prompt, temperature=0.6: fused if "produce ONE JSON object" in prompt else per_step(prompt, temperature)
+        response = client.post(
+            "/ai-orchestrator",
+            data={"resume": (io.BytesIO(b"orchestrator fused fallback pdf"), "resume.pdf"),
+                  "jobDescription": "QA role", "orchestratorMode": "fused"},
+            content_type="multipart/form-data",
+        )
+
+        payload = response.get_json()
+        assert mock_llm.call_count == 3  # fused + tailoring + cover letter
+        assert payload["tailoredResume"]["rewritten_summary"] == "Fallback summary"
+        assert payload["coverLetter"]["coverLetter"] == "Fallback cover letter."
+        assert payload["interviewQuestions"]["questions"] == ["How do you keep suites fast?"]
+
+    @patch("backend.app.extract_text_from_pdf")
+    @patch("backend.app.call_llm")
+    @patch("backend.app.save_analysis")
+    def test_ai_orchestrator_fused_timeout_falls_back_to_steps(self, mock_save, mock_llm, mock_extract, client):
+        mock_extract.return_value = "Summary\nSRE\nSkills\nKubernetes, Terraform\nExperience\nRan on-call."
+        release = threading.Event()
+        per_step = _orchestrator_llm(
+            analysis={"strengths": ["Kubernetes"], "improvementAreas": ["Cost"],
+                      "recommendedRoles": ["Site Reliability Engineer"], "generalFeedback": "Fit"},
+            tailored={"rewritten_summary": "SRE summary", "tailored_bullets": []},
+            questions=["How do you set SLOs?"],
+            cover_letter="SRE cover letter.",
+        )
+
+        def slow_fused(prompt, temperature=0.6):
+            if "produce ONE JSON object" in prompt:
+                release.wait(5)
+                return "{}"
+            return per_step(prompt, temperature)
+
+        mock_llm.side_effect = slow_fused
+        with patch("backend.app.config.ORCHESTRATOR_STEP_TIMEOUT_SECONDS", 0.3):
+            response = client.post(
+                "/ai-orchestrator",
+                data={"resume": (io.BytesIO(b"orchestrator fused timeout pdf"), "resume.pdf"),
+                      "jobDescription": "SRE role", "orchestratorMode": "fused"},
+                content_type="multipart/form-data",
+            )
+        release.set()
+
+        assert response.status_code == 200
+        payload = response.get_json()
+        assert payload["partial"] is False
+        assert payload["targetRole"] == "Site Reliability Engineer"
+        assert payload["tailoredResume"]["rewritten_summary"] == "SRE summary"
+        assert payload["coverLetter"]["coverLetter"] == "SRE cover letter."
+        assert payload["interviewQuestions"]["questions"] == ["How do you set SLOs?"]
+
+    @patch("backend.app.extract_text_from_pdf", return_value="Summary\nEngineer")
+    def test_ai_orchestrator_rejects_unknown_mode(self, mock_extract, client):
+        response = client.post(
+            "/ai-orchestrator",
+            data={"resume": (io.BytesIO(b"%PDF-fake"), "resume.pdf"), "orchestratorMode": "serial"},
+            content_type="multipart/form-data",
+        )
+        assert response.status_code == 400
+        assert "orchestratorMode" in response.get_json()["error"]
+
+    @patch("backend.app.extract_text_from_pdf")
+    @patch("backend.app.call_llm")
+    @patch("backend.app.save_analysis")
+    def test_ai_orchestrator_returns_partial_result_on_step_timeout(self, mock_save, mock_llm, mock_extract, client):
+        mock_extract.return_value = "Summary\nData engineer\nSkills\nSQL, Spark\nExperience\nBuilt pipelines."
+        release = threading.Event()
+        answer = _orchestrator_llm(
+            analysis={"strengths": ["SQL"], "improvementAreas": ["Streaming"],
+                      "recommendedRoles": ["Data Engineer"], "generalFeedback": "Fit"},
+            tailored={"rewritten_summary": "Data summary", "tailored_bullets": []},
+            questions=["How do you partition tables?"],
+            cover_letter="Late letter.",
+        )
+
+        def slow_cover_letter(prompt, temperature=0.6):
+            if "cover letter" in prompt:
+                release.wait(5)
+            return answer(prompt, temperature)
+
+        mock_llm.side_effect = slow_cover_letter
+        with patch("backend.app.config.ORCHESTRATOR_STEP_TIMEOUT_SECONDS", 0.5):
+            response = client.post(
+                "/ai-orchestrator",
+                data={"resume": (io.BytesIO(b"orchestrator partial pdf"), "resume.pdf"),
+                      "jobDescription": "Data platform role"},
+                content_type="multipart/form-data",
+            )
+        release.set()
+
+        assert response.status_code == 200
+        payload = response.get_json()
+        assert payload["partial"] is True
+        assert payload["pendingSteps"] == ["coverLetter"]
+        assert payload["coverLetter"]["coverLetter"] is None
+        assert payload["interviewQuestions"]["questions"] == ["How do you partition tables?"]
+        statuses = {step["step"]: step["status"] for step in payload["workflow"]}
+        assert statuses["Generate cover letter"] == "timed_out"
+        assert statuses["Tailor resume"] == "completed"
+
+
+class TestResumeSessions:
+    @patch("backend.app.extract_text_from_pdf")
+    def test_upload_once_then_reference_by_id(self, mock_extract, client):
+        mock_extract.return_value = (
+            "Summary\nBackend engineer\nSkills\nPython, Docker\n"
+            "Experience\n- Built Flask APIs serving 1M requests per day"
+        )
+        r = client.post(
+            "/resumes",
+            data={"resume": (io.BytesIO(b"session pdf bytes"), "resume.pdf")},
+            content_type="multipart/form-data",
+        )
+        assert r.status_code == 201
+        body = r.get_json()
+        assert "python" in body["skills"]
+        assert "experience" in body["sections"]
+        resume_id = body["resumeId"]
+
+        mock_extract.reset_mock()
+        with patch("backend.app.call_llm") as mock_llm:
+            mock_llm.return_value = json.dumps({"rewritten_summary": "Tailored", "tailored_bullets": []})
+            r = client.post("/tailor-resume", data={"resumeId": resume_id, "jobDescription": "Python role"})
+        assert r.status_code == 200
+        assert r.get_json()["resumeHash"] == resume_id
+        mock_extract.assert_not_called()
+
+    def test_unknown_resume_id_returns_404(self, client):
+        r = client.post("/generate-career-path", data={"resumeId": "does-not-exist"})
+        assert r.status_code == 404
+
 
 # =============================
 # 6. Cover Letter Generation Tests
@@ -388,6 +658,287 @@ class TestCoverLetter:
         assert r.status_code == 200
         assert "coverLetter" in r.get_json()
 
+    @patch("backend.app.call_llm")
+    @patch("backend.app.extract_text_from_pdf")
+    def test_generate_cover_letter_stream(self, mock_pdf, mock_llm, client):
+        mock_pdf.return_value = "Python developer with 5 years experience"
+        mock_llm.return_value = "Dear Hiring Manager, streamed letter"
+        data = {"jobDescription": "Looking for Python Developer", "stream": "true"}
+        data["resume"] = (io.BytesIO(b"%PDF-fake-stream"), "resume.pdf")
+        r = client.post("/generate-cover-letter", data=data, content_type="multipart/form-data")
+        assert r.mimetype == "text/event-stream"
+        body = r.get_data(as_text=True)
+        assert "event: chunk" in body
+        assert '"coverLetter": "Dear Hiring Manager, streamed letter"' in body
+
+
+class TestLLMStreaming:
+    class _Event:
+        def __init__(self, text):
+            self.event_type = "text-generation"
+            self.text = text
+
+    def test_stream_tokens_then_replay_from_cache(self):
+        from unittest.mock import MagicMock
+        import backend.app as app_module
+        fake = MagicMock()
+        fake.chat_stream.return_value = [self._Event("Hello "), self._Event("streamed "), self._Event("world")]
+        prompt = "Unique streaming prompt for cache replay test"
+        with patch.object(app_module, "cohere_client", fake), patch.object(app_module, "LLM_MODEL", "cohere:command-r"):
+            assert list(app_module.call_llm_stream(prompt, 0.3)) == ["Hello ", "streamed ", "world"]
+            # Second call replays the completed stream from llm_cache as a single chunk
+            assert list(app_module.call_llm_stream(prompt, 0.3)) == ["Hello streamed world"]
+            assert app_module.call_llm(prompt, 0.3) == "Hello streamed world"
+        assert fake.chat_stream.call_count == 1
+
+
+class TestLLMCircuitBreaker:
+    def test_open_breaker_skips_provider_and_returns_fallback(self):
+        import backend.app as app_module
+        from backend.circuit_breaker import CircuitBreakerRegistry
+        fake = MagicMock()
+        fake.chat.side_effect = RuntimeError("provider down")
+        breakers = CircuitBreakerRegistry(failure_threshold=2, open_seconds=60)
+        with patch.object(app_module, "cohere_client", fake), \
+                patch.object(app_module, "LLM_MODEL", "cohere:command-r-plus"), \
+                patch.object(app_module, "llm_breakers", breakers):
+            for i in range(2):
+                assert app_module.call_llm(f"breaker prompt {i}") == app_module._get_mock_response(f"breaker prompt {i}")
+            calls_while_closed = fake.chat.call_count
+            assert app_module.call_llm("breaker prompt 2") == app_module._get_mock_response("breaker prompt 2")
+        assert calls_while_closed == 4  # primary + command-r retry, twice
+        assert fake.chat.call_count == 4  # both breakers open: no provider call
+        stats = breakers.stats()
+        assert stats["cohere:command-r-plus"]["state"] == "open"
+        assert stats["cohere:command-r"]["shortCircuited"] == 1
+
+
+class TestLLMHedging:
+    def test_opted_in_endpoint_hedges_to_second_provider(self):
+        import backend.app as app_module
+        from backend.circuit_breaker import CircuitBreakerRegistry
+        from backend.llm_hedging import Hedger
+        release = threading.Event()
+        slow_cohere = MagicMock()
+        slow_cohere.chat.side_effect = lambda **kwargs: (release.wait(2), MagicMock(text="cohere answer"))[1]
+        fast_openai = MagicMock()
+        fast_openai.chat.completions.create.return_value = MagicMock(
+            choices=[MagicMock(message=MagicMock(content="openai answer"))]
+        )
+        hedger = Hedger(max_workers=4)
+        with patch.object(app_module, "cohere_client", slow_cohere), \
+                patch.object(app_module, "openai_client", fast_openai), \
+                patch.object(app_module, "LLM_MODEL", "cohere:command-r"), \
+                patch.object(app_module, "llm_breakers", CircuitBreakerRegistry()), \
+                patch.object(app_module, "llm_hedger", hedger), \
+                patch("backend.app.config.LLM_HEDGE_DEFAULT_DELAY_SECONDS", 0.05):
+            app_module._llm_hedge_enabled.set(True)
+            try:
+                assert app_module.call_llm("hedged prompt for the analyze endpoint") == "openai answer"
+            finally:
+                app_module._llm_hedge_enabled.set(False)
+                release.set()
+        stats = hedger.stats()
+        assert stats["secondaryWins"] == 1
+        assert stats["extraPromptTokens"] > 0
+        assert fast_openai.chat.completions.create.call_args.kwargs["model"] == "gpt-4o-mini"
+        hedger.shutdown()
+
+    def test_hedged_calls_keep_tenant_and_priority(self):
+        import backend.app as app_module
+        from backend.circuit_breaker import CircuitBreakerRegistry
+        from backend.llm_hedging import Hedger
+        from backend.rate_governor import BATCH, RateGovernor
+        fake = MagicMock()
+        fake.chat.return_value = MagicMock(text="cohere answer")
+        governor = RateGovernor(requests_per_minute={"*": 600}, tokens_per_minute={"*": 0})
+        hedger = Hedger(max_workers=4)
+        hedged_batch_call = app_module._with_llm_scope(app_module.call_llm, tenant="alice", priority=BATCH)
+        with patch.object(app_module, "cohere_client", fake), \
+                patch.object(app_module, "openai_client", MagicMock()), \
+                patch.object(app_module, "LLM_MODEL", "cohere:command-r"), \
+                patch.object(app_module, "llm_breakers", CircuitBreakerRegistry()), \
+                patch.object(app_module, "llm_hedger", hedger), \
+                patch.object(app_module, "llm_governor", governor), \
+                patch.object(governor, "acquire", wraps=governor.acquire) as acquire:
+            app_module._llm_hedge_enabled.set(True)
+            try:
+                assert hedged_batch_call("hedged prompt with a tenant") == "cohere answer"
+            finally:
+                app_module._llm_hedge_enabled.set(False)
+        assert acquire.call_args.kwargs == {"tenant": "alice", "priority": BATCH}
+        hedger.shutdown()
+
+    def test_hedging_flag_follows_endpoint_allowlist(self, client):
+        import backend.app as app_module
+        seen = []
+        record = lambda *a, **kw: seen.append(app_module._llm_hedge_enabled.get()) or "ok"
+        for allowlist in ({"analyze"}, {"mock_interview"}):
+            with patch.object(app_module, "LLM_HEDGE_ENDPOINTS", allowlist), patch("backend.app.call_llm", side_effect=record):
+                client.post("/mock-interview", json={"message": "Hi", "history": []})
+        assert seen == [False, True]
+
+
+class TestLLMRateGovernor:
+    def test_batch_call_shed_while_interactive_uses_reserve(self):
+        import backend.app as app_module
+        from backend.circuit_breaker import CircuitBreakerRegistry
+        from backend.rate_governor import BATCH, INTERACTIVE, RateGovernor
+        fake = MagicMock()
+        fake.chat.return_value = MagicMock(text="provider answer")
+        governor = RateGovernor(
+            requests_per_minute={"*": 4}, tokens_per_minute={"*": 0}, tenant_share=1.0,
+            batch_reserve=0.5, max_wait={INTERACTIVE: 0, BATCH: 0},
+        )
+        batch_call = app_module._with_llm_scope(app_module.call_llm, tenant="recruiter", priority=BATCH)
+        with patch.object(app_module, "cohere_client", fake), \
+                patch.object(app_module, "LLM_MODEL", "cohere:command-r"), \
+                patch.object(app_module, "llm_breakers", CircuitBreakerRegistry()), \
+                patch.object(app_module, "llm_governor", governor):
+            assert [batch_call(f"governed batch prompt {i}") for i in range(2)] == ["provider answer"] * 2
+            shed = batch_call("governed batch prompt 2")
+            assert shed == app_module._get_mock_response("governed batch prompt 2")
+            assert app_module.call_llm("governed interactive prompt") == "provider answer"
+        assert fake.chat.call_count == 3
+        assert governor.stats()["byProvider"]["cohere"]["shed"][BATCH] >= 1
+
+    def test_half_open_probe_shed_by_governor_is_released(self):
+        import backend.app as app_module
+        from backend.circuit_breaker import CircuitBreakerRegistry
+        from backend.rate_governor import BATCH, INTERACTIVE, RateGovernor
+        fake = MagicMock()
+        fake.chat.return_value = MagicMock(text="provider answer")
+        breakers = CircuitBreakerRegistry(failure_threshold=1, open_seconds=0.05)
+        breaker = breakers.get("cohere", "command-r", max_timeout=12.0)
+        breaker.record(1.0, ok=False)
+        time.sleep(0.06)
+        governor = RateGovernor(
+            requests_per_minute={"*": 2}, tokens_per_minute={"*": 0}, tenant_share=1.0,
+            batch_reserve=1.0, max_wait={INTERACTIVE: 0, BATCH: 0},
+        )
+        batch_call = app_module._with_llm_scope(app_module.call_llm, tenant="recruiter", priority=BATCH)
+        with patch.object(app_module, "cohere_client", fake), \
+                patch.object(app_module, "LLM_MODEL", "cohere:command-r"), \
+                patch.object(app_module, "llm_breakers", breakers), \
+                patch.object(app_module, "llm_governor", governor):
+            assert batch_call("shed probe prompt") == app_module._get_mock_response("shed probe prompt")
+            assert breaker.stats()["state"] == "half_open"
+            assert app_module.call_llm("interactive probe prompt") == "provider answer"
+        assert breaker.stats()["state"] == "closed"
+
+    def test_provider_429_pauses_provider_without_opening_breaker(self):
+        import backend.app as app_module
+        from backend.circuit_breaker import CircuitBreakerRegistry
+        from backend.rate_governor import RateGovernor
+        throttled = RuntimeError("too many requests")
+        throttled.status_code = 429
+        fake = MagicMock()
+        fake.chat.side_effect = throttled
+        breakers = CircuitBreakerRegistry(failure_threshold=1)
+        governor = RateGovernor(requests_per_minute={"*": 600}, tokens_per_minute={"*": 0})
+        with patch.object(app_module, "cohere_client", fake), \
+                patch.object(app_module, "LLM_MODEL", "cohere:command-r"), \
+                patch.object(app_module, "llm_breakers", breakers), \
+                patch.object(app_module, "llm_governor", governor), \
+                patch.object(governor, "penalize", wraps=governor.penalize) as penalize:
+            assert app_module.call_llm("throttled prompt") == app_module._get_mock_response("throttled prompt")
+        assert penalize.call_args.args == ("cohere", 5.0)
+        assert breakers.stats()["cohere:command-r"]["state"] == "closed"
+
+
+@pytest.fixture()
+def rag_data_dir(tmp_path, monkeypatch):
+    """Point DATA_DIR, the RAG registry and the embedding cache at tmp_path instead of the repo's data/."""
+    import backend.app as app_mod
+    import backend.embedding_cache as embedding_cache_mod
+    from backend.embedding_cache import EmbeddingCache
+    from backend.rag_engine import RAGIndexRegistry
+    monkeypatch.setattr(app_mod.config, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(app_mod, "_rag_session_secret", None)
+    monkeypatch.setattr(app_mod, "rag_registry", RAGIndexRegistry(
+        memory_budget_bytes=app_mod.rag_registry.memory_budget_bytes, persist_dir=str(tmp_path / "rag"),
+    ))
+    cache = EmbeddingCache(cache_dir=str(tmp_path / "embedding_cache"))
+    monkeypatch.setattr(app_mod, "embedding_cache", cache)
+    monkeypatch.setattr(embedding_cache_mod, "_cache_instance", cache)
+    return tmp_path
+
+
+def _rag_session(client):
+    """Headers carrying a server-issued anonymous RAG session."""
+    token = client.get("/api/rag/status").headers["X-Session-ID"]
+    return {"X-Session-ID": token}
+
+
+@pytest.mark.usefixtures("rag_data_dir")
+class TestRAGIndexes:
+    def test_sessions_query_their_own_index(self, client, rag_data_dir):
+        alice, bob = _rag_session(client), _rag_session(client)
+        assert alice != bob
+        client.post("/api/rag/ingest", json={"text": "Alice builds Kubernetes operators in Go."}, headers=alice)
+        client.post("/api/rag/ingest", json={"text": "Bob designs watercolor illustrations."}, headers=bob)
+
+        res = client.post("/api/rag/query", json={"question": "What does Alice build?"}, headers=alice)
+        assert "X-Session-ID" not in res.headers  # a valid session is kept, not re-issued
+        assert "Kubernetes" in res.get_json()["context"]
+        assert "watercolor" not in res.get_json()["context"]
+        assert len(list((rag_data_dir / "rag").iterdir())) == 2  # persisted under tmp_path, not the repo
+
+        client.post("/api/rag/clear", headers=bob)
+        res = client.post("/api/rag/query", json={"question": "What does Bob design?"}, headers=bob)
+        assert res.status_code == 400
+        status = client.get("/api/rag/status", headers=alice).get_json()
+        assert status["indexed"] is True
+        assert status["registry"]["knownIndexes"] == 1
+        assert "hitRate" in status["embeddingCache"]
+
+    def test_anonymous_callers_without_a_valid_session_get_a_new_one(self, client):
+        alice = _rag_session(client)
+        client.post("/api/rag/ingest", json={"text": "Alice runs the payments on-call rotation."}, headers=alice)
+        session_id = alice["X-Session-ID"].split(".")[0]
+
+        for headers in ({}, {"X-Session-ID": session_id}, {"X-Session-ID": f"{session_id}.forged"}):
+            res = client.post("/api/rag/query", json={"question": "on-call?"}, headers=headers)
+            assert res.status_code == 400  # an empty index, not Alice's
+            assert res.headers["X-Session-ID"] != alice["X-Session-ID"]
+
+    def test_unverified_bearer_tokens_do_not_share_an_index(self, client):
+        import backend.app as app_mod
+        for guest_uid in ("guest-user", "guest-user-no-firebase"):
+            guest = {"uid": guest_uid, "email": "guest@demo.local"}
+            with patch.object(app_mod, "verify_firebase_token", return_value=guest):
+                mallory = client.post("/api/rag/ingest", json={"text": "Mallory's private salary notes."},
+                                      headers={"Authorization": "Bearer bogus-1"})
+                res = client.post("/api/rag/query", json={"question": "salary?"},
+                                  headers={"Authorization": "Bearer bogus-2"})
+            assert res.status_code == 400  # a fresh session index, not Mallory's
+            assert res.headers["X-Session-ID"] != mallory.headers["X-Session-ID"]
+
+    def test_delete_document_endpoint(self, client):
+        headers = _rag_session(client)
+        doc = client.post("/api/rag/ingest", json={"text": "Carol ships Terraform modules."}, headers=headers).get_json()
+        client.post("/api/rag/ingest", json={"text": "Carol speaks fluent Portuguese."}, headers=headers)
+
+        res = client.delete(f"/api/rag/documents/{doc['document_id']}", headers=headers)
+        assert res.status_code == 200 and res.get_json()["chunks_deleted"] == 1
+        assert client.delete(f"/api/rag/documents/{doc['document_id']}", headers=headers).status_code == 404
+        status = client.get("/api/rag/status", headers=headers).get_json()
+        assert [d["chunks"] for d in status["documents"]] == [1]
+
+    def test_query_batch_endpoint(self, client):
+        headers = _rag_session(client)
+        client.post("/api/rag/ingest", json={"text": "Dana tunes PostgreSQL.\n\nDana races sailboats."}, headers=headers)
+
+        res = client.post("/api/rag/query-batch", json={"questions": ["PostgreSQL?", "sailboats?"], "top_k": 1}, headers=headers)
+        assert res.status_code == 200
+        contexts = [r["context"] for r in res.get_json()["results"]]
+        assert "PostgreSQL" in contexts[0] and "sailboats" in contexts[1]
+
+        assert client.post("/api/rag/query-batch", json={"questions": []}, headers=headers).status_code == 400
+        with patch("backend.app.config.RAG_QUERY_BATCH_MAX", 1):
+            res = client.post("/api/rag/query-batch", json={"questions": ["a?", "b?"]}, headers=headers)
+        assert res.status_code == 400
+
 
 # =============================
 # 7. Mock Interview Tests
@@ -405,6 +956,14 @@ class TestMockInterview:
         assert r.status_code == 200
         assert "response" in r.get_json()
 
+    @patch("backend.app.call_llm")
+    def test_mock_interview_stream(self, mock_llm, client):
+        mock_llm.return_value = "Walk me through your last deployment."
+        r = client.post("/mock-interview", json={"message": "Ready", "history": [], "stream": True})
+        body = r.get_data(as_text=True)
+        assert "event: result" in body
+        assert "Walk me through your last deployment." in body
+
     @patch("backend.app.call_llm")
     def test_analyze_mock_interview(self, mock_llm, client):
         """Test mock interview analysis/scoring."""
@@ -542,6 +1101,176 @@ class TestRecruiterFeatures:
         assert r.status_code == 200
 
 
+class TestRecruiterRanking:
+    JD = "Python Flask Docker AWS engineer with Kubernetes experience"
+    RESUMES = [
+        {"id": "chef", "text": "Pastry chef with ten years in French kitchens and catering"},
+        {"id": "backend", "text": "Python Flask engineer shipping Docker services on AWS and Kubernetes, cut latency 30%"},
+        {"id": "partial", "text": "Python developer building Django apps with some Docker usage"},
+    ]
+
+    def test_batch_scores_match_single_pair_scores(self):
+        from backend.app import score_candidates_batch, compute_semantic_match
+        import re as _re
+        texts = [r["text"] for r in self.RESUMES]
+        lexical, semantic, combined = score_candidates_batch(self.JD, texts)
+        for i, text in enumerate(texts):
+            resume_words = set(_re.findall(r"\w+", text.lower()))
+            job_words = set(_re.findall(r"\w+", self.JD.lower()))
+            expected = round(len(resume_words & job_words) / len(job_words) * 100, 2)
+            assert lexical[i] == expected
+            assert abs(semantic[i] - compute_semantic_match(text, self.JD)) < 0.02
+
+    def test_top_k_indices_are_best_first(self):
+        from backend.app import _top_k_indices
+        assert _top_k_indices([10, 50, 30, 50], 2) == [1, 3]
+        assert _top_k_indices([1, 2], 5) == [1, 0]
+
+    @patch("backend.app.call_llm")
+    def test_rank_endpoint_returns_top_k_with_optional_narratives(self, mock_llm, client):
+        mock_llm.return_value = json.dumps({
+            "strengths": ["Cloud delivery"], "improvementAreas": ["Leadership"],
+            "recommendedRoles": ["Backend Engineer"], "generalFeedback": "Strong fit",
+        })
+        r = client.post("/recruiter/rank", json={
+            "jobDescription": self.JD, "resumes": self.RESUMES, "topK": 2, "narrativeTopK": 1,
+        })
+        assert r.status_code == 200
+        body = r.get_json()
+        assert body["totalCandidates"] == 3
+        assert [c["candidateId"] for c in body["ranked"]] == ["backend", "partial"]
+        assert body["ranked"][0]["narrative"]["strengths"] == ["Cloud delivery"]
+        assert "narrative" not in body["ranked"][1]
+        assert "decision" in body["ranked"][1]["shortlistDashboard"]
+        assert mock_llm.call_count == 1
+
+    def test_rank_narratives_fan_out_on_async_client(self, client):
+        import asyncio
+        import backend.app as app_module
+        from backend.async_llm import AsyncLLMClient
+        from backend.circuit_breaker import CircuitBreakerRegistry
+        narrative = json.dumps({
+            "strengths": ["Fan-out"], "improvementAreas": ["None"],
+            "recommendedRoles": ["Backend Engineer"], "generalFeedback": "Concurrent",
+        })
+
+        async def fake_chat(model, prompt, temperature, timeout):
+            await asyncio.sleep(0.05)
+            return narrative
+
+        fan_out = AsyncLLMClient(providers={"cohere": fake_chat}, max_concurrency=8)
+        with patch.object(app_module, "async_llm", fan_out), \
+                patch.object(app_module, "llm_breakers", CircuitBreakerRegistry()), \
+                patch.object(app_module, "LLM_MODEL", "cohere:fan-out-test"), \
+                patch("backend.app.call_llm") as mock_llm:
+            r = client.post("/recruiter/rank", json={
+                "jobDescription": self.JD, "resumes": self.RESUMES, "topK": 3, "narrativeTopK": 3,
+            })
+        fan_out.close()
+        body = r.get_json()
+        assert all(c["narrative"]["strengths"] == ["Fan-out"] for c in body["ranked"])
+        assert fan_out.stats()["peakInFlight"] == 3  # one thread, three provider calls at once
+        mock_llm.assert_not_called()
+
+    def test_fan_out_sends_duplicate_prompts_once(self):
+        import asyncio
+        import uuid
+        import backend.app as app_module
+        from backend.async_llm import AsyncLLMClient
+        from backend.circuit_breaker import CircuitBreakerRegistry
+        sent = []
+
+        async def fake_chat(model, prompt, temperature, timeout):
+            sent.append(prompt)
+            await asyncio.sleep(0.05)
+            return f"answer to {prompt}"
+
+        fan_out = AsyncLLMClient(providers={"cohere": fake_chat}, max_concurrency=8)
+        same, other = f"duplicate prompt {uuid.uuid4()}", f"other prompt {uuid.uuid4()}"
+        with patch.object(app_module, "async_llm", fan_out), \
+                patch.object(app_module, "llm_breakers", CircuitBreakerRegistry()), \
+                patch.object(app_module, "LLM_MODEL", "cohere:fan-out-test"):
+            results = dict(app_module.iter_llm_many([same, other, same]))
+        fan_out.close()
+        assert sorted(sent) == sorted([same, other])
+        assert results == {0: f"answer to {same}", 1: f"answer to {other}", 2: f"answer to {same}"}
+        assert app_module.llm_single_flight.stats()["inFlightKeys"] == 0
+
+    def test_rank_endpoint_streams_progress(self, client):
+        r = client.post("/recruiter/rank", json={
+            "jobDescription": self.JD, "resumes": self.RESUMES, "stream": True,
+        })
+        assert r.mimetype == "text/event-stream"
+        body = r.get_data(as_text=True)
+        assert body.count("event: progress") >= 4
+        assert "event: result" in body
+
+
+
+class TestFastAnalysis:
+    RESUME = "Go and Kubernetes platform engineer who automated AWS deployments for payments teams at scale"
+    JD = "Hiring a platform engineer: Kubernetes, AWS, Terraform and Go for payments infrastructure"
+    NARRATIVE = json.dumps({
+        "strengths": ["Platform automation"], "improvementAreas": ["Terraform"],
+        "recommendedRoles": ["Platform Engineer"], "generalFeedback": "Good fit",
+    })
+
+    @staticmethod
+    def _wait_for_narrative(client, url):
+        import time as _time
+        for _ in range(100):
+            body = client.get(url).get_json()
+            if body["state"] in ("SUCCESS", "FAILURE"):
+                return body
+            _time.sleep(0.05)
+        raise AssertionError("narrative job did not finish")
+
+    @patch("backend.app.call_llm")
+    def test_fast_recruiter_analysis_defers_narrative(self, mock_llm, client):
+        mock_llm.return_value = self.NARRATIVE
+        r = client.post("/analyze", json={
+            "mode": "recruiter", "resume": self.RESUME, "job_description": self.JD,
+            "recruiterEmail": "hr@example.com", "fast": True,
+        })
+        assert r.status_code == 200
+        body = r.get_json()
+        assert body["execution_mode"] == "fast"
+        assert body["narrativeStatus"] == "pending"
+        assert "combinedMatchPercentage" in body and "decision" in body["shortlistDashboard"]
+        assert "strengths" not in body
+
+        narrative = self._wait_for_narrative(client, body["narrativeUrl"])
+        assert narrative["state"] == "SUCCESS"
+        assert narrative["result"]["strengths"] == ["Platform automation"]
+        assert narrative["result"]["combinedMatchPercentage"] == body["combinedMatchPercentage"]
+
+    def test_fast_job_seeker_analysis_is_deterministic(self, client):
+        r = client.post("/analyze", json={
+            "mode": "jobSeeker", "resume": self.RESUME + " (job seeker)", "job_description": self.JD, "fast": "true",
+        })
+        body = r.get_json()
+        assert "kubernetes" in body["skills"]
+        assert "terraform" in body["skillGaps"]
+        assert body["metrics"]["skillCount"] == len(body["skills"])
+        assert body["narrativeJobId"]
+
+    def test_unknown_narrative_job_is_404(self, client):
+        assert client.get("/analyze/narrative/does-not-exist").status_code == 404
+
+    @patch("backend.app.call_llm")
+    def test_fast_batch_ranking_returns_narrative_jobs(self, mock_llm, client):
+        mock_llm.return_value = self.NARRATIVE
+        r = client.post("/recruiter/rank", json={
+            "jobDescription": self.JD, "resumes": [self.RESUME, "Pastry chef and baker"],
+            "narrativeTopK": 1, "fast": True,
+        })
+        ranked = r.get_json()["ranked"]
+        assert "narrative" not in ranked[0]
+        assert "narrativeJobId" not in ranked[1]
+        narrative = self._wait_for_narrative(client, f"/analyze/narrative/{ranked[0]['narrativeJobId']}")
+        assert narrative["result"]["narrative"]["strengths"] == ["Platform automation"]
+
+
 # =============================
 # 11. History Endpoint Tests
 # =============================
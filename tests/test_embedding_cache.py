@@ -0,0 +1,83 @@
+"""
+Test the float16 chunk-embedding cache: hits skip the model, files are shared across instances.
+"""
+import numpy as np
+
+from backend.embedding_cache import EmbeddingCache
+
+
+class _CountingModel:
+    def __init__(self):
+        self.embedded = []
+
+    def __call__(self, texts):
+        self.embedded.extend(texts)
+        return [[len(text), 0.5, 1 / 3] for text in texts]
+
+
+def test_repeat_chunks_skip_the_model():
+    cache = EmbeddingCache()
+    model = _CountingModel()
+    first = cache.embed_many("mini", ["alpha", "beta", "alpha"], model)
+    assert model.embedded == ["alpha", "beta"]  # duplicate in the batch computed once
+
+    again = cache.embed_many("mini", ["beta", "alpha"], model)
+    assert model.embedded == ["alpha", "beta"]
+    assert again == [first[1], first[0]]
+    # float16 rounding is applied to misses too, so a chunk always gets the same vector
+    assert first[0][2] == float(np.float16(1 / 3))
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 3)
+    assert stats["models"]["mini"] == {"entries": 2, "dim": 3, "bytes": 12}
+
+
+def test_models_are_cached_separately():
+    cache = EmbeddingCache()
+    model = _CountingModel()
+    cache.embed_many("mini", ["alpha"], model)
+    cache.embed_many("large", ["alpha"], model)
+    assert model.embedded == ["alpha", "alpha"]
+
+
+def test_disk_cache_is_shared_between_instances(tmp_path):
+    model = _CountingModel()
+    writer = EmbeddingCache(cache_dir=str(tmp_path))
+    vectors = writer.embed_many("all-MiniLM-L6-v2", ["alpha", "beta"], model)
+
+    reader = EmbeddingCache(cache_dir=str(tmp_path))
+    assert reader.embed_many("all-MiniLM-L6-v2", ["beta", "alpha"], model) == [vectors[1], vectors[0]]
+    assert model.embedded == ["alpha", "beta"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["all-MiniLM-L6-v2.f16", "all-MiniLM-L6-v2.idx"]
+    assert (tmp_path / "all-MiniLM-L6-v2.f16").stat().st_size == 2 * 3 * 2
+
+    # Rows written by another instance after this one opened the files are picked up
+    writer.embed_many("all-MiniLM-L6-v2", ["gamma"], model)
+    reader.embed_many("all-MiniLM-L6-v2", ["gamma"], model)
+    assert model.embedded == ["alpha", "beta", "gamma"]
+
+
+def test_full_cache_stops_adding_rows():
+    cache = EmbeddingCache(max_bytes=6)  # one 3-dim float16 row
+    model = _CountingModel()
+    cache.embed_many("mini", ["alpha"], model)
+    assert cache.embed_many("mini", ["beta"], model)[0][0] == 4.0
+    cache.embed_many("mini", ["beta"], model)
+    assert model.embedded == ["alpha", "beta", "beta"]
+    assert cache.stats()["skippedFull"] == 2
+
+
+def test_orphan_vectors_from_a_crashed_append_are_dropped(tmp_path):
+    model = _CountingModel()
+    cache = EmbeddingCache(cache_dir=str(tmp_path))
+    cache.embed_many("mini", ["alpha"], model)
+    # Simulate a crash after the vector write but before its hash was appended (plus a torn row)
+    with open(tmp_path / "mini.f16", "ab") as f:
+        f.write(np.full((2, 3), 9, dtype=np.float16).tobytes() + b"\x00")
+
+    later = EmbeddingCache(cache_dir=str(tmp_path))
+    beta = later.embed_many("mini", ["beta"], model)
+    assert (tmp_path / "mini.f16").stat().st_size == 2 * 3 * 2
+    reader = EmbeddingCache(cache_dir=str(tmp_path))
+    assert reader.embed_many("mini", ["beta", "alpha"], model) == [beta[0], [5.0, 0.5, float(np.float16(1 / 3))]]
+    assert model.embedded == ["alpha", "beta"]
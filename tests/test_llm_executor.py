@@ -0,0 +1,102 @@
+"""
+Test the shared LLM executor: deadlines, provider caps and stats.
+"""
+import threading
+import time
+
+import pytest
+from backend.llm_executor import LLMExecutor, LLMDeadlineExceeded, LLMRejectedError, LLMSlotTimeout
+
+
+def test_run_returns_result_and_counts_completion():
+    executor = LLMExecutor(max_workers=2, max_queue=2, provider_concurrency=2)
+    assert executor.run("cohere", lambda x: x * 2, 21, timeout=1) == 42
+    stats = executor.stats()
+    assert stats["completed"] == 1
+    assert stats["byProvider"]["cohere"]["inFlight"] == 0
+    executor.shutdown()
+
+
+def test_deadline_is_enforced_without_spawning_threads():
+    executor = LLMExecutor(max_workers=1, max_queue=2, provider_concurrency=2)
+    release = threading.Event()
+    threads_before = threading.active_count()
+
+    with pytest.raises(LLMDeadlineExceeded):
+        executor.run("openai", release.wait, 5, timeout=0.05)
+
+    assert executor.stats()["timeouts"] == 1
+    # Timed-out call still holds its provider slot until it really returns
+    assert executor.stats()["byProvider"]["openai"]["inFlight"] == 1
+    assert threading.active_count() <= threads_before + 1
+
+    release.set()
+    time.sleep(0.05)
+    assert executor.stats()["byProvider"]["openai"]["inFlight"] == 0
+    executor.shutdown()
+
+
+def test_provider_cap_queues_excess_calls_until_deadline():
+    executor = LLMExecutor(max_workers=4, max_queue=4, provider_concurrency=1)
+    release = threading.Event()
+    future = executor.submit("cohere", release.wait, 5)
+
+    # The second cohere call waits for the slot instead of being rejected
+    threading.Timer(0.1, release.set).start()
+    assert executor.run("cohere", lambda: "queued", timeout=2) == "queued"
+    future.result(timeout=1)
+
+    # ...but gives up once its own deadline passes while still waiting
+    release.clear()
+    future = executor.submit("cohere", release.wait, 5)
+    with pytest.raises(LLMSlotTimeout):
+        executor.run("cohere", lambda: None, timeout=0.05)
+    # Other providers are unaffected by the cohere cap
+    assert executor.run("openai", lambda: "ok", timeout=1) == "ok"
+
+    release.set()
+    future.result(timeout=1)
+    stats = executor.stats()
+    assert stats["rejected"] == 0
+    assert stats["byProvider"]["cohere"]["timeouts"] == 1
+    assert stats["queueDepth"] == 0
+    executor.shutdown()
+
+
+def test_queue_depth_is_bounded():
+    executor = LLMExecutor(max_workers=1, max_queue=1, provider_concurrency=5)
+    release = threading.Event()
+    running = executor.submit("cohere", release.wait, 5)
+    time.sleep(0.05)
+    queued = executor.submit("cohere", lambda: "queued")
+    assert executor.stats()["queueDepth"] == 1
+
+    with pytest.raises(LLMRejectedError):
+        executor.submit("cohere", lambda: None)
+
+    release.set()
+    running.result(timeout=1)
+    assert queued.result(timeout=1) == "queued"
+    executor.shutdown()
+
+
+def test_stream_forwards_items_and_enforces_deadline():
+    executor = LLMExecutor(max_workers=2, max_queue=2, provider_concurrency=2)
+    assert list(executor.stream("cohere", lambda n: (f"tok{i}" for i in range(n)), 3, timeout=1)) == ["tok0", "tok1", "tok2"]
+
+    release = threading.Event()
+
+    def stalled():
+        yield "first"
+        release.wait(5)
+        yield "late"
+
+    received = []
+    with pytest.raises(LLMDeadlineExceeded):
+        for item in executor.stream("cohere", stalled, timeout=0.1):
+            received.append(item)
+    assert received == ["first"]
+    release.set()
+    time.sleep(0.05)
+    assert executor.stats()["byProvider"]["cohere"]["inFlight"] == 0
+    executor.shutdown()
@@ -0,0 +1,63 @@
+"""
+Test hedged LLM calls: delay, first-valid-wins and extra spend accounting.
+"""
+import threading
+import time
+
+import pytest
+
+from backend.llm_hedging import Hedger, estimate_tokens
+
+
+@pytest.fixture()
+def hedger():
+    h = Hedger(max_workers=4)
+    yield h
+    h.shutdown()
+
+
+def test_fast_primary_never_hedges(hedger):
+    secondary_calls = []
+    result, winner = hedger.run(lambda: "primary", lambda: secondary_calls.append(1), delay=1.0)
+    assert (result, winner) == ("primary", "primary")
+    assert secondary_calls == []
+    assert hedger.stats()["hedged"] == 0
+
+
+def test_slow_primary_loses_to_secondary_and_is_counted(hedger):
+    release = threading.Event()
+
+    def slow_primary():
+        release.wait(2)
+        return "late primary answer"
+
+    started = time.monotonic()
+    result, winner = hedger.run(slow_primary, lambda: "secondary", delay=0.05, prompt_tokens=100)
+    assert (result, winner) == ("secondary", "secondary")
+    assert time.monotonic() - started < 1
+
+    release.set()
+    deadline = time.monotonic() + 2
+    while hedger.stats()["extraCompletionTokens"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stats = hedger.stats()
+    assert stats["hedged"] == 1
+    assert stats["secondaryWins"] == 1
+    assert stats["extraPromptTokens"] == 100
+    assert stats["extraCompletionTokens"] == estimate_tokens("late primary answer")
+
+
+def test_invalid_primary_fails_over_immediately(hedger):
+    result, winner = hedger.run(
+        lambda: "mock", lambda: "real answer", delay=5.0, is_valid=lambda r: r != "mock"
+    )
+    assert (result, winner) == ("real answer", "secondary")
+
+
+def test_both_invalid_returns_primary_result(hedger):
+    def broken():
+        raise RuntimeError("down")
+
+    result, winner = hedger.run(lambda: "mock", broken, delay=0.0, is_valid=lambda r: r != "mock")
+    assert (result, winner) == ("mock", "primary")
+    assert hedger.stats()["bothFailed"] == 1
@@ -0,0 +1,93 @@
+"""
+Test the process-pool PDF extraction engine and its limits.
+"""
+import io
+
+import pytest
+from reportlab.pdfgen import canvas
+
+from backend.pdf_extraction import PDFExtractor, PDFTooLargeError
+
+
+def _make_pdf(pages):
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf)
+    for text in pages:
+        c.drawString(72, 720, text)
+        c.showPage()
+    c.save()
+    return buf.getvalue()
+
+
+def test_pooled_extraction_keeps_page_order():
+    pdf = _make_pdf([f"Page number {i}" for i in range(5)])
+    extractor = PDFExtractor(max_workers=2, pages_per_task=2, timeout=60)
+    try:
+        result = extractor.extract(pdf)
+    finally:
+        extractor.shutdown()
+    assert result.mode == "pool"
+    assert result.page_count == 5
+    assert result.text.splitlines() == [f"Page number {i}" for i in range(5)]
+    assert not result.partial
+
+
+def test_page_limit_truncates():
+    pdf = _make_pdf(["one", "two", "three"])
+    result = PDFExtractor(max_workers=0, max_pages=2).extract(pdf)
+    assert result.mode == "inline"
+    assert result.truncated
+    assert result.text.splitlines() == ["one", "two"]
+
+
+def test_byte_limit_rejects_before_parsing():
+    extractor = PDFExtractor(max_workers=0, max_bytes=10)
+    with pytest.raises(PDFTooLargeError):
+        extractor.extract(b"x" * 11)
+    assert extractor.stats()["rejected"] == 1
+
+
+def test_expired_deadline_returns_partial_text():
+    pdf = _make_pdf(["one", "two"])
+    result = PDFExtractor(max_workers=0).extract(pdf, timeout=0)
+    assert result.timed_out
+    assert result.text == ""
+
+
+def test_char_budget_stops_before_later_pages():
+    pdf = _make_pdf(["A" * 80, "B" * 80, "C" * 80, "D" * 80])
+    for workers in (0, 2):
+        extractor = PDFExtractor(max_workers=workers, pages_per_task=1, timeout=60)
+        try:
+            result = extractor.extract(pdf, char_budget=100)
+        finally:
+            extractor.shutdown()
+        assert result.budget_reached
+        assert result.pages_extracted == 2
+        assert result.text == ("A" * 80 + "\n" + "B" * 80)[:100]
+        assert extractor.stats()["pagesSkipped"] == 2
+
+
+def test_fast_mode_returns_page_text():
+    pdf = _make_pdf(["Senior Python Engineer"])
+    result = PDFExtractor(max_workers=0).extract(pdf, fast=True)
+    assert result.text == "Senior Python Engineer"
+
+
+def test_timed_out_document_does_not_break_concurrent_extractions():
+    import threading
+    slow_pdf = _make_pdf([f"Slow page {i} " + "word " * 150 for i in range(300)])
+    normal_pdf = _make_pdf([f"Normal page {i}" for i in range(40)])
+    extractor = PDFExtractor(max_workers=2, pages_per_task=2, max_pages=300, timeout=60)
+    results = {}
+    try:
+        normal = threading.Thread(target=lambda: results.update(normal=extractor.extract(normal_pdf)))
+        normal.start()
+        results["slow"] = extractor.extract(slow_pdf, timeout=0.3)
+        normal.join(60)
+    finally:
+        extractor.shutdown()
+    assert results["slow"].timed_out
+    assert not results["normal"].partial
+    assert results["normal"].text.splitlines() == [f"Normal page {i}" for i in range(40)]
+    assert extractor.stats()["poolRestarts"] == 1
@@ -57,3 +57,201 @@ def test_rag_empty_inputs():
     # Query without indexing
     err_query = rag.query("What skills are listed?")
     assert err_query["success"] is False
+
+
+def test_registry_keeps_indexes_per_user():
+    from backend.rag_engine import RAGIndexRegistry
+    registry = RAGIndexRegistry()
+    registry.ingest("user:a", "Alice builds Kubernetes operators in Go.")
+    registry.ingest("user:b", "Bob designs watercolor illustrations for children's books.")
+
+    assert "Kubernetes" in registry.get("user:a").query("What does Alice build?")["context"]
+    assert "watercolor" in registry.get("user:b").query("What does Bob design?")["context"]
+    assert registry.get("user:c").is_indexed is False
+    assert registry.stats()["knownIndexes"] == 2
+
+    registry.clear("user:a")
+    assert registry.get("user:a").is_indexed is False
+    assert registry.get("user:b").is_indexed is True
+
+
+def test_registry_evicts_lru_over_budget_and_rebuilds():
+    from backend.rag_engine import RAGIndexRegistry
+    registry = RAGIndexRegistry(memory_budget_bytes=1)  # every ingest pushes the others out
+    registry.ingest("user:a", "Alice builds Kubernetes operators in Go.")
+    registry.ingest("user:b", "Bob designs watercolor illustrations for children's books.")
+    stats = registry.stats()
+    assert stats["residentIndexes"] == 1 and stats["evictions"] == 1
+    assert stats["residentBytes"] > 0
+
+    # The evicted index comes back on its next lookup, and now evicts b
+    assert "Kubernetes" in registry.get("user:a").query("What does Alice build?")["context"]
+    stats = registry.stats()
+    assert stats["rebuilds"] == 1 and stats["evictions"] == 2 and stats["residentIndexes"] == 1
+
+
+def test_slow_ingest_does_not_block_other_users(monkeypatch):
+    import threading
+    import time
+    from backend.rag_engine import RAGIndexRegistry, ResumeRAGEngine
+    registry = RAGIndexRegistry()
+    registry.ingest("user:b", "Bob designs watercolor illustrations for children's books.")
+    entered, release = threading.Event(), threading.Event()
+    original = ResumeRAGEngine.ingest_text
+
+    def slow_ingest(self, text, **kwargs):
+        if "Alice" in text:
+            entered.set()
+            release.wait(5)
+        return original(self, text, **kwargs)
+
+    monkeypatch.setattr(ResumeRAGEngine, "ingest_text", slow_ingest)
+    writer = threading.Thread(target=registry.ingest, args=("user:a", "Alice builds Kubernetes operators in Go."))
+    writer.start()
+    assert entered.wait(2)
+    try:
+        started = time.monotonic()
+        assert "watercolor" in registry.get("user:b").query("What does Bob design?")["context"]
+        assert registry.stats()["residentIndexes"] == 1
+        assert time.monotonic() - started < 1
+    finally:
+        release.set()
+        writer.join(5)
+    assert registry.get("user:a").is_indexed is True
+
+
+def test_save_and_mmap_load_round_trip(tmp_path):
+    from backend.rag_engine import ResumeRAGEngine
+    rag = ResumeRAGEngine()
+    rag.ingest_text("Alice builds Kubernetes operators in Go.\n\nShe mentors junior engineers.", source_label="cv")
+    before = rag.query("What does Alice build?")
+
+    rag.save(str(tmp_path / "alice"))
+    loaded = ResumeRAGEngine.load(str(tmp_path / "alice"))
+    after = loaded.query("What does Alice build?")
+    assert after["success"] is True
+    assert after["context"] == before["context"]
+    assert [c["relevance_score"] for c in after["retrieved_chunks"]] == [c["relevance_score"] for c in before["retrieved_chunks"]]
+    # Chunks and TF-IDF arrays are mapped from disk, not copied into the heap
+    assert loaded.memory_bytes() < rag.memory_bytes()
+    assert ResumeRAGEngine.load(str(tmp_path / "missing")) is None
+
+
+def test_registry_reloads_persisted_index_after_restart(tmp_path):
+    from backend.rag_engine import RAGIndexRegistry
+    registry = RAGIndexRegistry(persist_dir=str(tmp_path))
+    registry.ingest("user:a", "Alice builds Kubernetes operators in Go.")
+
+    restarted = RAGIndexRegistry(persist_dir=str(tmp_path))
+    assert restarted.stats()["knownIndexes"] == 1
+    assert "Kubernetes" in restarted.get("user:a").query("What does Alice build?")["context"]
+    assert restarted.stats()["loads"] == 1 and restarted.stats()["rebuilds"] == 0
+
+    restarted.clear("user:a")
+    assert RAGIndexRegistry(persist_dir=str(tmp_path)).get("user:a").is_indexed is False
+
+
+def test_ingest_appends_documents_with_stable_chunk_ids():
+    from backend.rag_engine import ResumeRAGEngine
+    rag = ResumeRAGEngine()
+    first = rag.ingest_text("Alice builds Kubernetes operators in Go.", source_label="cv")
+    second = rag.ingest_text("Alice mentors Kubernetes contributors.", source_label="notes")
+    assert first["chunk_ids"] == [f"{first['document_id']}:0"]
+    assert second["total_chunks"] == 2
+
+    chunks = rag.query("Kubernetes", top_k=5)["retrieved_chunks"]
+    assert {c["source"] for c in chunks} == {"cv", "notes"}
+
+    # Same text again is a no-op; new text under an existing ID replaces the document
+    assert rag.ingest_text("Alice builds Kubernetes operators in Go.")["chunks_indexed"] == 0
+    rag.ingest_text("Alice now writes Rust compilers.", document_id=first["document_id"])
+    assert rag.chunk_count == 2
+    assert "operators" not in rag.query("Kubernetes operators", top_k=5)["context"]
+
+
+def test_delete_and_background_compaction_refit_vocabulary():
+    from backend.rag_engine import ResumeRAGEngine
+    rag = ResumeRAGEngine(compact_threshold=10)  # compaction only when called
+    doc = rag.ingest_text("Alice builds Kubernetes operators in Go.")["document_id"]
+    rag.ingest_text("Bob paints watercolor landscapes.")
+    # "watercolor" arrived after the vocabulary was fitted, so it is not searchable yet
+    assert rag.query("watercolor")["retrieved_chunks"][0]["relevance_score"] == 0.0
+
+    assert rag.delete_document(doc)["chunks_deleted"] == 1
+    assert rag.delete_document(doc)["success"] is False
+    assert "Kubernetes" not in rag.query("Kubernetes operators")["context"]
+    assert rag.status()["deleted_rows"] == 1 and rag.status()["stale_rows"] == 1
+
+    assert rag.compact() == {"success": True, "rows": 1, "dropped": 1, "refit": True}
+    assert rag.query("watercolor")["retrieved_chunks"][0]["relevance_score"] > 0
+    assert rag.status()["deleted_rows"] == 0 and rag.status()["stale_rows"] == 0
+
+
+def test_drift_schedules_background_compaction():
+    from backend.rag_engine import ResumeRAGEngine
+    rag = ResumeRAGEngine(compact_threshold=0.3)
+    rag.ingest_text("Alice builds Kubernetes operators in Go.")
+    rag.ingest_text("Bob paints watercolor landscapes.")  # 1 stale row of 2 > 0.3
+    rag._compaction.result(timeout=5)
+    assert rag.status()["stale_rows"] == 0
+    assert rag.query("watercolor")["retrieved_chunks"][0]["relevance_score"] > 0
+
+
+def test_registry_persists_appends_and_deletes(tmp_path):
+    from backend.rag_engine import RAGIndexRegistry
+    registry = RAGIndexRegistry(persist_dir=str(tmp_path))
+    kept = registry.ingest("user:a", "Alice builds Kubernetes operators in Go.")["document_id"]
+    dropped = registry.ingest("user:a", "Alice once sold lemonade.")["document_id"]
+    registry.delete_document("user:a", dropped)
+
+    restarted = RAGIndexRegistry(persist_dir=str(tmp_path)).get("user:a")
+    assert [d["document_id"] for d in restarted.documents()] == [kept]
+    assert "lemonade" not in restarted.query("lemonade", top_k=5)["context"]
+
+
+def test_cached_embeddings_wrap_the_model():
+    from unittest.mock import MagicMock, patch
+    from backend.embedding_cache import EmbeddingCache
+    from backend.rag_engine import _CachedEmbeddings
+    inner = MagicMock()
+    inner.embed_documents.side_effect = lambda texts: [[1.0, 0.0] for _ in texts]
+    inner.embed_query.return_value = [0.0, 1.0]
+    with patch("backend.rag_engine.get_embedding_cache", return_value=EmbeddingCache()):
+        embeddings = _CachedEmbeddings(inner)
+        embeddings.embed_documents(["chunk a", "chunk b"])
+        assert embeddings.embed_documents(["chunk b", "chunk a"]) == [[1.0, 0.0], [1.0, 0.0]]
+    assert inner.embed_documents.call_count == 1
+    assert embeddings.embed_query("question") == [0.0, 1.0]
+
+
+def test_query_many_matches_single_queries():
+    from backend.rag_engine import ResumeRAGEngine
+    rag = ResumeRAGEngine()
+    rag.ingest_text(
+        "Alice builds Kubernetes operators in Go.\n\n"
+        "She mentors junior engineers every week.\n\n"
+        "Alice paints watercolor landscapes on weekends."
+    )
+    questions = ["What does Alice build?", "Who does she mentor?", "What does Alice paint?", "Quantum chromodynamics?"]
+    batch = rag.query_many(questions, top_k=2)
+    assert batch["success"] is True and batch["questions"] == 4
+    for question, result in zip(questions, batch["results"]):
+        single = rag.query(question, top_k=2)
+        assert result["question"] == question
+        assert result["retrieved_chunks"] == single["retrieved_chunks"]
+    assert "Kubernetes" in batch["results"][0]["retrieved_chunks"][0]["content"]
+    assert "watercolor" in batch["results"][2]["retrieved_chunks"][0]["content"]
+    assert batch["results"][3]["chunks_retrieved"] == 1  # no overlap: only the top match
+
+    assert rag.query_many([], top_k=2)["success"] is False
+    assert rag.query_many(["ok", " "], top_k=2)["success"] is False
+
+
+def test_query_many_skips_deleted_chunks():
+    from backend.rag_engine import ResumeRAGEngine
+    rag = ResumeRAGEngine(compact_threshold=10)
+    doc = rag.ingest_text("Alice builds Kubernetes operators in Go.")["document_id"]
+    rag.ingest_text("Alice also builds Kubernetes dashboards.")
+    rag.delete_document(doc)
+    result = rag.query_many(["Kubernetes operators"], top_k=5)["results"][0]
+    assert [c["content"] for c in result["retrieved_chunks"]] == ["Alice also builds Kubernetes dashboards."]
@@ -0,0 +1,99 @@
+"""
+Test the outbound rate governor: token buckets, batch reserve, tenant share, 429 pauses and wait stats.
+"""
+import re
+import threading
+import time
+
+import pytest
+
+from backend.llm_executor import LLMRejectedError
+from backend.rate_governor import BATCH, INTERACTIVE, RateGovernor, RateLimitShed, parse_limits
+
+
+def test_parse_limits():
+    assert parse_limits("", 60) == {"*": 60.0}
+    assert parse_limits("120", 60) == {"*": 120.0}
+    assert parse_limits("cohere=100, OpenAI=500", 60) == {"*": 60.0, "cohere": 100.0, "openai": 500.0}
+
+
+def test_request_bucket_paces_calls():
+    # 60/min with capacity 60: drain it, then the next call waits about one second for a refill
+    governor = RateGovernor(requests_per_minute={"*": 60}, tokens_per_minute={"*": 0}, tenant_share=1.0)
+    for _ in range(60):
+        assert governor.acquire("cohere") < 0.1
+    waited = governor.acquire("cohere")
+    assert 0.5 < waited < 2
+    stats = governor.stats()["byProvider"]["cohere"]
+    assert stats["calls"] == 61 and stats["waited"] == 1
+    assert stats["maxWaitMs"] >= 500
+
+
+def test_batch_is_shed_before_interactive():
+    governor = RateGovernor(
+        requests_per_minute={"*": 40}, tokens_per_minute={"*": 0}, tenant_share=1.0,
+        batch_reserve=0.25, max_wait={INTERACTIVE: 0, BATCH: 0},
+    )
+    for _ in range(30):
+        governor.acquire("cohere", priority=BATCH)
+    with pytest.raises(RateLimitShed):
+        governor.acquire("cohere", priority=BATCH)
+    # The reserved quarter is still there for interactive callers
+    for _ in range(10):
+        governor.acquire("cohere", priority=INTERACTIVE)
+    with pytest.raises(LLMRejectedError):
+        governor.acquire("cohere", priority=INTERACTIVE)
+    shed = governor.stats()["byProvider"]["cohere"]["shed"]
+    assert shed == {INTERACTIVE: 1, BATCH: 1}
+
+
+def test_token_bucket_and_tenant_share():
+    governor = RateGovernor(
+        requests_per_minute={"*": 0}, tokens_per_minute={"openai": 1000}, tenant_share=0.5,
+        max_wait={INTERACTIVE: 0},
+    )
+    governor.acquire("openai", tokens=400, tenant="alice")
+    with pytest.raises(RateLimitShed):
+        governor.acquire("openai", tokens=400, tenant="alice")  # alice may use 500/min
+    governor.acquire("openai", tokens=400, tenant="bob")
+    with pytest.raises(RateLimitShed):
+        governor.acquire("openai", tokens=400, tenant="carol")  # provider bucket has 200 left
+    governor.acquire("cohere", tokens=10_000, tenant="alice")  # no cohere token limit
+
+
+def test_penalize_pauses_provider():
+    governor = RateGovernor(requests_per_minute={"*": 600}, tokens_per_minute={"*": 0}, max_wait={INTERACTIVE: 0})
+    governor.acquire("cohere")
+    governor.penalize("cohere", seconds=2)
+    with pytest.raises(RateLimitShed):
+        governor.acquire("cohere")
+    governor.acquire("openai")
+
+
+def test_redis_errors_fall_back_to_local_buckets():
+    class _BrokenRedis:
+        def register_script(self, script):
+            raise ConnectionError("redis down")
+
+    governor = RateGovernor(redis_client=_BrokenRedis(), requests_per_minute={"*": 1}, tokens_per_minute={"*": 0},
+                            tenant_share=1.0, max_wait={INTERACTIVE: 0})
+    started = time.monotonic()
+    governor.acquire("cohere")
+    with pytest.raises(RateLimitShed):
+        governor.acquire("cohere")
+    assert time.monotonic() - started < 1
+
+
+def test_concurrent_429s_do_not_stack():
+    governor = RateGovernor(requests_per_minute={"*": 60}, tokens_per_minute={"*": 0}, tenant_share=1.0,
+                            max_wait={INTERACTIVE: 0})
+    threads = [threading.Thread(target=governor.penalize, args=("cohere", 5)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Eight 429s still pause for about 5s (plus one second for the call itself), not 8 x 65s
+    with pytest.raises(RateLimitShed) as shed:
+        governor.acquire("cohere")
+    wait = float(re.search(r"wait ([0-9.]+)s", str(shed.value)).group(1))
+    assert 5 < wait <= 6.1
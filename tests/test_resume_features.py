@@ -0,0 +1,79 @@
+"""
+Test the single-pass ResumeFeatures extractor and its memo.
+"""
+import re
+
+from backend.resume_features import ResumeFeatureExtractor, SectionVocabulary
+from backend.skill_matcher import SkillMatcher
+
+RESUME = """Jane Doe
+Backend engineer building data platforms
+Work Experience:
+- Reduced p95 latency 3x across 12 services
+- Migrated batch jobs to Kubernetes and Python workers
+Skills
+Python, Docker; Kubernetes
+Education
+B.Tech Computer Science"""
+
+
+def _extractor(**kwargs):
+    matcher = SkillMatcher({"python": [], "docker": [], "kubernetes": ["k8s"]})
+    return ResumeFeatureExtractor(skill_finder=matcher.find, **kwargs)
+
+
+def test_single_pass_fields():
+    features = _extractor().extract(RESUME)
+    assert features.skills == ("docker", "kubernetes", "python")
+    assert features.bullets[1] == "Reduced p95 latency 3x across 12 services"
+    assert features.quantified_lines == ("- Reduced p95 latency 3x across 12 services",)
+    assert features.word_count == len(re.findall(r"\w+", RESUME))
+    assert {"kubernetes", "jane", "3x"} <= features.word_set
+    assert "Reduced" not in features.word_set
+
+
+def test_sections_match_header_vocabulary():
+    sections = _extractor().extract(RESUME).sections
+    assert sections["summary"].startswith("Jane Doe")
+    assert sections["experience"].count("\n") == 1  # "Work Experience:" is an alias
+    assert sections["skills_list_raw"] == ["Python", "Docker", "Kubernetes"]
+    assert sections["education"] == "B.Tech Computer Science"
+
+
+def test_section_spans_slice_source_text():
+    features = _extractor().extract(RESUME)
+    (education,) = features.section_slices("education")
+    assert RESUME[education] == "B.Tech Computer Science"
+    (experience,) = features.section_slices("experience")
+    assert RESUME[experience].startswith("- Reduced") and RESUME[experience].endswith("Python workers")
+
+
+def test_custom_vocabulary_aliases():
+    vocabulary = SectionVocabulary({"skills": ["technical skills"], "experience": ["employment history"]})
+    sections, spans = vocabulary.parse("Intro line\n  Employment  History :\nAcme Corp\nTECHNICAL SKILLS\nGo, Rust")
+    assert sections == {
+        "summary": "Intro line",
+        "experience": "Acme Corp",
+        "skills": "Go, Rust",
+        "skills_list_raw": ["Go", "Rust"],
+    }
+    assert set(spans) == {"summary", "experience", "skills"}
+    assert vocabulary.match("education") is None
+
+
+def test_memoized_by_content_hash():
+    extractor = _extractor(max_entries=2)
+    first = extractor.extract(RESUME)
+    assert extractor.extract(str(RESUME)) is first
+    extractor.extract("other text")
+    extractor.extract("third text")  # evicts RESUME
+    assert extractor.extract(RESUME) is not first
+    assert extractor.stats()["hits"] == 1
+    assert extractor.stats()["entries"] == 2
+
+
+def test_empty_text():
+    features = _extractor().extract(None)
+    assert features.word_count == 0
+    assert features.skills == ()
+    assert features.sections == {}
@@ -0,0 +1,62 @@
+"""
+Test the corpus-fitted semantic scoring model.
+"""
+from backend.semantic_model import SemanticScorer, fit_corpus, load_model, save_model
+
+CORPUS = [
+    "Python developer building Flask APIs and machine learning pipelines",
+    "Java engineer working on Spring microservices and Kafka",
+    "Data scientist with Python, pandas and machine learning experience",
+    "Frontend developer using React, TypeScript and CSS",
+]
+
+
+def _scorer(tmp_path, mode):
+    path = str(tmp_path / "idf.json.gz")
+    save_model(fit_corpus(CORPUS), path)
+    return SemanticScorer(model_path=path, mode=mode)
+
+
+def test_model_round_trips_through_disk(tmp_path):
+    path = str(tmp_path / "idf.json.gz")
+    model = fit_corpus(CORPUS)
+    save_model(model, path)
+    assert load_model(path)["vocabulary"] == model["vocabulary"]
+
+
+def test_related_pair_scores_higher_in_both_modes(tmp_path):
+    for mode in ("tfidf", "hashing"):
+        scorer = _scorer(tmp_path, mode)
+        close = scorer.score("Python machine learning engineer", "Looking for Python machine learning skills")
+        far = scorer.score("Python machine learning engineer", "React TypeScript frontend developer")
+        assert 0 <= far < close <= 1, mode
+
+
+def test_common_terms_weigh_less_than_rare_terms(tmp_path):
+    scorer = _scorer(tmp_path, "tfidf")
+    # "developer" appears in half the corpus, "kafka" in one document
+    assert scorer.score("developer kafka", "kafka") > scorer.score("developer kafka", "developer")
+
+
+def test_missing_model_returns_none_in_tfidf_mode(tmp_path):
+    scorer = SemanticScorer(model_path=str(tmp_path / "missing.json.gz"), mode="tfidf")
+    assert scorer.score("a b", "a b") is None
+    assert scorer.stats()["loaded"] is False
+
+
+def test_hashing_mode_scores_without_a_model(tmp_path):
+    scorer = SemanticScorer(model_path=str(tmp_path / "missing.json.gz"))
+    close = scorer.score("Python machine learning engineer", "Looking for Python machine learning skills")
+    far = scorer.score("Python machine learning engineer", "React TypeScript frontend developer")
+    assert 0 <= far < close <= 1
+    assert abs(scorer.score("kafka developer", "kafka developer") - 1.0) < 1e-6
+    assert scorer.stats()["loaded"] is True
+    assert scorer.stats()["idfFitted"] is False
+
+
+def test_tfidf_mode_defers_mostly_unseen_text(tmp_path):
+    scorer = _scorer(tmp_path, "tfidf")
+    # Kubernetes/SRE terms are not in the corpus: leave the pair to the per-pair fit
+    assert scorer.score("Kubernetes terraform prometheus grafana SRE", "SRE with kubernetes and terraform") is None
+    assert scorer.score("Python machine learning engineer", "Python developer") is not None
+    assert _scorer(tmp_path, "hashing").score("Kubernetes terraform SRE", "SRE with kubernetes") > 0
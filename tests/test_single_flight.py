@@ -0,0 +1,125 @@
+"""
+Test single-flight coalescing of identical in-flight calls.
+"""
+import threading
+import time
+
+import pytest
+from backend.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight(wait_timeout=5)
+    calls = []
+    gate = threading.Event()
+
+    def slow_call():
+        calls.append(1)
+        gate.wait(2)
+        return "shared-result"
+
+    results = []
+
+    def worker():
+        results.append(flight.do("same-key", slow_call))
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    gate.set()
+    for t in threads:
+        t.join(2)
+
+    assert len(calls) == 1
+    assert [value for value, _ in results] == ["shared-result"] * 5
+    assert sum(1 for _, shared in results if shared) == 4
+    assert flight.stats()["sharedInProcess"] == 4
+    assert flight.stats()["inFlightKeys"] == 0
+
+
+def test_leader_error_propagates_to_followers():
+    flight = SingleFlight(wait_timeout=5)
+    gate = threading.Event()
+    errors = []
+
+    def failing_call():
+        gate.wait(2)
+        raise ValueError("provider down")
+
+    def worker():
+        try:
+            flight.do("bad-key", failing_call)
+        except ValueError as exc:
+            errors.append(str(exc))
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    gate.set()
+    for t in threads:
+        t.join(2)
+
+    assert errors == ["provider down"] * 3
+
+
+class _LockHeldRedis:
+    """Minimal Redis stand-in where another worker already holds the lock."""
+
+    def __init__(self):
+        self.store = {}
+
+    def set(self, key, value, nx=False, px=None):
+        return False
+
+    def exists(self, key):
+        return True
+
+    def pubsub(self, ignore_subscribe_messages=True):
+        class _PubSub:
+            def subscribe(self, channel):
+                pass
+
+            def get_message(self, timeout=0):
+                time.sleep(min(timeout, 0.01))
+                return None
+
+            def close(self):
+                pass
+
+        return _PubSub()
+
+
+def test_cross_process_follower_uses_fetched_result():
+    remote = _LockHeldRedis()
+    flight = SingleFlight(redis_client=remote, wait_timeout=1)
+    fetched = iter([None, None, "from-other-worker"])
+
+    value, shared = flight.do("k", lambda: pytest.fail("should not call provider"), fetch=lambda: next(fetched))
+
+    assert value == "from-other-worker"
+    assert shared is True
+    assert flight.stats()["sharedCrossProcess"] == 1
+
+
+def test_try_lead_makes_do_callers_wait_for_finish():
+    flight = SingleFlight(wait_timeout=5)
+    assert flight.try_lead("fan-out-key")
+    assert not flight.try_lead("fan-out-key")
+    results = []
+    follower = threading.Thread(target=lambda: results.append(flight.do("fan-out-key", lambda: "own call")))
+    follower.start()
+    time.sleep(0.1)
+    flight.finish("fan-out-key", "fan-out result")
+    follower.join(2)
+    assert results == [("fan-out result", True)]
+
+    assert flight.try_lead("abandoned-key")
+    follower = threading.Thread(target=lambda: results.append(flight.do("abandoned-key", lambda: "own call")))
+    follower.start()
+    time.sleep(0.1)
+    flight.finish("abandoned-key")
+    follower.join(2)
+    assert results[-1] == ("own call", False)
+    assert flight.stats()["inFlightKeys"] == 0
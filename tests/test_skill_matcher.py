@@ -0,0 +1,44 @@
+"""
+Test the Aho-Corasick skill taxonomy matcher.
+"""
+from backend.skill_matcher import SkillMatcher, get_skill_matcher
+
+TAXONOMY = {
+    "java": [],
+    "javascript": ["js"],
+    "c": [],
+    "c++": ["cpp"],
+    "go": ["golang"],
+    "kubernetes": ["k8s"],
+    "node.js": ["node", "nodejs"],
+    "react": [],
+    "react native": [],
+    "machine learning": ["ml"],
+}
+
+
+def test_word_boundaries_prevent_substring_matches():
+    matcher = SkillMatcher(TAXONOMY)
+    assert matcher.find("Senior JavaScript engineer with Google Cloud") == ["javascript"]
+
+
+def test_aliases_map_to_canonical_names():
+    matcher = SkillMatcher(TAXONOMY)
+    assert matcher.find("Ran k8s clusters, wrote golang and Node services") == ["go", "kubernetes", "node.js"]
+
+
+def test_leftmost_longest_match_wins():
+    matcher = SkillMatcher(TAXONOMY)
+    assert matcher.find("C++ and React Native apps") == ["c++", "react native"]
+    assert matcher.find("C, C++ and React") == ["c", "c++", "react"]
+
+
+def test_whitespace_in_multiword_skills_is_normalized():
+    matcher = SkillMatcher(TAXONOMY)
+    assert matcher.find("Machine\n  Learning models") == ["machine learning"]
+
+
+def test_bundled_taxonomy_loads():
+    matcher = get_skill_matcher()
+    assert {"python", "kubernetes", "node.js", "machine learning"} <= matcher.skills
+    assert matcher.find("k8s") == ["kubernetes"]
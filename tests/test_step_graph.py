@@ -0,0 +1,109 @@
+"""
+Test the dependency-graph step runner used by /ai-orchestrator.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.step_graph import Step, StepFailed, run_step_graph
+
+
+@pytest.fixture()
+def pool():
+    executor = ThreadPoolExecutor(max_workers=4)
+    yield executor
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _by_kind(events):
+    out = {}
+    for kind, name, data in events:
+        out.setdefault(kind, {})[name] = data
+    return out
+
+
+def test_independent_steps_run_concurrently(pool):
+    barrier = threading.Barrier(3, timeout=2)
+
+    def wait_for_peers(deps, emit):
+        barrier.wait()  # only passes if all three steps are running at once
+        return "ok"
+
+    steps = [Step(name, wait_for_peers) for name in ("a", "b", "c")]
+    completed = _by_kind(run_step_graph(pool, steps))["completed"]
+    assert {name: data["result"] for name, data in completed.items()} == {"a": "ok", "b": "ok", "c": "ok"}
+
+
+def test_dependent_step_receives_results_and_emits(pool):
+    def child(deps, emit):
+        emit("chunk", {"text": "partial"})
+        return deps["parent"] + 1
+
+    events = list(run_step_graph(pool, [
+        Step("child", child, depends_on=("parent",)),
+        Step("parent", lambda deps, emit: 41),
+    ]))
+    assert [(kind, name) for kind, name, _ in events] == [
+        ("completed", "parent"), ("emit", "child"), ("completed", "child"),
+    ]
+    assert events[1][2] == {"event": "chunk", "data": {"text": "partial"}}
+    assert events[2][2]["result"] == 42
+
+
+def test_timeout_skips_dependents_and_keeps_other_results(pool):
+    release = threading.Event()
+
+    def slow(deps, emit):
+        release.wait(5)
+        emit("chunk", "too late")
+        return "late"
+
+    steps = [
+        Step("slow", slow, timeout=0.2),
+        Step("after_slow", lambda deps, emit: "never", depends_on=("slow",)),
+        Step("fast", lambda deps, emit: "done"),
+    ]
+    started = time.monotonic()
+    events = _by_kind(run_step_graph(pool, steps, default_timeout=5))
+    release.set()
+    assert time.monotonic() - started < 2
+    assert events["completed"]["fast"]["result"] == "done"
+    assert "slow" in events["timed_out"]
+    assert events["skipped"]["after_slow"]["reason"] == "slow did not complete"
+    assert "emit" not in events
+
+
+def test_optional_step_failure_does_not_skip_dependents(pool):
+    release = threading.Event()
+
+    def broken(deps, emit):
+        raise RuntimeError("provider down")
+
+    def use_hints(deps, emit):
+        return sorted(deps)
+
+    steps = [
+        Step("hint", broken, optional=True),
+        Step("slow_hint", lambda deps, emit: release.wait(5), optional=True, timeout=0.2),
+        Step("work", use_hints, depends_on=("hint", "slow_hint")),
+    ]
+    events = _by_kind(run_step_graph(pool, steps, default_timeout=5))
+    release.set()
+    assert "hint" in events["failed"] and "slow_hint" in events["timed_out"]
+    assert events["completed"]["work"]["result"] == []
+
+
+def test_failed_step_reports_details(pool):
+    def broken(deps, emit):
+        raise StepFailed("Failed to tailor resume", {"error": "bad json"})
+
+    events = _by_kind(run_step_graph(pool, [Step("tailor", broken)]))
+    assert events["failed"]["tailor"]["error"] == "Failed to tailor resume"
+    assert events["failed"]["tailor"]["details"] == {"error": "bad json"}
+
+
+def test_unknown_dependency_rejected(pool):
+    with pytest.raises(ValueError):
+        list(run_step_graph(pool, [Step("a", lambda deps, emit: 1, depends_on=("missing",))]))